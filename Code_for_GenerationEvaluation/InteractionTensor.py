@@ -0,0 +1,156 @@
+import numpy as np
+
+NO_LIMIT = 10 ** 9  # Window bound for rules that apply at any distance
+
+
+class InteractionTensor:
+    def __init__(self, action_characterization, evaluation_keys):
+        """
+        Initializes the InteractionTensor and compiles the interactions_performance rules into dense modifier arrays.
+
+        Supported rules of a (source) action:
+        - ('increase' | 'increases' | 'decrease' | 'decreases', criterion, target, amount[, window]): If both actions
+          are part of a sequence, the criterion of the target changes by the amount. Numbers are absolute changes,
+          strings like '10%' are relative to the value of the target ('+'/'-' strings counted as net score).
+          The optional window [low, high] limits the rule to sequences where the position of the target minus the
+          position of the source lies between low and high.
+        - ('replaces', target): If the source is implemented after the target, the effectiveness of the target is
+          cancelled.
+
+        :param action_characterization: Dictionary with action details and interaction rules.
+        :param evaluation_keys: List of criteria to compile the rules for.
+        """
+        self.action_characterization = action_characterization
+        self.evaluation_keys = list(evaluation_keys)
+        self.action_index = {action: index for index, action in enumerate(action_characterization)}
+        self.compile_rules()
+
+    def compile_rules(self):
+        """
+        Compiles the rules into arrays of shape (layers, actions + 1, actions + 1, evaluation_keys), indexed by
+        source, target and criterion. A pair with several rules on the same criterion uses one layer per rule.
+        The last action row and column are used for padding and stay zero.
+        """
+        rules = []  # Tuples (source, target, criterion, absolute change, relative change, low, high)
+        for source, details in self.action_characterization.items():
+            for rule in details.get('interactions_performance', []):
+                kind = rule[0]
+                if kind == 'replaces':
+                    targets, criterion = rule[1], 'effectiveness'
+                    absolute, relative, low, high = 0, -1, -NO_LIMIT, -1
+                elif kind in ('increase', 'increases', 'decrease', 'decreases'):
+                    criterion, targets, amount = rule[1], rule[2], rule[3]
+                    sign = 1 if kind.startswith('increase') else -1
+                    if isinstance(amount, str) and amount.strip().endswith('%'):
+                        absolute, relative = 0, sign * float(amount.strip()[:-1]) / 100
+                    else:
+                        absolute, relative = sign * (float(amount) if isinstance(amount, str) else amount), 0
+                    low, high = rule[4] if len(rule) > 4 else (-NO_LIMIT, NO_LIMIT)
+                else:
+                    raise ValueError(f"Unknown interaction rule: {rule}")
+
+                for target in targets if isinstance(targets, list) else [targets]:
+                    # Rules on unknown actions or criteria that are not evaluated have no effect
+                    if target in self.action_index and target != source and criterion in self.evaluation_keys:
+                        rules.append((self.action_index[source], self.action_index[target],
+                                      self.evaluation_keys.index(criterion), absolute, relative, low, high))
+
+        number_actions = len(self.action_index) + 1
+        layers = {}
+        for source, target, column, *_ in rules:
+            layers[(source, target, column)] = layers.get((source, target, column), 0) + 1
+        shape = (max(layers.values(), default=0), number_actions, number_actions, len(self.evaluation_keys))
+        self.absolute = np.zeros(shape)
+        self.relative = np.zeros(shape)
+        self.is_float = np.zeros(shape, dtype=bool)  # Rule turns integer values into floats
+        self.window_low = np.full(shape, NO_LIMIT, dtype=np.int64)  # Empty window for unused entries
+        self.window_high = np.full(shape, -NO_LIMIT, dtype=np.int64)
+
+        used = {}
+        for source, target, column, absolute, relative, low, high in rules:
+            layer = used.get((source, target, column), 0)
+            used[(source, target, column)] = layer + 1
+            entry = (layer, source, target, column)
+            self.absolute[entry] = absolute
+            self.relative[entry] = relative
+            self.is_float[entry] = isinstance(absolute, float) or relative != int(relative)
+            self.window_low[entry] = low
+            self.window_high[entry] = high
+
+    @staticmethod
+    def round_net_score(net_score):
+        """
+        Rounds net scores changed by relative interactions to whole '+'/'-' symbols. Rounding to 9 decimals first
+        keeps the result independent of the order in which the changes were summed.
+
+        :param net_score: Net score or array of net scores.
+        :return: The rounded net score(s).
+        """
+        return np.round(np.round(net_score, 9))
+
+    def pair_modifier(self, source, target, offset, target_values):
+        """
+        Computes the change of the criteria of the target caused by the source.
+
+        :param source: The source action.
+        :param target: The target action.
+        :param offset: The position of the target minus the position of the source.
+        :param target_values: List with the net scores of the target per criterion.
+        :return: List with the change per criterion, ints unless a rule turns the value into a float.
+        """
+        changes = [0] * len(self.evaluation_keys)
+        source, target = self.action_index[source], self.action_index[target]
+        for layer in range(len(self.absolute)):
+            for column in range(len(self.evaluation_keys)):
+                entry = (layer, source, target, column)
+                if not self.window_low[entry] <= offset <= self.window_high[entry]:
+                    continue
+                absolute, relative = self.absolute[entry].item(), self.relative[entry].item()
+                if not self.is_float[entry]:
+                    absolute, relative = int(absolute), int(relative)
+                changes[column] += absolute + relative * target_values[column]
+        return changes
+
+    def sequence_modifiers(self, sequence, values):
+        """
+        Computes the total change of the criteria caused by all interactions within a sequence.
+
+        :param sequence: A sequence of actions.
+        :param values: List with the net scores per criterion for every action of the sequence.
+        :return: List with the total change per criterion.
+        """
+        changes = [0] * len(self.evaluation_keys)
+        for source_position, source in enumerate(sequence):
+            for target_position, target in enumerate(sequence):
+                if target_position != source_position:
+                    pair_changes = self.pair_modifier(source, target, target_position - source_position,
+                                                      values[target_position])
+                    changes = [change + pair_change for change, pair_change in zip(changes, pair_changes)]
+        return changes
+
+    def modifiers(self, codes, score_matrix):
+        """
+        Computes the changes caused by the interactions for all encoded sequences at once. The pairs of positions
+        are processed per distance, so each step is one gather over all sequences.
+
+        :param codes: Array (sequences, positions) with action indices, padded with the number of actions.
+        :param score_matrix: Array (actions + 1, evaluation_keys) with the net scores of every action.
+        :return: Array (sequences, evaluation_keys) with the changes and boolean array indicating float changes.
+        """
+        changes = np.zeros((len(codes), len(self.evaluation_keys)))
+        is_float = np.zeros(changes.shape, dtype=bool)
+        number_positions = codes.shape[1]
+        for offset in range(1 - number_positions, number_positions):
+            if offset == 0:
+                continue
+            # Pairs (source, target) with the target at position source + offset
+            sources = codes[:, max(0, -offset):number_positions - max(0, offset)]
+            targets = codes[:, max(0, offset):number_positions - max(0, -offset)]
+            target_scores = score_matrix[targets]
+            for layer in range(len(self.absolute)):
+                in_window = ((self.window_low[layer, sources, targets] <= offset)
+                             & (offset <= self.window_high[layer, sources, targets]))
+                change = self.absolute[layer, sources, targets] + self.relative[layer, sources, targets] * target_scores
+                changes += np.where(in_window, change, 0).sum(axis=1)
+                is_float |= (in_window & self.is_float[layer, sources, targets]).any(axis=1)
+        return changes, is_float
@@ -1,17 +1,35 @@
-import numpy as np
+import os
+
+from adaptation_pathways import Action
+
+from Code_for_GenerationEvaluation.InteractionTensor import InteractionTensor
+from Code_for_GenerationEvaluation.Scenario import Scenario, ScenarioEnsemble
+
 
 class PathwaysInputGenerator:
-    def __init__(self, filtered_sequences, action_characterization, scenario=None):
+    def __init__(self, filtered_sequences, action_characterization, scenario=None, interactions=False):
         """
         Initializes the PathwaysInputGenerator.
 
         :param filtered_sequences: List of filtered sequences of actions.
         :param action_characterization: Dictionary with action details.
-        :param scenario: Optional dictionary with time-series information.
+        :param scenario: Optional dictionary with time-series information, a compiled Scenario or a ScenarioEnsemble.
+        :param interactions: If True, the interactions_performance rules between the actions of a pathway change its
+                             effectiveness (see InteractionTensor). Default: False
         """
         self.filtered_sequences = filtered_sequences
         self.action_characterization = action_characterization
+        if isinstance(scenario, dict):
+            scenario = Scenario(scenario) if scenario else None  # Compile the time-series only once
         self.scenario = scenario
+        self.interaction_tensor = None
+        self.string_effectiveness = False  # Only interactions change '+'/'-' effectiveness by fractions
+        if interactions:
+            self.interaction_tensor = InteractionTensor(action_characterization, ['effectiveness'])
+            # Actions without effectiveness are not part of any pathway and do not decide the rounding
+            self.string_effectiveness = all(isinstance(details['effectiveness'], str)
+                                            for details in action_characterization.values()
+                                            if details.get('effectiveness') is not None)
 
     @staticmethod
     def aggregate_effectiveness(sequence, action_characterization, up_to_index):
@@ -47,53 +65,91 @@ class PathwaysInputGenerator:
         Interpolates the time for a given effectiveness value based on the scenario time-series.
 
         :param effectiveness_value: The effectiveness value to find in the scenario.
-        :param scenario: The scenario time-series data.
+        :param scenario: The scenario time-series data or a compiled Scenario.
         :return: Interpolated time for the effectiveness value.
         """
-        effectiveness_values = np.array(list(scenario.values()))
-        times = np.array(list(scenario.keys()))
+        if not isinstance(scenario, Scenario):
+            scenario = Scenario(scenario)
+        return scenario.interpolate([effectiveness_value])[0]
 
-        if effectiveness_value in effectiveness_values:
-            return scenario[effectiveness_value]
-        else:
-            idx = np.searchsorted(effectiveness_values, effectiveness_value)
-            if idx == 0 or idx == len(effectiveness_values):
-                raise ValueError(
-                    f"The timeseries is too short. It only captrues the range from year {times[0]} "
-                    f"({effectiveness_values[0]}) to {times[len(effectiveness_values)]} "
-                    f"({effectiveness_values[len(effectiveness_values)]}), not including {effectiveness_value}.")  # Out of range
-            lower_eff, upper_eff = effectiveness_values[idx - 1], effectiveness_values[idx]
-            lower_time, upper_time = times[idx - 1], times[idx]
-            # Linear interpolation
-            interpolated_time = lower_time + (upper_time - lower_time) * (
-                (effectiveness_value - lower_eff) / (upper_eff - lower_eff)
-            )
-            return interpolated_time
-
-    def generate_instance_dict(self):
+    @staticmethod
+    def format_effectiveness(aggregated_value, last_value):
         """
-        Generates the input files for the Pathways Generator.
+        Formats an aggregated effectiveness like aggregate_effectiveness does.
 
-        :return: A dictionary of dictionaries structured for input files.
+        :param aggregated_value: The sum of the effectiveness values ('+'/'-' strings counted as net score).
+        :param last_value: The effectiveness value of the last action, which determines the type of the result.
+        :return: The aggregated effectiveness as a string or float.
         """
-        self.instance_dict = {}
+        if isinstance(aggregated_value, int) and isinstance(last_value, str):
+            if aggregated_value > 0:
+                return '+' * aggregated_value
+            elif aggregated_value < 0:
+                return '-' * abs(aggregated_value)
+            return '0'
+        return aggregated_value
+
+    def build_trie(self):
+        """
+        Inserts all sequences into a prefix trie. Every node is one instance of an action, identified by the actions
+        preceding it, and is numbered per action in the order it is created. The effectiveness is aggregated along
+        the path, and the transitions of the sequences file are recorded in the same pass.
+        """
+        root = {}  # Children of a node: action -> [instance key, aggregated effectiveness, children]
+        self.instances = {}  # Action -> list with the aggregated effectiveness of every instance
+        self.transitions = []
 
         for sequence in self.filtered_sequences:
-            for idx, action in enumerate(sequence):
-                precondition = sequence[:idx]  # All elements up to (excluding) the current element
-                if action not in self.instance_dict:
-                    self.instance_dict[action] = {}
-                if precondition not in self.instance_dict[action]:
-                    self.instance_dict[action][precondition] = {}
-
-                # Calculate xposition
-                if self.scenario:
-                    effectiveness_value = self.aggregate_effectiveness(sequence, self.action_characterization, idx)
-                    xposition = self.interpolate_time(effectiveness_value, self.scenario)
-                else:
-                    xposition = self.aggregate_effectiveness(sequence, self.action_characterization, idx)
-
-                self.instance_dict[action][precondition]['xposition'] = xposition
+            children = root
+            aggregated_value = 0
+            previous_key = None
+            for position, action in enumerate(sequence):
+                node = children.get(action)
+                if node is None:
+                    value = self.action_characterization[action]['effectiveness']
+                    if isinstance(value, str):
+                        node_value = aggregated_value + value.count('+') - value.count('-')
+                    elif isinstance(value, (int, float)):
+                        node_value = aggregated_value + value
+                    else:
+                        node_value = aggregated_value
+
+                    if self.interaction_tensor is not None:
+                        node_value += self.interaction_change(sequence, position)
+                    # Interactions can change '+'/'-' effectiveness by fractions, the instances keep whole symbols
+                    effectiveness_value = int(InteractionTensor.round_net_score(node_value)) if self.string_effectiveness else node_value
+
+                    action_instances = self.instances.setdefault(action, [])
+                    node = [f"{action.replace(' ', '')}[{len(action_instances)}]", node_value, {}]
+                    action_instances.append(self.format_effectiveness(effectiveness_value, value))
+                    children[action] = node
+
+                if previous_key is not None:
+                    self.transitions.append((previous_key, node[0]))
+                elif len(sequence) > 1:
+                    # Add the 'current' line for the first action in the sequence
+                    self.transitions.append(("current", node[0]))
+                previous_key, aggregated_value, children = node
+
+    def interaction_change(self, sequence, position):
+        """
+        Computes the change of the effectiveness caused by the interactions between the action at a position and the
+        actions preceding it, so that the effectiveness of a pathway is updated incrementally along the trie.
+
+        :param sequence: The sequence of actions.
+        :param position: The position of the new action.
+        :return: The change of the effectiveness.
+        """
+        scores = [self.translate_effectiveness_to_int(self.action_characterization[action]['effectiveness'])
+                  for action in sequence[:position + 1]]
+        action = sequence[position]
+        change = 0
+        for previous_position, previous_action in enumerate(sequence[:position]):
+            change += self.interaction_tensor.pair_modifier(previous_action, action, position - previous_position,
+                                                            [scores[position]])[0]
+            change += self.interaction_tensor.pair_modifier(action, previous_action, previous_position - position,
+                                                            [scores[previous_position]])[0]
+        return change
 
     @staticmethod
     def translate_effectiveness_to_int(effectiveness_value):
@@ -109,68 +165,122 @@ class PathwaysInputGenerator:
             return plus_count - minus_count
         return effectiveness_value
 
-    def create_xpositions_file(self, end_current_system, output_file):
+    def compute_xpositions(self, end_current_system=0, percentiles=(5, 50, 95)):
         """
-        Creates the xpositions.txt file from the input dictionary.
+        Computes the xposition of every instance in the trie. With a scenario, the effectiveness values of all
+        instances are converted into times with one interpolation.
 
         :param end_current_system: tipping point of current system. Default: 0
-        :param output_file: The name of the output file.
+        :param percentiles: The percentiles summarizing a ScenarioEnsemble.
+        :return: Dictionary mapping None to the list of tuples (action key, instance, xposition), starting with the
+                 current system. With a ScenarioEnsemble, it maps every member and 'p{percentile}' to such a list.
         """
-        xpositions_list = [('current', end_current_system)]
-
-        for action, precondition_dict in self.instance_dict.items():
-            action_key = action.replace(' ', '')  # Remove whitespaces
-            for idx, (precondition, data) in enumerate(precondition_dict.items()):
-                xposition_value = data.get('xposition', 0)
-                # Translate effectiveness to int if it's a string
-                xposition_value = self.translate_effectiveness_to_int(xposition_value) + end_current_system
-                xpositions_list.append((f"{action_key}[{idx}]", xposition_value))
-
-        # Write the file
-        with open(output_file, 'w') as file:
-            for key, value in xpositions_list:
-                file.write(f"{key} {value}\n")
+        xpositions = [value for action_instances in self.instances.values() for value in action_instances]
+        if not isinstance(self.scenario, ScenarioEnsemble):
+            if self.scenario:
+                xpositions = self.scenario.interpolate(xpositions).tolist()
+            series = {None: xpositions}
+        else:
+            member_times = self.scenario.interpolate(xpositions)
+            series = {member: times.tolist() for member, times in zip(self.scenario.members, member_times)}
+            summary = self.scenario.percentiles(member_times, percentiles)
+            series.update({f"p{percentile}": times.tolist() for percentile, times in zip(percentiles, summary)})
 
-        print(f"File '{output_file}' created successfully.")
+        xpositions_lists = {}
+        for label, xpositions in series.items():
+            xpositions_list = [('current', None, end_current_system)]
+            xpositions = iter(xpositions)
+            for action, action_instances in self.instances.items():
+                action_key = action.replace(' ', '')  # Remove whitespaces
+                for idx in range(len(action_instances)):
+                    # Translate effectiveness to int if it's a string
+                    xposition_value = self.translate_effectiveness_to_int(next(xpositions)) + end_current_system
+                    xpositions_list.append((action_key, idx, xposition_value))
+            xpositions_lists[label] = xpositions_list
+        return xpositions_lists
 
-    def create_sequences_file(self, output_file):
+    def create_xpositions_file(self, end_current_system, output_file, percentiles=(5, 50, 95)):
         """
-        Creates the sequences.txt file from the input dictionary and filtered sequences.
+        Creates the xpositions.txt file from the instances in the trie.
+
+        With a ScenarioEnsemble, one file '{name}_{member}{extension}' is created per member and one file
+        '{name}_p{percentile}{extension}' per percentile of the times across the members.
 
+        :param end_current_system: tipping point of current system. Default: 0
         :param output_file: The name of the output file.
+        :param percentiles: The percentiles summarizing a ScenarioEnsemble.
         """
-        sequences_list = []
-
-        for sequence in self.filtered_sequences:
-            for i in range(len(sequence) - 1):
-                first_action = sequence[i]
-                second_action = sequence[i + 1]
+        name, extension = os.path.splitext(output_file)
+        for label, xpositions_list in self.compute_xpositions(end_current_system, percentiles).items():
+            file_name = output_file if label is None else f"{name}_{label}{extension}"
 
-                # Identify preconditions and their indices for both actions
-                first_precondition = sequence[:i]
-                second_precondition = sequence[:i + 1]
+            # Write the file
+            with open(file_name, 'w') as file:
+                for action_key, idx, value in xpositions_list:
+                    key = action_key if idx is None else f"{action_key}[{idx}]"
+                    file.write(f"{key} {value}\n")
 
-                first_idx = list(self.instance_dict[first_action].keys()).index(first_precondition)
-                second_idx = list(self.instance_dict[second_action].keys()).index(second_precondition)
+            print(f"File '{file_name}' created successfully.")
 
-                first_key = f"{first_action.replace(' ', '')}[{first_idx}]"
-                second_key = f"{second_action.replace(' ', '')}[{second_idx}]"
-
-                if i == 0:
-                    # Add the 'current' line for the first action in the sequence
-                    sequences_list.append(("current", first_key))
-
-                # Add the sequence pair to the list
-                sequences_list.append((first_key, second_key))
+    def create_sequences_file(self, output_file):
+        """
+        Creates the sequences.txt file from the transitions recorded in the trie.
 
+        :param output_file: The name of the output file.
+        """
         # Write the file
         with open(output_file, 'w') as file:
-            for col1, col2 in sequences_list:
+            for col1, col2 in self.transitions:
                 file.write(f"{col1} {col2}\n")
 
         print(f"File '{output_file}' created successfully.")
 
-    def generate_input_files(self, sequence_file='sequences.txt', xposition_file='xpositions.txt', end_current_system=0):
-        self.generate_instance_dict()
-        self.create_xpositions_file(end_current_system, xposition_file)
-        self.create_sequences_file(sequence_file)
+    def create_pathway_inputs(self, end_current_system=0, percentiles=(5, 50, 95)):
+        """
+        Creates the sequences and tipping points in memory, in the form read_sequences and read_tipping_points of
+        adaptation_pathways return them for the input files. They can be passed to sequences_to_sequence_graph and
+        assign_tipping_points directly.
+
+        :param end_current_system: tipping point of current system. Default: 0
+        :param percentiles: The percentiles summarizing a ScenarioEnsemble.
+        :return: List of (from, to) Action pairs and dictionary mapping the Actions to their tipping points.
+                 With a ScenarioEnsemble, the tipping points are a dictionary with one such dictionary per member
+                 and percentile.
+        """
+        xpositions_lists = self.compute_xpositions(end_current_system, percentiles)
+
+        # One Action object per instance, the pathway map identifies actions by object
+        actions = {}
+        for action_key, idx, _ in xpositions_lists[next(iter(xpositions_lists))]:
+            key = action_key if idx is None else f"{action_key}[{idx}]"
+            actions[key] = Action(action_key, idx or 0)
+        sequences = [(actions[first_key], actions[second_key]) for first_key, second_key in self.transitions]
+
+        # Tipping points of instances without transition are not part of the pathway map. Tipping points are
+        # integers, as read_tipping_points returns them from the xpositions file.
+        used_actions = {key for transition in self.transitions for key in transition}
+        tipping_points = {}
+        for label, xpositions_list in xpositions_lists.items():
+            tipping_points[label] = {}
+            for action_key, idx, value in xpositions_list:
+                key = action_key if idx is None else f"{action_key}[{idx}]"
+                if key in used_actions:
+                    tipping_points[label][actions[key]] = int(value)
+        return sequences, tipping_points[None] if None in tipping_points else tipping_points
+
+    def generate_input_files(self, sequence_file='sequences.txt', xposition_file='xpositions.txt', end_current_system=0,
+                             write_files=False):
+        """
+        Generates the input files for the Pathways Generator.
+
+        :param sequence_file: The name of the sequences file.
+        :param xposition_file: The name of the xpositions file.
+        :param end_current_system: tipping point of current system. Default: 0
+        :param write_files: If True, the sequences and xpositions files are written as well. Default: False
+        :return: List of (from, to) Action pairs and dictionary of tipping points (see create_pathway_inputs).
+        """
+        self.build_trie()
+        if write_files:
+            self.create_xpositions_file(end_current_system, xposition_file)
+            self.create_sequences_file(sequence_file)
+        return self.create_pathway_inputs(end_current_system)
@@ -0,0 +1,163 @@
+import numpy as np
+
+
+class Scenario:
+    def __init__(self, scenario):
+        """
+        Initializes the Scenario and compiles the time-series once into arrays.
+
+        :param scenario: Dictionary mapping times to the effectiveness that is required at that time.
+        """
+        self.times = np.array(list(scenario.keys()))
+        self.effectiveness_values = np.array(list(scenario.values()), dtype=float)
+        if len(self.times) < 2:
+            raise ValueError("The scenario needs at least two time steps.")
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("The times of the scenario need to be strictly increasing.")
+
+        differences = np.diff(self.effectiveness_values)
+        if np.all(differences < 0):
+            # Search on the reversed series, so that the effectiveness values are increasing
+            self.times = self.times[::-1]
+            self.effectiveness_values = self.effectiveness_values[::-1]
+        elif not np.all(differences > 0):
+            raise ValueError("The effectiveness values of the scenario need to be strictly monotone, otherwise the "
+                             "time of an effectiveness value is not unique.")
+
+    def check_range(self, effectiveness_values):
+        """
+        Raises an error if effectiveness values are not covered by the scenario.
+
+        :param effectiveness_values: Array of effectiveness values.
+        """
+        out_of_range = (effectiveness_values < self.effectiveness_values[0]) | (
+                effectiveness_values > self.effectiveness_values[-1])
+        if np.any(out_of_range):
+            first, last = (0, -1) if self.times[0] < self.times[-1] else (-1, 0)
+            raise ValueError(
+                f"The timeseries is too short. It covers the effectiveness from {self.effectiveness_values[first]} "
+                f"(year {self.times[first]}) to {self.effectiveness_values[last]} (year {self.times[last]}), "
+                f"but not {sorted(set(effectiveness_values[out_of_range].tolist()))}.")
+
+    def interpolate(self, effectiveness_values):
+        """
+        Interpolates the times for effectiveness values linearly between the time steps of the scenario.
+
+        :param effectiveness_values: Array (or list) of effectiveness values. '+'/'-' strings are counted as net score.
+        :return: Array with the interpolated times.
+        """
+        effectiveness_values = np.array([value.count('+') - value.count('-') if isinstance(value, str) else value
+                                         for value in effectiveness_values], dtype=float)
+        self.check_range(effectiveness_values)
+
+        position = np.searchsorted(self.effectiveness_values, effectiveness_values)
+        exact = self.effectiveness_values[position] == effectiveness_values
+        idx = np.maximum(position, 1)  # Exact matches of the first time step are not interpolated
+        lower_eff, upper_eff = self.effectiveness_values[idx - 1], self.effectiveness_values[idx]
+        lower_time, upper_time = self.times[idx - 1], self.times[idx]
+        # Linear interpolation
+        interpolated_times = lower_time + (upper_time - lower_time) * (
+            (effectiveness_values - lower_eff) / (upper_eff - lower_eff)
+        )
+        return np.where(exact, self.times[position], interpolated_times)
+
+
+class ScenarioEnsemble:
+    def __init__(self, times, effectiveness_values, members=None):
+        """
+        Initializes the ScenarioEnsemble and compiles all members into one array.
+
+        :param times: Times shared by all members of the ensemble.
+        :param effectiveness_values: Matrix (members, times) with the effectiveness required at each time per member.
+        :param members: Optional list with the names of the members. Default: 0, 1, 2, ...
+        """
+        self.times = np.array(times)
+        self.effectiveness_values = np.array(effectiveness_values, dtype=float)
+        if self.effectiveness_values.ndim != 2 or self.effectiveness_values.shape[1] != len(self.times):
+            raise ValueError("The effectiveness values need one row per member and one column per time.")
+        if len(self.times) < 2:
+            raise ValueError("The scenarios need at least two time steps.")
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("The times of the scenarios need to be strictly increasing.")
+        self.members = list(members) if members is not None else list(range(len(self.effectiveness_values)))
+        if len(self.members) != len(self.effectiveness_values):
+            raise ValueError("The number of member names does not match the number of scenarios.")
+
+        # Reverse decreasing members, so that the effectiveness values of every member are increasing
+        differences = np.diff(self.effectiveness_values, axis=1)
+        decreasing = np.all(differences < 0, axis=1)
+        if not np.all(decreasing | np.all(differences > 0, axis=1)):
+            not_monotone = [member for member, monotone in
+                            zip(self.members, decreasing | np.all(differences > 0, axis=1)) if not monotone]
+            raise ValueError(f"The effectiveness values of the scenarios {not_monotone} are not strictly monotone.")
+        self.member_times = np.where(decreasing[:, None], self.times[::-1], self.times)
+        self.effectiveness_values[decreasing] = self.effectiveness_values[decreasing, ::-1]
+
+        # Shift every member by a multiple of the total range, so that one search covers all members
+        minimum, maximum = self.effectiveness_values.min(), self.effectiveness_values.max()
+        self.row_offsets = np.arange(len(self.members))[:, None] * (maximum - minimum + 1)
+        self.shifted_values = (self.effectiveness_values + self.row_offsets).ravel()
+
+    @classmethod
+    def from_scenarios(cls, scenarios):
+        """
+        Creates an ensemble from scenario dictionaries that share the same times.
+
+        :param scenarios: Dictionary mapping member names to dictionaries of times and effectiveness values.
+        :return: The ScenarioEnsemble.
+        """
+        times = list(next(iter(scenarios.values())).keys())
+        if any(list(scenario.keys()) != times for scenario in scenarios.values()):
+            raise ValueError("All scenarios of an ensemble need the same times.")
+        return cls(times, [list(scenario.values()) for scenario in scenarios.values()], scenarios.keys())
+
+    def interpolate(self, effectiveness_values):
+        """
+        Interpolates the times for effectiveness values under every member of the ensemble.
+
+        :param effectiveness_values: Array (or list) of effectiveness values. '+'/'-' strings are counted as net score.
+        :return: Array (members, effectiveness values) with the interpolated times.
+        """
+        effectiveness_values = np.array([value.count('+') - value.count('-') if isinstance(value, str) else value
+                                         for value in effectiveness_values], dtype=float)
+        out_of_range = (effectiveness_values < self.effectiveness_values[:, :1]) | (
+                effectiveness_values > self.effectiveness_values[:, -1:])
+        if np.any(out_of_range):
+            members = [member for member, row in zip(self.members, out_of_range) if row.any()]
+            raise ValueError(
+                f"The timeseries of the scenarios {members} are too short. They do not cover the effectiveness values "
+                f"{sorted(set(np.broadcast_to(effectiveness_values, out_of_range.shape)[out_of_range].tolist()))}.")
+
+        number_times = len(self.times)
+        position = np.searchsorted(self.shifted_values, (effectiveness_values + self.row_offsets).ravel())
+        position = position.reshape(len(self.members), -1) - np.arange(len(self.members))[:, None] * number_times
+        # The shift can round values at the boundary of two time steps, correct the position by one step
+        position = np.clip(position, 0, number_times - 1)
+        row_values = np.take_along_axis(self.effectiveness_values, position, axis=1)
+        position += row_values < effectiveness_values
+        position = np.clip(position, 0, number_times - 1)
+        previous_values = np.take_along_axis(self.effectiveness_values, np.maximum(position - 1, 0), axis=1)
+        position -= (position > 0) & (previous_values >= effectiveness_values)
+
+        exact = np.take_along_axis(self.effectiveness_values, position, axis=1) == effectiveness_values
+        idx = np.maximum(position, 1)  # Exact matches of the first time step are not interpolated
+        lower_eff = np.take_along_axis(self.effectiveness_values, idx - 1, axis=1)
+        upper_eff = np.take_along_axis(self.effectiveness_values, idx, axis=1)
+        lower_time = np.take_along_axis(self.member_times, idx - 1, axis=1)
+        upper_time = np.take_along_axis(self.member_times, idx, axis=1)
+        # Linear interpolation
+        interpolated_times = lower_time + (upper_time - lower_time) * (
+            (effectiveness_values - lower_eff) / (upper_eff - lower_eff)
+        )
+        return np.where(exact, np.take_along_axis(self.member_times, position, axis=1), interpolated_times)
+
+    @staticmethod
+    def percentiles(member_times, percentiles=(5, 50, 95)):
+        """
+        Summarizes the interpolated times of all members.
+
+        :param member_times: Array (members, effectiveness values) returned by interpolate.
+        :param percentiles: The percentiles to compute.
+        :return: Array (percentiles, effectiveness values).
+        """
+        return np.percentile(member_times, percentiles, axis=0)
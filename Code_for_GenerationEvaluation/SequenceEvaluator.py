@@ -1,15 +1,64 @@
+import numpy as np
+
+from Code_for_GenerationEvaluation.InteractionTensor import InteractionTensor
+
+
+class EvaluationCache:
+    def __init__(self):
+        """
+        Initializes the EvaluationCache. All aggregations are sums, so evaluations are stored per multiset of actions
+        and reused for every permutation of the same actions.
+        """
+        self.evaluations = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, namespace, actions, compute, ordered=False):
+        """
+        Returns the stored evaluation for the actions or computes and stores it.
+
+        :param namespace: Hashable identifier of the kind of evaluation (e.g. the evaluation keys).
+        :param actions: The actions of the (partial) sequence.
+        :param compute: Function without arguments that computes the evaluation on a cache miss.
+        :param ordered: If True, the evaluation depends on the order of the actions and is not shared between
+                        permutations.
+        :return: The evaluation.
+        """
+        key = (namespace, tuple(actions) if ordered else tuple(sorted(actions)))
+        if key in self.evaluations:
+            self.hits += 1
+            return self.evaluations[key]
+        self.misses += 1
+        evaluation = compute()
+        self.evaluations[key] = evaluation
+        return evaluation
+
+    def clear(self):
+        """
+        Removes all stored evaluations and resets the counters.
+        """
+        self.evaluations = {}
+        self.hits = 0
+        self.misses = 0
+
+
 class SequenceEvaluator:
-    def __init__(self, sequences, action_characterization, evaluation_keys):
+    def __init__(self, sequences, action_characterization, evaluation_keys, cache=None, interactions=False):
         """
         Initializes the SequenceEvaluator.
 
         :param sequences: List of sequences to evaluate.
         :param action_characterization: Dictionary with action details.
         :param evaluation_keys: List of keys to evaluate.
+        :param cache: Optional EvaluationCache used by the 'memoized' backend. Default: a new cache.
+        :param interactions: If True, the interactions_performance rules of the actions are applied (see
+                             InteractionTensor). Default: False
         """
         self.sequences = sequences
         self.action_characterization = action_characterization
         self.evaluation_keys = evaluation_keys
+        self.cache = cache if cache is not None else EvaluationCache()
+        self.interaction_tensor = InteractionTensor(action_characterization, evaluation_keys) if interactions else None
 
     @staticmethod
     def evaluate_criterion(criterion_values):
@@ -55,16 +104,191 @@ class SequenceEvaluator:
             ]
             evaluation_results[key] = self.evaluate_criterion(criterion_values)
 
+        if self.interaction_tensor is not None:
+            self.apply_interactions(sequence, evaluation_results)
         return evaluation_results
 
-    def evaluate_all_sequences(self):
+    def apply_interactions(self, sequence, evaluation_results):
+        """
+        Changes the evaluation of a sequence by the interactions between its actions. '+'/'-' results are rounded to
+        whole symbols.
+
+        :param sequence: A sequence of measures.
+        :param evaluation_results: Dictionary with the evaluation scores of the sequence, changed in place.
+        """
+        values = []
+        for action in sequence:
+            action_values = [self.action_characterization[action].get(key, 0) for key in self.evaluation_keys]
+            values.append([value.count('+') - value.count('-') if isinstance(value, str) else value
+                           for value in action_values])
+        changes = self.interaction_tensor.sequence_modifiers(sequence, values)
+
+        for key, change in zip(self.evaluation_keys, changes):
+            value = evaluation_results[key]
+            if isinstance(value, str):
+                net_score = int(InteractionTensor.round_net_score(value.count('+') - value.count('-') + change))
+                evaluation_results[key] = '+' * net_score if net_score > 0 else '-' * abs(net_score) if net_score < 0 else '0'
+            else:
+                evaluation_results[key] = value + change
+
+    def evaluate_sequence_memoized(self, sequence):
+        """
+        Evaluates a single sequence and reuses the evaluation of earlier permutations of the same actions.
+
+        :param sequence: A sequence of measures.
+        :return: A dictionary of evaluation scores for the sequence.
+        """
+        # Interactions depend on the positions of the actions, so permutations only share evaluations without them
+        evaluation = self.cache.lookup((tuple(self.evaluation_keys), self.interaction_tensor is not None), sequence,
+                                       lambda: self.evaluate_sequence(sequence),
+                                       ordered=self.interaction_tensor is not None)
+        return dict(evaluation)
+
+    def encode_actions(self):
+        """
+        Encodes the action_characterization once into matrices of shape (actions + 1, evaluation_keys).
+        '+' and '-' strings are stored as net scores. The last row is used for padding and stays zero.
+        """
+        self.action_index = {action: index for index, action in enumerate(self.action_characterization)}
+        shape = (len(self.action_index) + 1, len(self.evaluation_keys))
+        self.score_matrix = np.zeros(shape)
+        self.is_string = np.zeros(shape, dtype=bool)  # Criterion value given as '+'/'-' string
+        self.is_float = np.zeros(shape, dtype=bool)  # Criterion value given as float
+        self.is_unsupported = np.zeros(shape, dtype=bool)  # Criterion value neither string nor number
+
+        for action, row in self.action_index.items():
+            for column, key in enumerate(self.evaluation_keys):
+                value = self.action_characterization[action].get(key, 0)
+                if isinstance(value, str):
+                    self.score_matrix[row, column] = value.count('+') - value.count('-')
+                    self.is_string[row, column] = True
+                elif isinstance(value, (int, float)):
+                    self.score_matrix[row, column] = value
+                    self.is_float[row, column] = isinstance(value, float)
+                else:
+                    self.is_unsupported[row, column] = True
+
+    def encode_sequences(self, sequences):
+        """
+        Encodes sequences as padded array of action indices.
+
+        :param sequences: List of sequences of actions.
+        :return: Array of shape (sequences, maximum length) with action indices and the boolean mask of real entries.
+        """
+        lengths = np.fromiter(map(len, sequences), dtype=np.intp, count=len(sequences))
+        flat_codes = np.fromiter((self.action_index[action] for sequence in sequences for action in sequence),
+                                 dtype=np.intp, count=int(lengths.sum()))
+        mask = np.arange(lengths.max(initial=0)) < lengths[:, None]
+        codes = np.full(mask.shape, len(self.action_index), dtype=np.intp)  # Padding refers to the zero row
+        codes[mask] = flat_codes
+        return codes, mask
+
+    def score_all_sequences(self, sequences=None):
+        """
+        Scores all sequences and criteria with one gather-and-sum.
+
+        :param sequences: List of sequences. Default: the sequences of the evaluator.
+        :return: Array of net scores (sequences, evaluation_keys), array indicating string results and array
+                 indicating float results.
+        """
+        if not hasattr(self, 'score_matrix'):
+            self.encode_actions()
+        codes, mask = self.encode_sequences(self.sequences if sequences is None else sequences)
+
+        scores = self.score_matrix[codes].sum(axis=1)
+        is_string = np.zeros(scores.shape, dtype=bool)
+        is_float = np.zeros(scores.shape, dtype=bool)
+        lengths = mask.sum(axis=1)
+        for column in range(len(self.evaluation_keys)):
+            # Only criteria with mixed types across the actions need to be checked per sequence
+            string_values = self.is_string[:-1, column]
+            if self.is_unsupported[:, column].any() and self.is_unsupported[codes, column].any():
+                raise ValueError("Inconsistent data types in criterion values: must be all strings or all floats/ints.")
+            if string_values.all():
+                is_string[:, column] = True
+            elif string_values.any():
+                string_counts = self.is_string[codes, column].sum(axis=1)
+                if np.any((string_counts > 0) & (string_counts < lengths)):
+                    raise ValueError("Inconsistent data types in criterion values: must be all strings or all floats/ints.")
+                is_string[:, column] = string_counts == lengths
+            else:
+                is_string[:, column] = lengths == 0
+            if self.is_float[:, column].any():
+                is_float[:, column] = self.is_float[codes, column].any(axis=1)
+
+        if self.interaction_tensor is not None:
+            changes, float_changes = self.interaction_tensor.modifiers(codes, self.score_matrix)
+            scores = np.where(is_string, InteractionTensor.round_net_score(scores + changes), scores + changes)
+            is_float |= float_changes
+        return scores, is_string, is_float
+
+    @staticmethod
+    def format_scores(net_scores, is_string, is_float):
+        """
+        Formats an array of net scores of one criterion like evaluate_criterion does.
+
+        :param net_scores: Array with the net scores of all sequences.
+        :param is_string: Boolean array indicating which scores are returned as '+'/'-' strings.
+        :param is_float: Boolean array indicating which scores are returned as floats.
+        :return: List of formatted scores.
+        """
+        integers = net_scores.astype(int)
+        if is_string.all():
+            # Translate every unique net score only once back into a string
+            unique_scores, inverse = np.unique(integers, return_inverse=True)
+            labels = ['+' * score if score > 0 else '-' * abs(score) if score < 0 else '0'
+                      for score in unique_scores.tolist()]
+            return [labels[index] for index in inverse.ravel().tolist()]
+        elif not is_string.any() and not is_float.any():
+            return integers.tolist()
+        elif not is_string.any() and is_float.all():
+            return net_scores.tolist()
+
+        values = []
+        for score, integer, string, floating in zip(net_scores.tolist(), integers.tolist(), is_string.tolist(),
+                                                   is_float.tolist()):
+            if string:
+                values.append('+' * integer if integer > 0 else '-' * abs(integer) if integer < 0 else '0')
+            else:
+                values.append(score if floating else integer)
+        return values
+
+    def evaluate_all_sequences_vectorized(self):
+        """
+        Evaluates all sequences with the array backend. The result is formatted like evaluate_all_sequences.
+
+        :return: A dictionary of dictionaries with sequences and their evaluations.
+        """
+        sequences = list(self.sequences)
+        scores, is_string, is_float = self.score_all_sequences(sequences)
+
+        columns = [self.format_scores(scores[:, column], is_string[:, column], is_float[:, column])
+                   for column in range(len(self.evaluation_keys))]
+
+        performance_dict = {}
+        for row, sequence in enumerate(sequences):
+            performance_dict[sequence] = {key: values[row] for key, values in zip(self.evaluation_keys, columns)}
+        return performance_dict
+
+    def evaluate_all_sequences(self, backend='python'):
         """
         Evaluates all sequences and generates the final performance dictionary.
 
+        :param backend: 'python' to evaluate sequence by sequence, 'memoized' to reuse evaluations of permutations
+                        of the same actions, 'numpy' to use the vectorized array backend.
         :return: A dictionary of dictionaries with sequences and their evaluations.
         """
+        if backend == 'numpy':
+            return self.evaluate_all_sequences_vectorized()
+        elif backend == 'memoized':
+            evaluate = self.evaluate_sequence_memoized
+        elif backend == 'python':
+            evaluate = self.evaluate_sequence
+        else:
+            raise ValueError(f"Unknown evaluation backend: {backend}")
+
         performance_dict = {}
         for sequence in self.sequences:
-            performance_dict[sequence] = self.evaluate_sequence(sequence)
+            performance_dict[sequence] = evaluate(sequence)
         return performance_dict
 
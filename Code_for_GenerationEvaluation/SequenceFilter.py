@@ -1,3 +1,176 @@
+import bisect
+
+import numpy as np
+
+
+SMALL_SUBSET = 32  # Subsets up to this size are sorted by direct dominance checks
+SMALL_PAIRS = 4096  # Pairs of subsets up to this number of point pairs are compared directly
+
+
+class _MaxFenwickTree:
+    """
+    Prefix maxima over positions 0..size-1, used by the sweeps of the divide-and-conquer sort.
+
+    :param size: Number of positions.
+    """
+
+    def __init__(self, size):
+        self.tree = [-1] * (size + 1)
+
+    def update(self, position, value):
+        position += 1
+        while position < len(self.tree):
+            if self.tree[position] < value:
+                self.tree[position] = value
+            position += position & -position
+
+    def query(self, position):
+        """
+        :param position: Last position of the prefix, -1 for an empty prefix.
+        :return: The maximum value at the positions 0..position, -1 if there is none.
+        """
+        position += 1
+        result = -1
+        while position > 0:
+            if self.tree[position] > result:
+                result = self.tree[position]
+            position -= position & -position
+        return result
+
+
+def _divide_and_conquer_ranks(points):
+    """
+    Computes the non-dominated ranks of unique, lexicographically sorted points with at least two objectives.
+
+    helper_a(subset, k) ranks a subset on the objectives 0..k, when all its points are equal in the objectives above k
+    and all dominating points outside the subset have been accounted for. helper_b(lower, upper, k) raises the ranks of
+    the upper points by the final ranks of the lower points that dominate them on the objectives 0..k, when every
+    lower point is not worse than every upper point in the objectives above k.
+
+    :param points: Array of shape (points, objectives), unique and sorted lexicographically.
+    :return: Array with the rank of the front of every point.
+    """
+    # Replace the values by their order within every objective, so that the sweeps can index them
+    values = np.column_stack([np.unique(column, return_inverse=True)[1].ravel() for column in points.T])
+    ranks = np.zeros(len(values), dtype=int)
+
+    def split_value(column):
+        return np.partition(column, len(column) // 2)[len(column) // 2]
+
+    def helper_a(subset, k):
+        if len(subset) < 2:
+            return
+        if len(subset) <= SMALL_SUBSET:
+            objectives = values[subset, :k + 1]
+            for position in range(1, len(subset)):
+                dominators = (objectives[:position] <= objectives[position]).all(axis=1)
+                ranks[subset[position]] = max(ranks[subset[position]],
+                                              ranks[subset[:position][dominators]].max(initial=-1) + 1)
+        elif k == 1:
+            sweep_a(subset)
+        else:
+            column = values[subset, k]
+            if column.min() == column.max():
+                helper_a(subset, k - 1)
+                return
+            median = split_value(column)
+            lower, middle, upper = subset[column < median], subset[column == median], subset[column > median]
+            helper_a(lower, k)
+            helper_b(lower, middle, k - 1)
+            helper_a(middle, k - 1)
+            helper_b(subset[column <= median], upper, k - 1)
+            helper_a(upper, k)
+
+    def helper_b(lower, upper, k):
+        if len(lower) == 0 or len(upper) == 0:
+            return
+        if len(lower) * len(upper) <= SMALL_PAIRS:
+            dominates = (values[lower, None, :k + 1] <= values[None, upper, :k + 1]).all(axis=2)
+            candidates = np.where(dominates, ranks[lower, None], -1).max(axis=0) + 1
+            ranks[upper] = np.maximum(ranks[upper], candidates)
+        elif k == 1:
+            sweep_b(lower, upper)
+        else:
+            lower_column, upper_column = values[lower, k], values[upper, k]
+            if lower_column.max() <= upper_column.min():
+                helper_b(lower, upper, k - 1)
+            elif lower_column.min() <= upper_column.max():
+                median = split_value(np.concatenate([lower_column, upper_column]))
+                helper_b(lower[lower_column < median], upper[upper_column < median], k)
+                helper_b(lower[lower_column > median], upper[upper_column > median], k)
+                helper_b(lower[lower_column <= median], upper[upper_column >= median], k - 1)
+
+    def sweep_a(subset):
+        # In lexicographic order, every earlier point with a second objective that is not larger dominates
+        second, positions = np.unique(values[subset, 1], return_inverse=True)
+        tree = _MaxFenwickTree(len(second))
+        subset_ranks = ranks[subset].tolist()
+        for index, position in enumerate(positions.ravel().tolist()):
+            rank = max(subset_ranks[index], tree.query(position) + 1)
+            subset_ranks[index] = rank
+            tree.update(position, rank)
+        ranks[subset] = subset_ranks
+
+    def sweep_b(lower, upper):
+        # Sweep over the first objective, lower points before upper points with the same value
+        second = np.unique(values[lower, 1])
+        lower_positions = np.searchsorted(second, values[lower, 1])
+        upper_positions = np.searchsorted(second, values[upper, 1], side='right') - 1
+        first = np.concatenate([values[lower, 0], values[upper, 0]])
+        is_upper = np.concatenate([np.zeros(len(lower), dtype=int), np.ones(len(upper), dtype=int)])
+        positions = np.concatenate([lower_positions, upper_positions]).tolist()
+        event_ranks = np.concatenate([ranks[lower], ranks[upper]]).tolist()
+        tree = _MaxFenwickTree(len(second))
+        for event in np.lexsort((is_upper, first)).tolist():
+            if event < len(lower):
+                tree.update(positions[event], event_ranks[event])
+            else:
+                event_ranks[event] = max(event_ranks[event], tree.query(positions[event]) + 1)
+        ranks[upper] = event_ranks[len(lower):]
+
+    helper_a(np.arange(len(values)), values.shape[1] - 1)
+    return ranks
+
+
+def non_dominated_sort(points, first_front_only=False):
+    """
+    Assigns every point to its non-dominated front. All objectives are minimized.
+
+    Duplicate points are sorted only once. Two objectives are sorted with a sweep in O(n log n), more objectives with
+    the divide-and-conquer sort of Jensen and Buzdalov in O(n log^(k-1) n) for k objectives.
+
+    :param points: Array of shape (points, objectives).
+    :param first_front_only: If True, only the first front is determined and all other points get rank -1.
+    :return: Array with the rank of the front of every point (0 is the non-dominated front).
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return np.zeros(0, dtype=int)
+    unique_points, inverse = np.unique(points, axis=0, return_inverse=True)  # Sorted lexicographically
+    inverse = inverse.ravel()
+    ranks = np.full(len(unique_points), -1, dtype=int)
+
+    if unique_points.shape[1] == 1:
+        ranks[:] = np.arange(len(unique_points))
+    elif unique_points.shape[1] == 2:
+        # Points are sorted by the first objective, so a point is dominated by a front if the lowest second
+        # objective of that front is not larger than its own
+        front_minima = []
+        for index, value in enumerate(unique_points[:, 1].tolist()):
+            rank = bisect.bisect_right(front_minima, value)
+            if rank == len(front_minima):
+                front_minima.append(value)
+            else:
+                front_minima[rank] = value
+            ranks[index] = rank
+    else:
+        ranks[:] = _divide_and_conquer_ranks(unique_points)
+
+    if first_front_only:
+        ranks[ranks > 0] = -1
+    return ranks[inverse]
+
+
 class SequenceFilter:
     def __init__(self, performance_dict, filtering_conditions):
         """
@@ -70,4 +243,47 @@ class SequenceFilter:
             if meets_all_conditions:
                 filtered_performance[sequence] = evaluations
 
-        return filtered_performance
\ No newline at end of file
+        return filtered_performance
+
+    @staticmethod
+    def objective_score(value):
+        """
+        Converts an evaluation value into a number, '+' and '-' strings are converted into their net score.
+
+        :param value: The value of an evaluation criterion.
+        :return: The numeric score.
+        """
+        if isinstance(value, str):
+            return value.count('+') - value.count('-')
+        elif isinstance(value, (int, float)):
+            return value
+        raise ValueError("Value type not supported for filtering.")
+
+    def pareto_front(self, objectives, ranked=False):
+        """
+        Selects the sequences that are not dominated by any other sequence on the given objectives.
+
+        :param objectives: Dictionary mapping evaluation keys to 'maximize' or 'minimize'.
+        :param ranked: If True, all sequences are returned as list of successive non-dominated fronts.
+        :return: A dictionary with the sequences of the non-dominated front and their evaluations,
+                 or a list of such dictionaries (one per front) if ranked is True.
+        """
+        signs = []
+        for criterion, direction in objectives.items():
+            if direction not in ('maximize', 'minimize'):
+                raise ValueError(f"Unknown optimization direction: {direction}")
+            signs.append(-1 if direction == 'maximize' else 1)
+
+        sequences = list(self.performance_dict.keys())
+        points = np.array([[self.objective_score(self.performance_dict[sequence][criterion])
+                            for criterion in objectives] for sequence in sequences], dtype=float)
+        ranks = non_dominated_sort(points.reshape(len(sequences), len(signs)) * np.array(signs),
+                                   first_front_only=not ranked)
+
+        fronts = [{} for _ in range(ranks.max(initial=-1) + 1)]
+        for sequence, rank in zip(sequences, ranks.tolist()):
+            if rank >= 0:
+                fronts[rank][sequence] = self.performance_dict[sequence]
+        if ranked:
+            return fronts
+        return fronts[0] if fronts else {}
\ No newline at end of file
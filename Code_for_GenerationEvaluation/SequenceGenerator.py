@@ -1,20 +1,125 @@
 import itertools
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+from Code_for_GenerationEvaluation.SequenceEvaluator import SequenceEvaluator
+from Code_for_GenerationEvaluation.SequenceFilter import SequenceFilter
+
+
+def enumerate_shard(action_characterization, m, filtering_conditions, leading_action):
+    """
+    Enumerates all valid sequences starting with one action. Used as task for the worker processes.
+
+    :param action_characterization: Dictionary with action details and interaction rules.
+    :param m: Maximum number of elements in a sequence.
+    :param filtering_conditions: Optional dictionary with filtering conditions applied during the generation.
+    :param leading_action: The first action of all sequences in this shard.
+    :return: List with one list of valid sequences per sequence length.
+    """
+    generator = SequenceGenerator(action_characterization, 0, m, filtering_conditions=filtering_conditions)
+    return [list(generator.extend_sequence([], length, {}, {}, candidates=[leading_action]))
+            for length in range(1, m + 1)]
 
 
 class SequenceGenerator:
-    def __init__(self, action_characterization, N, m):
+    def __init__(self, action_characterization, N, m, seed=None, filtering_conditions=None):
         """
         Initializes the ActionSequenceGenerator.
 
         :param action_characterization: Dictionary with action details and interaction rules.
         :param N: Number of sequences to generate.
         :param m: Maximum number of elements in a sequence.
+        :param seed: Optional seed for the random selection of sequences.
+        :param filtering_conditions: Optional dictionary with filtering conditions (see SequenceFilter) that the
+                                     generated sequences need to meet.
         """
         self.action_characterization = action_characterization
         self.N = N
         self.m = m
+        self.random = random.Random(seed) if seed is not None else random
         self.actions = list(action_characterization.keys())
+        self.filtering_conditions = filtering_conditions or {}
+        self.compile_requirements()
+        self.compile_bounds()
+
+    def compile_requirements(self):
+        """
+        Compiles the requirement rules once into per-action lookup tables for the backtracking engine.
+        """
+        self.blocked_after = {action: set() for action in self.actions}  # Actions that cannot follow the action
+        self.needed_after = {action: [] for action in self.actions}  # Actions that need to follow the action
+        self.directly_before = {action: [] for action in self.actions}  # Actions that need to follow directly
+        self.directly_after = {action: [] for action in self.actions}  # Actions that need to precede directly
+        self.unusable = set()  # Actions whose rules can never be satisfied
+
+        for action in self.actions:
+            requirements = self.action_characterization[action].get('requirements_action', [])
+            for requirement in requirements:
+                condition, target = requirement[0], requirement[1]
+                known_target = target in self.actions and target != action
+                if condition in ('blocks', 'after'):
+                    if known_target:
+                        self.blocked_after[action].add(target)
+                elif not known_target and condition in ('before', 'directly before', 'directly after'):
+                    # The target can never be placed next to (or after) the action
+                    self.unusable.add(action)
+                elif condition == 'before':
+                    self.needed_after[action].append(target)
+                elif condition == 'directly before':
+                    self.directly_before[action].append(target)
+                elif condition == 'directly after':
+                    self.directly_after[action].append(target)
+
+    def compile_bounds(self):
+        """
+        Compiles the filtering conditions that are monotone in the length of a prefix into bounds.
+
+        If all actions add a non-negative score to a criterion, an upper bound ('below' or the upper value of
+        'between') that is broken by a prefix is broken by all its extensions. The same holds for lower bounds if all
+        scores are non-positive. These bounds are used to prune whole subtrees during the generation.
+        """
+        self.bounds = []  # Tuples (scores per action, function returning True if a total breaks the bound)
+
+        for criterion, (direction, threshold) in self.filtering_conditions.items():
+            values = [self.action_characterization[action].get(criterion, 0) for action in self.actions]
+            if all(isinstance(value, str) for value in values):
+                scores = {action: value.count('+') - value.count('-') for action, value in zip(self.actions, values)}
+                if isinstance(threshold, str):
+                    threshold_score = threshold.count('+') - threshold.count('-')
+                elif isinstance(threshold, list):
+                    threshold_score = [t.count('+') - t.count('-') for t in threshold]
+                else:
+                    continue
+            elif all(isinstance(value, (int, float)) for value in values):
+                scores = dict(zip(self.actions, values))
+                threshold_score = threshold if isinstance(threshold, list) else float(threshold)
+            else:
+                continue  # Inconsistent data types are only reported by the evaluation
+
+            if all(score >= 0 for score in scores.values()):
+                if direction == 'below':
+                    self.bounds.append((scores, lambda total, limit=threshold_score: total >= limit))
+                elif direction == 'between':
+                    self.bounds.append((scores, lambda total, limit=threshold_score[1]: total > limit))
+            elif all(score <= 0 for score in scores.values()):
+                if direction == 'above':
+                    self.bounds.append((scores, lambda total, limit=threshold_score: total <= limit))
+                elif direction == 'between':
+                    self.bounds.append((scores, lambda total, limit=threshold_score[0]: total < limit))
+
+    def meets_filtering_conditions(self, sequence):
+        """
+        Checks a complete sequence against all filtering conditions.
+
+        :param sequence: A tuple representing an action sequence.
+        :return: True if the sequence meets all conditions, False otherwise.
+        """
+        for criterion, condition in self.filtering_conditions.items():
+            criterion_values = [self.action_characterization[action].get(criterion, 0) for action in sequence]
+            value = SequenceEvaluator.evaluate_criterion(criterion_values)
+            if not SequenceFilter.compare_criteria(value, condition):
+                return False
+        return True
 
     def generate_combinations(self):
         """
@@ -51,7 +156,7 @@ class SequenceGenerator:
                         return False
                 elif condition == 'directly before':
                     # Target measure needs to come directly after the current measure
-                    if target != sequence[index + 1]:
+                    if index + 1 == len(sequence) or target != sequence[index + 1]:
                         return False
                 elif condition == 'directly after':
                     # Target measure needs to come directly before the current measure
@@ -59,6 +164,151 @@ class SequenceGenerator:
                         return False
         return True
 
+    def is_complete(self, sequence, pending):
+        """
+        Checks if a valid prefix is also a valid sequence on its own.
+
+        :param sequence: List with the prefix of actions.
+        :param pending: Dictionary counting how many actions in the prefix still need each action to follow.
+        :return: True if no rule of the prefix waits for a following action, False otherwise.
+        """
+        return not pending and not (sequence and self.directly_before[sequence[-1]])
+
+    def valid_extensions(self, sequence, forbidden, pending, totals, candidates=None):
+        """
+        Finds the actions that can extend a valid prefix without breaking a requirement rule or a monotone bound.
+
+        :param sequence: List with the current prefix of actions.
+        :param forbidden: Dictionary counting how many actions in the prefix block each action.
+        :param pending: Dictionary counting how many actions in the prefix still need each action to follow.
+        :param totals: List with the scores of the prefix for every bound.
+        :param candidates: Optional list of actions to try at the next position. Default: all actions.
+        :return: Generator of tuples (action, totals of the extended prefix).
+        """
+        previous = sequence[-1] if sequence else None
+        required_next = self.directly_before[previous] if previous is not None else []
+        for action in candidates or self.actions:
+            if action in sequence or action in self.unusable or forbidden.get(action):
+                continue
+            if any(target != action for target in required_next):
+                continue
+            if any(target != previous for target in self.directly_after[action]):
+                continue
+            blocked = self.blocked_after[action]
+            needed = self.needed_after[action]
+            if any(target in sequence or target in blocked or forbidden.get(target) for target in needed):
+                continue
+            if any(target in blocked for target in pending if target != action):
+                continue
+            new_totals = [total + scores[action] for total, (scores, _) in zip(totals, self.bounds)]
+            if any(breaks_bound(total) for total, (_, breaks_bound) in zip(new_totals, self.bounds)):
+                continue  # All extensions of the prefix break the bound as well
+            yield action, new_totals
+
+    def extend_sequence(self, sequence, length, forbidden, pending, totals=None, candidates=None):
+        """
+        Extends a valid prefix action by action and prunes it as soon as a requirement rule can no longer be met
+        or a monotone filtering condition is broken.
+
+        :param sequence: List with the current prefix of actions.
+        :param length: Length of the sequences to yield.
+        :param forbidden: Dictionary counting how many actions in the prefix block each action.
+        :param pending: Dictionary counting how many actions in the prefix still need each action to follow.
+        :param totals: List with the scores of the prefix for every bound. Default: scores of an empty prefix.
+        :param candidates: Optional list of actions to try at the next position. Default: all actions.
+        :return: Generator of valid sequences of the given length starting with the prefix.
+        """
+        if len(sequence) == length:
+            if self.is_complete(sequence, pending):
+                if not self.filtering_conditions or self.meets_filtering_conditions(sequence):
+                    yield tuple(sequence)
+            return
+        if len(pending) > length - len(sequence):
+            return  # Not enough positions left to place all required actions
+
+        if totals is None:
+            totals = [0] * len(self.bounds)
+        for action, new_totals in self.valid_extensions(sequence, forbidden, pending, totals, candidates):
+            # Add the action to the prefix
+            blocked = self.blocked_after[action]
+            needed = self.needed_after[action]
+            sequence.append(action)
+            satisfied = pending.pop(action, 0)
+            for target in blocked:
+                forbidden[target] = forbidden.get(target, 0) + 1
+            for target in needed:
+                pending[target] = pending.get(target, 0) + 1
+
+            yield from self.extend_sequence(sequence, length, forbidden, pending, new_totals)
+
+            # Remove the action from the prefix again
+            for target in needed:
+                pending[target] -= 1
+                if not pending[target]:
+                    del pending[target]
+            for target in blocked:
+                forbidden[target] -= 1
+            if satisfied:
+                pending[action] = satisfied
+            sequence.pop()
+
+    def iter_valid_sequences(self):
+        """
+        Generates all valid sequences up to the length m with prefix-pruned backtracking.
+
+        The sequences are returned in the same order as filtering the output of generate_combinations.
+
+        :return: Generator of valid sequences.
+        """
+        for length in range(1, self.m + 1):
+            yield from self.extend_sequence([], length, {}, {})
+
+    def iter_parallel_sequences(self, workers):
+        """
+        Generates all valid sequences up to the length m on several processes, one shard per leading action.
+
+        The shards are merged in the same order as iter_valid_sequences returns the sequences.
+
+        :param workers: Number of worker processes.
+        :return: Generator of valid sequences.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(enumerate_shard, itertools.repeat(self.action_characterization),
+                                       itertools.repeat(self.m), itertools.repeat(self.filtering_conditions),
+                                       self.actions))
+        for length in range(self.m):
+            for shard in shards:
+                yield from shard[length]
+
+    def iter_filtered_combinations(self):
+        """
+        Generates all possible permutations of actions up to the length m and yields only the valid ones.
+
+        :return: Generator of valid sequences.
+        """
+        for i in range(1, self.m + 1):
+            for sequence in itertools.permutations(self.actions, i):
+                if self.is_valid_sequence(sequence) and self.meets_filtering_conditions(sequence):
+                    yield sequence
+
+    def reservoir_sample(self, sequences):
+        """
+        Randomly selects N sequences from a stream while keeping at most N sequences in memory.
+
+        :param sequences: Iterable of sequences.
+        :return: List of at most N randomly selected sequences.
+        """
+        reservoir = []
+        for count, sequence in enumerate(sequences):
+            if count < self.N:
+                reservoir.append(sequence)
+            else:
+                # Replace an element with decreasing probability N / (count + 1)
+                index = self.random.randrange(count + 1)
+                if index < self.N:
+                    reservoir[index] = sequence
+        return reservoir
+
     def filter_sequences(self, sequences):
         """
         Filters out invalid sequences based on interaction rules.
@@ -68,21 +318,29 @@ class SequenceGenerator:
         """
         return [seq for seq in sequences if self.is_valid_sequence(seq)]
 
-    def generate_filtered_sequences(self):
+    def generate_filtered_sequences(self, method='backtracking', streaming=False, workers=1):
         """
         Generates and filters sequences.
 
+        :param method: 'backtracking' to prune invalid prefixes while generating, 'exhaustive' to filter all permutations.
+        :param streaming: If True, valid sequences are streamed through a reservoir of size N instead of being stored.
+        :param workers: Number of processes used for the 'backtracking' method. Default: 1
         :return: List of valid sequences.
         """
-        # Generate all possible combinations
-        possible_combinations = self.generate_combinations()
+        if method == 'backtracking':
+            valid_sequences = self.iter_parallel_sequences(workers) if workers > 1 else self.iter_valid_sequences()
+        elif method == 'exhaustive':
+            valid_sequences = self.iter_filtered_combinations()
+        else:
+            raise ValueError(f"Unknown generation method: {method}")
 
-        # Filter the sequences
-        valid_sequences = self.filter_sequences(possible_combinations)
+        if streaming:
+            return self.reservoir_sample(valid_sequences)
+        valid_sequences = list(valid_sequences)
 
         # Randomly select N sequences
         if len(valid_sequences) > self.N:
-            random_combinations = random.sample(valid_sequences, self.N)
+            random_combinations = self.random.sample(valid_sequences, self.N)
         else:
             random_combinations = valid_sequences
 
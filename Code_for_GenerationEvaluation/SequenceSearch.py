@@ -0,0 +1,109 @@
+import heapq
+import itertools
+
+from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+
+
+class SequenceSearch:
+    def __init__(self, action_characterization, evaluation_keys, m, weights, filtering_conditions=None):
+        """
+        Initializes the SequenceSearch.
+
+        :param action_characterization: Dictionary with action details and interaction rules.
+        :param evaluation_keys: List of keys that contribute to the score of a sequence.
+        :param m: Maximum number of elements in a sequence.
+        :param weights: Dictionary with the weight of every evaluation key. Positive weights maximize the criterion,
+                        negative weights minimize it (e.g. -1 for Costs).
+        :param filtering_conditions: Optional dictionary with filtering conditions (see SequenceFilter) that the
+                                     found sequences need to meet.
+        """
+        self.action_characterization = action_characterization
+        self.evaluation_keys = evaluation_keys
+        self.m = m
+        missing_weights = [key for key in evaluation_keys if key not in (weights or {})]
+        if missing_weights:
+            raise ValueError(f"The search needs a weight for every evaluation key, missing: {missing_weights}. "
+                             f"Use negative weights for criteria that are minimized, like costs.")
+        self.weights = weights
+        self.generator = SequenceGenerator(action_characterization, 0, m, filtering_conditions=filtering_conditions)
+        self.score_actions()
+
+    def score_actions(self):
+        """
+        Computes the weighted score of every action. The evaluations of all criteria are sums over the actions, so the
+        score of a sequence is the sum of the scores of its actions.
+        """
+        self.action_scores = {action: 0 for action in self.action_characterization}
+        for key in self.evaluation_keys:
+            weight = self.weights[key]
+            values = [self.action_characterization[action].get(key, 0) for action in self.action_scores]
+            if all(isinstance(value, str) for value in values):
+                values = [value.count('+') - value.count('-') for value in values]
+            elif not all(isinstance(value, (int, float)) for value in values):
+                raise ValueError("Inconsistent data types in criterion values: must be all strings or all floats/ints.")
+            for action, value in zip(self.action_characterization, values):
+                self.action_scores[action] += weight * value
+        # Actions ordered by score, used to compute the bounds
+        self.ranked_actions = sorted(self.action_scores, key=self.action_scores.get, reverse=True)
+
+    def upper_bound(self, sequence, forbidden, score):
+        """
+        Computes an upper bound of the score of all extensions of a prefix: the best remaining actions are added
+        for every free position, as long as they improve the score.
+
+        :param sequence: Tuple with the prefix of actions.
+        :param forbidden: Dictionary counting how many actions in the prefix block each action.
+        :param score: The score of the prefix.
+        :return: The upper bound.
+        """
+        free_positions = self.m - len(sequence)
+        for action in self.ranked_actions:
+            if free_positions == 0 or self.action_scores[action] <= 0:
+                break
+            if action in sequence or action in self.generator.unusable or forbidden.get(action):
+                continue
+            score += self.action_scores[action]
+            free_positions -= 1
+        return score
+
+    def search(self, k):
+        """
+        Finds the k valid sequences with the highest score with best-first search. Prefixes are expanded in the order
+        of their upper bound, so a complete sequence is only returned once no other prefix can lead to a better one.
+
+        :param k: Number of sequences to return.
+        :return: List of tuples (sequence, score), ordered from the highest to the lowest score.
+        """
+        generator = self.generator
+        counter = itertools.count()  # Breaks ties in the order the entries were added
+        # Entries: (-priority, counter, is_complete, sequence, forbidden, pending, totals, score)
+        queue = [(-self.upper_bound((), {}, 0), next(counter), False, (), {}, {}, [0] * len(generator.bounds), 0)]
+        best_sequences = []
+
+        while queue and len(best_sequences) < k:
+            _, _, is_complete, sequence, forbidden, pending, totals, score = heapq.heappop(queue)
+            if is_complete:
+                best_sequences.append((sequence, score))
+                continue
+            if len(sequence) == self.m:
+                continue
+
+            for action, new_totals in generator.valid_extensions(sequence, forbidden, pending, totals):
+                new_sequence = sequence + (action,)
+                new_forbidden = dict(forbidden)
+                for target in generator.blocked_after[action]:
+                    new_forbidden[target] = new_forbidden.get(target, 0) + 1
+                new_pending = dict(pending)
+                new_pending.pop(action, None)
+                for target in generator.needed_after[action]:
+                    new_pending[target] = new_pending.get(target, 0) + 1
+                if len(new_pending) > self.m - len(new_sequence):
+                    continue  # Not enough positions left to place all required actions
+
+                new_score = score + self.action_scores[action]
+                if generator.is_complete(new_sequence, new_pending) and (
+                        not generator.filtering_conditions or generator.meets_filtering_conditions(new_sequence)):
+                    heapq.heappush(queue, (-new_score, next(counter), True, new_sequence, None, None, None, new_score))
+                heapq.heappush(queue, (-self.upper_bound(new_sequence, new_forbidden, new_score), next(counter), False,
+                                       new_sequence, new_forbidden, new_pending, new_totals, new_score))
+        return best_sequences
@@ -0,0 +1,217 @@
+class SequenceValidator:
+    def __init__(self, action_characterization, action_names=None):
+        """
+        Initializes the SequenceValidator and compiles the requirement rules into bitmasks.
+
+        :param action_characterization: Dictionary with action details and interaction rules.
+        :param action_names: Optional dictionary mapping names used in files (e.g. measure numbers) to actions.
+        """
+        self.action_characterization = action_characterization
+        self.actions = list(action_characterization.keys())
+        self.codes = {}
+        for code, action in enumerate(self.actions):
+            self.codes[action] = code
+            self.codes.setdefault(action.replace(' ', ''), code)  # Names in the input files have no whitespaces
+        if action_names:
+            for name, action in action_names.items():
+                self.codes[str(name)] = self.codes[action]
+        self.compile_rules()
+
+    def compile_rules(self):
+        """
+        Compiles the requirement rules of every action once into bitmasks and position tables.
+        """
+        number_actions = len(self.actions)
+        self.blocks_mask = [0] * number_actions  # Actions that may not follow the action
+        self.before_mask = [0] * number_actions  # Actions that need to follow the action
+        self.directly_before = [None] * number_actions  # Action that needs to follow directly
+        self.directly_after = [None] * number_actions  # Action that needs to precede directly
+        self.impossible = [None] * number_actions  # Rule that can never be satisfied
+
+        for code, action in enumerate(self.actions):
+            requirements = self.action_characterization[action].get('requirements_action', [])
+            for requirement in requirements:
+                condition, target = requirement[0], requirement[1]
+                target_code = self.codes.get(target) if isinstance(target, str) else None
+                if condition in ('blocks', 'after'):
+                    if target_code is not None:
+                        self.blocks_mask[code] |= 1 << target_code
+                elif condition in ('before', 'directly before', 'directly after'):
+                    if target_code is None:
+                        self.impossible[code] = requirement
+                    elif condition == 'before':
+                        self.before_mask[code] |= 1 << target_code
+                    else:
+                        position_table = self.directly_before if condition == 'directly before' else self.directly_after
+                        if position_table[code] not in (None, target_code):
+                            self.impossible[code] = requirement  # Two different direct neighbours required
+                        position_table[code] = target_code
+
+    def find_violation(self, sequence):
+        """
+        Checks a sequence against the compiled rules.
+
+        :param sequence: A sequence of actions (or names listed in action_names).
+        :return: None if the sequence is valid, otherwise a description of the first violation found.
+        """
+        try:
+            codes = [self.codes[action] for action in sequence]
+        except KeyError as e:
+            return f"Unknown action {e.args[0]}"
+
+        # Walk backwards, so that the set of actions following the current one is available as bitmask
+        following_mask = 0
+        for index in range(len(codes) - 1, -1, -1):
+            code = codes[index]
+            action = self.actions[code]
+            if self.impossible[code] is not None:
+                return f"{action}: rule {self.impossible[code]} cannot be satisfied"
+            if self.blocks_mask[code] & following_mask:
+                return f"{action}: blocked action follows at a later position"
+            if self.before_mask[code] & ~following_mask:
+                return f"{action}: required action does not follow"
+            target = self.directly_before[code]
+            if target is not None and (index + 1 == len(codes) or codes[index + 1] != target):
+                return f"{action}: {self.actions[target]} does not follow directly"
+            target = self.directly_after[code]
+            if target is not None and (index == 0 or codes[index - 1] != target):
+                return f"{action}: {self.actions[target]} does not precede directly"
+            following_mask |= 1 << code
+        return None
+
+    def is_valid_sequence(self, sequence):
+        """
+        Validates a sequence based on the requirement rules.
+
+        :param sequence: A sequence of actions.
+        :return: True if the sequence is valid, False otherwise.
+        """
+        return self.find_violation(sequence) is None
+
+    def validate_sequences(self, sequences):
+        """
+        Validates a batch of sequences.
+
+        :param sequences: Iterable of sequences of actions.
+        :return: List of tuples (index, sequence, violation) for all invalid sequences.
+        """
+        report = []
+        for index, sequence in enumerate(sequences):
+            violation = self.find_violation(sequence)
+            if violation is not None:
+                report.append((index, sequence, violation))
+        return report
+
+    @staticmethod
+    def strip_instance(name):
+        """
+        Removes the instance number from an action in an input file, e.g. '10[2]' becomes '10'.
+
+        :param name: The action as written in the input file.
+        :return: The action without instance number.
+        """
+        return name.split('[')[0]
+
+    @staticmethod
+    def read_pathway_sequences(lines):
+        """
+        Reconstructs the sequence of every pathway from a file with columns 'from to pathways'.
+
+        :param lines: Lines of the file, e.g. data/inputs/all_sequences_*.txt.
+        :return: List of tuples (line_numbers, sequence) with one entry per pathway.
+        """
+        transitions = {}
+        for line_number, line in enumerate(lines, 1):
+            columns = line.split()
+            if not columns:
+                continue
+            for pathway in columns[2].split(';'):
+                transitions.setdefault(pathway, {})[columns[0]] = (columns[1], line_number)
+
+        sequences = []
+        for pathway, next_action in transitions.items():
+            line_numbers = []
+            sequence = []
+            action = 'current'
+            while action in next_action and len(sequence) < len(next_action):
+                action, line_number = next_action[action]
+                line_numbers.append(line_number)
+                sequence.append(SequenceValidator.strip_instance(action))
+            if len(line_numbers) != len(next_action):
+                # Pathway is no single chain starting at the current situation
+                line_numbers = sorted(line_number for _, line_number in next_action.values())
+                sequence = None
+            sequences.append((line_numbers, sequence))
+        return sequences
+
+    @staticmethod
+    def read_transition_sequences(lines):
+        """
+        Reconstructs the sequences from a file with columns 'from to', e.g. the sequences.txt of the
+        PathwaysInputGenerator. Every path from the current situation to an action without successor is one sequence.
+
+        :param lines: Lines of the file.
+        :return: List of tuples (line_numbers, sequence).
+        """
+        previous_action = {}
+        has_successor = set()
+        for line_number, line in enumerate(lines, 1):
+            columns = line.split()
+            if not columns:
+                continue
+            previous_action[columns[1]] = (columns[0], line_number)
+            has_successor.add(columns[0])
+
+        sequences = []
+        for action in previous_action:
+            if action in has_successor:
+                continue
+            line_numbers = []
+            sequence = []
+            while action in previous_action and len(sequence) < len(previous_action):
+                sequence.append(SequenceValidator.strip_instance(action))
+                action, line_number = previous_action[action]
+                line_numbers.append(line_number)
+            sequences.append((line_numbers[::-1], sequence[::-1] if action == 'current' else None))
+        return sequences
+
+    def validate_file(self, file_path, file_format=None, separator=','):
+        """
+        Validates all sequences in a file and reports the lines that violate the requirement rules.
+
+        :param file_path: Path to the file.
+        :param file_format: 'sequences' (one sequence per line), 'transitions' (columns 'from to') or
+                            'pathways' (columns 'from to pathways'). If None, the format is derived from the first line.
+        :param separator: Separator between the actions of a line in the 'sequences' format.
+        :return: List of tuples (line_numbers, sequence, violation) for all invalid sequences.
+        """
+        with open(file_path, 'r') as file:
+            lines = file.readlines()
+
+        if file_format is None:
+            first_line = next((line for line in lines if line.strip()), '')
+            number_columns = len(first_line.split())
+            if separator in first_line or number_columns not in (2, 3):
+                file_format = 'sequences'
+            else:
+                file_format = 'transitions' if number_columns == 2 else 'pathways'
+
+        if file_format == 'sequences':
+            sequences = [([line_number], [action.strip() for action in line.strip().split(separator)])
+                         for line_number, line in enumerate(lines, 1) if line.strip()]
+        elif file_format == 'transitions':
+            sequences = self.read_transition_sequences(lines)
+        elif file_format == 'pathways':
+            sequences = self.read_pathway_sequences(lines)
+        else:
+            raise ValueError(f"Unknown file format: {file_format}")
+
+        report = []
+        for line_numbers, sequence in sequences:
+            if sequence is None:
+                report.append((line_numbers, sequence, "Sequence does not start at the current situation"))
+                continue
+            violation = self.find_violation(sequence)
+            if violation is not None:
+                report.append((line_numbers, sequence, violation))
+        return report
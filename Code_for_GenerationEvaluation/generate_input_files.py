@@ -1,21 +1,37 @@
 from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+from Code_for_GenerationEvaluation.SequenceSearch import SequenceSearch
 from Code_for_GenerationEvaluation.SequenceEvaluator import SequenceEvaluator
 from Code_for_GenerationEvaluation.SequenceFilter import SequenceFilter
 from Code_for_GenerationEvaluation.PathwaysInputGenerator import PathwaysInputGenerator
 
-def generate_input_files(action_characterization, evaluation_keys, filter_conditions,sequence_file='sequences.txt', xposition_file='xpositions.txt', end_current_system=0, N=100, m=3):
-
-    # Create the generator object
-    generator = SequenceGenerator(action_characterization, N, m)
-
-    # Generate and filter sequences
-    filtered_sequences = generator.generate_filtered_sequences()
+def generate_input_files(action_characterization, evaluation_keys, filter_conditions,sequence_file='sequences.txt', xposition_file='xpositions.txt', end_current_system=0, N=100, m=3,
+                         seed=None, streaming=False, workers=1, evaluation_backend='numpy', prune_with_filters=False,
+                         top_k=None, weights=None, scenario=None, interactions=False, write_files=False):
+
+    # Filter conditions on evaluated criteria, which can be checked while the sequences are built
+    evaluated_conditions = {criterion: condition for criterion, condition in filter_conditions.items()
+                            if criterion in evaluation_keys}
+    if top_k:
+        # Search the top_k sequences with the highest weighted score instead of drawing N random sequences. The
+        # search always gets the filter conditions, so the k sequences are the best ones that pass the filter.
+        # weights needs a weight for every evaluation key, negative weights minimize the criterion (e.g. Costs).
+        search = SequenceSearch(action_characterization, evaluation_keys, m, weights, evaluated_conditions)
+        filtered_sequences = [sequence for sequence, _ in search.search(top_k)]
+    else:
+        # Create the generator object. If requested, the filter conditions are already used to prune the
+        # generation, so that the N sequences are drawn from sequences that meet the conditions.
+        generator = SequenceGenerator(action_characterization, N, m, seed,
+                                      evaluated_conditions if prune_with_filters else None)
+
+        # Generate and filter sequences (streaming keeps only N sequences in memory)
+        filtered_sequences = generator.generate_filtered_sequences(streaming=streaming, workers=workers)
 
     # Create the evaluator object
-    evaluator = SequenceEvaluator(filtered_sequences, action_characterization, evaluation_keys)
+    evaluator = SequenceEvaluator(filtered_sequences, action_characterization, evaluation_keys,
+                                  interactions=interactions)
 
     # Evaluate all sequences
-    performance = evaluator.evaluate_all_sequences()
+    performance = evaluator.evaluate_all_sequences(backend=evaluation_backend)
 
     # Create the filter object
     sequence_filter = SequenceFilter(performance, filter_conditions)
@@ -23,9 +39,9 @@ def generate_input_files(action_characterization, evaluation_keys, filter_condit
     # Filter sequences
     filtered_sequences = sequence_filter.filter_sequences()
 
-    # Create the input generator object
-    generator = PathwaysInputGenerator(filtered_sequences, action_characterization)
+    # Create the input generator object (a ScenarioEnsemble writes one xpositions file per member)
+    generator = PathwaysInputGenerator(filtered_sequences, action_characterization, scenario, interactions)
 
-    # Generate input files
-    generator.generate_input_files(sequence_file, xposition_file, end_current_system)
+    # Generate input files, the sequences and tipping points are also returned in memory
+    return generator.generate_input_files(sequence_file, xposition_file, end_current_system, write_files)
 
@@ -2,7 +2,18 @@ import itertools
 import copy
 import random
 
-def all_possible_offsets(base_y_offset_dict, instance_dict, y_offsets, num_iterations):
+def offsets_to_optimize(base_y_offset_dict, instance_dict):
+    """
+    Identifies the measure instances without y-offset.
+
+    Parameters:
+    - base_y_offset_dict: Dict of the known y-offsets keyed by measure and instance.
+    - instance_dict: Dict mapping measures to their instances.
+
+    Returns:
+    - optimized_dict: Copy of base_y_offset_dict with an entry for every measure of instance_dict.
+    - keys_to_optimize: Dict mapping measures to the list of their instances without y-offset.
+    """
     # Step 1: Initialize the candidate dict with base_y_offset_dict values
     optimized_dict = copy.deepcopy(base_y_offset_dict)
 
@@ -14,6 +25,26 @@ def all_possible_offsets(base_y_offset_dict, instance_dict, y_offsets, num_itera
         for instance in instance_dict[key]:
             if optimized_dict[key].get(instance) is None:
                 keys_to_optimize[key].append(instance)
+    return optimized_dict, keys_to_optimize
+
+def offset_choices(num_instances, y_offsets):
+    """
+    Selects the y-offsets that can be assigned to the instances of a measure.
+
+    Parameters:
+    - num_instances: Number of instances without y-offset.
+    - y_offsets: List of the y-offsets, in order of preference.
+
+    Returns:
+    - choices: List of the y-offsets to choose from.
+    """
+    # If len(instances) is not a round number and y_offsets is long enough, include one extra offset
+    if num_instances % 2 != 0 and len(y_offsets) >= num_instances + 1:
+        return y_offsets[:num_instances + 1]
+    return y_offsets[:num_instances]
+
+def all_possible_offsets(base_y_offset_dict, instance_dict, y_offsets, num_iterations):
+    optimized_dict, keys_to_optimize = offsets_to_optimize(base_y_offset_dict, instance_dict)
 
     # Step 3: Generate all possible combinations of offsets for the undefined instances
     def generate_combinations(keys_to_optimize, y_offsets):
@@ -21,12 +52,8 @@ def all_possible_offsets(base_y_offset_dict, instance_dict, y_offsets, num_itera
         for key, instances in keys_to_optimize.items():
             num_instances = len(instances)
 
-            # If len(instances) is not a round number and y_offsets is long enough, include one extra offset
-            if num_instances % 2 != 0 and len(y_offsets) >= num_instances + 1:
-                combs = list(itertools.permutations(y_offsets[:num_instances + 1], num_instances))
-            else:
-                # Generate all unique permutations of the required number of offsets
-                combs = list(itertools.permutations(y_offsets[:num_instances], num_instances))
+            # Generate all unique permutations of the required number of offsets
+            combs = list(itertools.permutations(offset_choices(num_instances, y_offsets), num_instances))
 
             if len(combs) > 12:  # If too many, randomly sample
                 combs = random.sample(combs, 12)
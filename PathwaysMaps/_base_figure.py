@@ -1,16 +1,14 @@
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import matplotlib.pyplot as plt
-from PathwaysMaps._find_integers import find_first_and_second_integers
 
-def base_figure(self, data, action_pairs, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, ylabels):
+def base_figure(self, layout, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, ylabels):
     """
     Creates the base figure for the pathways map using Matplotlib.
 
     Parameters:
     - self: The class instance containing various configurations.
-    - data: Dict containing plotting data organized by measure.
-    - action_pairs: Dict containing the start and end coordinates of actions.
-    - action_transitions: List of transitions between actions.
+    - layout: MarkerLayout with the positions of the markers and segments.
+    - action_transitions: List of Transition records of the edges between actions.
     - offsets: Dict of offsets for measures.
     - preferred_dict_inv: Dict for measure button mappings.
     - measures_in_pathways: Dict of measures in each pathway.
@@ -18,13 +16,13 @@ def base_figure(self, data, action_pairs, action_transitions, offsets, preferred
     """
 
     # Add markers to the plot
-    self.ax = add_actions(self.ax, data, self.line_width_marker, self.size_marker)
+    self.ax = add_actions(self.ax, layout, self.line_width_marker, self.size_marker)
 
     # Add horizontal lines to the plot
-    self.ax = add_horizontal_lines(self.ax, action_pairs, self.line_width_line, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors)
+    self.ax = add_horizontal_lines(self.ax, layout, self.line_width_line, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors)
 
     # Add vertical lines to the plot
-    self.ax = add_vertical_lines(self.ax, action_transitions, action_pairs, offsets, self.line_width_line, self.measure_colors)
+    self.ax = add_vertical_lines(self.ax, action_transitions, layout, offsets, self.line_width_line, self.measure_colors)
     self.ax.set_xlim(planning_horizon)
     plt.xlabel('Years')
     plt.ylabel('Measures')
@@ -75,15 +73,14 @@ def base_figure(self, data, action_pairs, action_transitions, offsets, preferred
     # Ensure the bottom spine is visible
     self.ax.spines['bottom'].set_visible(True)
 
-def other_figure(self, data, action_pairs, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, ylabels, color='grey', alpha=0.8):
+def other_figure(self, layout, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, ylabels, color='grey', alpha=0.8):
     """
     Creates the pathways map highlighting the effect of interactions using Matplotlib.
 
     Parameters:
     - self: The class instance containing various configurations.
-    - data: Dict containing plotting data organized by measure.
-    - action_pairs: Dict containing the start and end coordinates of actions.
-    - action_transitions: List of transitions between actions.
+    - layout: MarkerLayout with the positions of the markers and segments.
+    - action_transitions: List of Transition records of the edges between actions.
     - offsets: Dict of offsets for measures.
     - preferred_dict_inv: Dict for measure button mappings.
     - measures_in_pathways: Dict of measures in each pathway.
@@ -91,26 +88,26 @@ def other_figure(self, data, action_pairs, action_transitions, offsets, preferre
     """
 
     # Add markers to the plot
-    self.ax = add_actions(self.ax, data, self.line_width_marker, self.size_marker, color, alpha, True)
+    self.ax = add_actions(self.ax, layout, self.line_width_marker, self.size_marker, color, alpha, True)
 
     # Add horizontal lines to the plot
-    self.ax = add_horizontal_lines(self.ax, action_pairs, self.line_width_line, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors, color, alpha, True)
+    self.ax = add_horizontal_lines(self.ax, layout, self.line_width_line, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors, color, alpha, True)
 
     # Add vertical lines to the plot
-    self.ax = add_vertical_lines(self.ax, action_transitions, action_pairs, offsets, self.line_width_line, self.measure_colors, color, alpha, True)
+    self.ax = add_vertical_lines(self.ax, action_transitions, layout, offsets, self.line_width_line, self.measure_colors, color, alpha, True)
 
     self.ax.set_xlim(planning_horizon)
     plt.xlabel('Years')
     plt.ylabel('Measures')
     plt.title('Pathways Map: Effect of interactions')
 
-def add_actions(ax, data, line_width_marker, size_marker, color='grey', alpha=0.8, other_pathways=False):
+def add_actions(ax, layout, line_width_marker, size_marker, color='grey', alpha=0.8, other_pathways=False):
     """
     Adds action markers to the Matplotlib axis.
 
     Parameters:
     - ax: The Matplotlib axis to add markers to.
-    - data: Dict containing plotting data organized by measure.
+    - layout: MarkerLayout with the positions of the markers.
     - line_width_marker: Width of the marker lines.
     - size_marker: Size of the markers.
     - other_pathways: Boolean indicating whether the markers belong to other pathways (colored grey).
@@ -120,25 +117,22 @@ def add_actions(ax, data, line_width_marker, size_marker, color='grey', alpha=0.
     """
     zorder = 2 if other_pathways else 3
 
-    for measure, points in data.items():
-        for point in points:
-            x, y = point[0]
-            facecolor = color if other_pathways and point[3] != 'w' else point[3]
-            edgecolor = color if other_pathways else point[2]
+    for _, measure, x, y, marker_color, marker_facecolor in layout.markers():
+        facecolor = color if other_pathways and marker_facecolor != 'w' else marker_facecolor
+        edgecolor = color if other_pathways else marker_color
 
-            ax.scatter(x, y, color=point[2], marker=point[1],
-                       alpha=alpha if other_pathways else 1, edgecolors=edgecolor, facecolors=facecolor, linewidth=line_width_marker, s=size_marker, zorder=zorder)
+        ax.scatter(x, y, color=marker_color, marker='o',
+                   alpha=alpha if other_pathways else 1, edgecolors=edgecolor, facecolors=facecolor, linewidth=line_width_marker, s=size_marker, zorder=zorder)
     return ax
 
-def add_horizontal_lines(ax, action_pairs, line_width_line, measures_in_pathways, line_choice, replacing_measure, measure_colors, color='grey', alpha=0.8, other_pathways=False):
+def add_horizontal_lines(ax, layout, line_width_line, measures_in_pathways, line_choice, replacing_measure, measure_colors, color='grey', alpha=0.8, other_pathways=False):
     """
     Adds horizontal lines to the Matplotlib axis.
 
     Parameters:
     - ax: The Matplotlib axis to add lines to.
-    - action_pairs: Dict containing the start and end coordinates of actions.
+    - layout: MarkerLayout with the positions of the segments.
     - line_width_line: Width of the lines.
-    - action_pairs: Dict containing the start and end coordinates of actions.
     - measures_in_pathways: Dict of measures in each pathway.
     - line_choice: Indicating whether different pathways are drawn with unique lines for active measures or just overlaid
     - replacing_measure: Dict of measures being replaced.
@@ -154,10 +148,8 @@ def add_horizontal_lines(ax, action_pairs, line_width_line, measures_in_pathways
     if line_choice == 'pathways_and_unique_lines':
 
         # Plot current measure
-        coords = action_pairs[('0', '0')]
-
-        begin_coords = coords['Begin']
-        end_coords = coords['End']
+        begin_coords = layout.begin('0', '0')
+        end_coords = layout.end('0', '0')
 
         ax.plot([begin_coords[0], end_coords[0]], [begin_coords[1], end_coords[1]], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors['0'], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
 
@@ -165,15 +157,13 @@ def add_horizontal_lines(ax, action_pairs, line_width_line, measures_in_pathways
         for pathway, measures in measures_in_pathways.items():
             old_keys = []
             measures_split = [tuple(item.replace(']', '').split('[')) for item in measures]
-            relevant_measures = {action_pairs[measure_instance]['Begin'][0]: measure_instance for measure_instance in measures_split if len(measure_instance) > 1}
+            relevant_measures = {layout.begin(*measure_instance)[0]: measure_instance for measure_instance in measures_split if len(measure_instance) > 1}
             sorted_years = sorted(relevant_measures)
 
             for year in sorted_years:
-                measure_instance = relevant_measures[year]
-                coords = action_pairs[measure_instance]
-                begin_coords = coords['Begin']
-                end_coords = coords['End']
-                measure, instance = measure_instance
+                measure, instance = relevant_measures[year]
+                begin_coords = layout.begin(measure, instance)
+                end_coords = layout.end(measure, instance)
 
                 ax.plot([begin_coords[0], end_coords[0]], [begin_coords[1], end_coords[1]], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors[measure], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
 
@@ -183,21 +173,18 @@ def add_horizontal_lines(ax, action_pairs, line_width_line, measures_in_pathways
 
                 old_keys.append(measure)
     else:
-        for (measure, instance), coords in action_pairs.items():
-            if 'Begin' in coords and 'End' in coords:
-                begin_coords = coords['Begin']
-                end_coords = coords['End']
-                ax.plot([begin_coords[0], end_coords[0]], [begin_coords[1], end_coords[1]], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors[measure], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
+        for measure, instance, begin_coords, end_coords in layout.complete_segments():
+            ax.plot([begin_coords[0], end_coords[0]], [begin_coords[1], end_coords[1]], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors[measure], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
     return ax
 
-def add_vertical_lines(ax, action_transitions, action_pairs, offsets, line_width_line, measure_colors, color='grey', alpha=0.8, other_pathways=False):
+def add_vertical_lines(ax, action_transitions, layout, offsets, line_width_line, measure_colors, color='grey', alpha=0.8, other_pathways=False):
     """
     Adds vertical lines to the Matplotlib axis.
 
     Parameters:
     - ax: The Matplotlib axis to add lines to.
-    - action_transitions: List of transitions between actions.
-    - action_pairs: Dict containing the start and end coordinates of actions.
+    - action_transitions: List of Transition records of the edges between actions.
+    - layout: MarkerLayout with the positions of the segments.
     - offsets: Dict of offsets for measures.
     - line_width_line: Width of the lines.
     - measure_colors: Dict mapping measures to their colors.
@@ -210,23 +197,22 @@ def add_vertical_lines(ax, action_transitions, action_pairs, offsets, line_width
     linestyle = '--' if other_pathways else '-'
 
     for transition in action_transitions:
-        if isinstance(transition[2], int):
+        if not transition.vertical:
             # Skip horizontal lines
             continue
         else:
-            start_measure, start_instance = find_first_and_second_integers(transition[0])
-            end_measure, end_instance = find_first_and_second_integers(transition[2])
-            end_x_pos = transition[1]
+            start_measure, start_instance = transition.from_measure, transition.from_instance
+            end_measure, end_instance = transition.to_measure, transition.to_instance
+            end_x_pos = transition.year
 
             if start_measure != '0':
                 group_offset = offsets.get(start_measure, 0)
                 end_x_pos += group_offset
 
-            if (start_measure, start_instance) in action_pairs:
-                if 'Begin' in action_pairs[(start_measure, start_instance)]:
-                    start_y_pos = action_pairs[(start_measure, start_instance)]['Begin'][1]
-                    end_y_pos = action_pairs[(end_measure, end_instance)]['End'][1]
-                    ax.plot([end_x_pos, end_x_pos], [start_y_pos, end_y_pos], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors[start_measure], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
+            if layout.has_begin(start_measure, start_instance):
+                start_y_pos = layout.begin(start_measure, start_instance)[1]
+                end_y_pos = layout.end(end_measure, end_instance)[1]
+                ax.plot([end_x_pos, end_x_pos], [start_y_pos, end_y_pos], alpha=alpha if other_pathways else 1, color=color if other_pathways else measure_colors[start_measure], linewidth=line_width_line, linestyle=linestyle, zorder=zorder)
     return ax
 
 def getImage(path):
@@ -1,20 +1,19 @@
 import numpy as np
 import plotly.graph_objects as go
-from PathwaysMaps._find_integers import find_first_and_second_integers
 
 from PathwaysMaps._helper_functions import image_to_base64, add_line_breaks
+from PathwaysMaps._pathway_index import index_pathways, pathways_with_measure_instance
 
 
 
-def base_figure_plotly(self, data, action_pairs, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, figure_title, ylabels,risk_owner_hazard):
+def base_figure_plotly(self, layout, action_transitions, offsets, preferred_dict_inv, measures_in_pathways, planning_horizon, figure_title, ylabels,risk_owner_hazard):
     """
     Creates the base figure for the pathways map using Plotly.
 
     Parameters:
     - self: The class instance containing various configurations.
-    - data: Dict containing plotting data organized by measure.
-    - action_pairs: Dict containing the start and end coordinates of actions.
-    - action_transitions: List of transitions between actions.
+    - layout: MarkerLayout with the positions of the markers and segments.
+    - action_transitions: List of Transition records of the edges between actions.
     - offsets: Dict of offsets for measures.
     - preferred_dict_inv: Dict for measure button mappings.
     - measures_in_pathways: Dict of measures in each pathway.
@@ -27,13 +26,13 @@ def base_figure_plotly(self, data, action_pairs, action_transitions, offsets, pr
     fig = self.figure
 
     # Add horizontal lines to the plot
-    fig = add_horizontal_lines(self, fig, action_pairs, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard)
+    fig = add_horizontal_lines(self, fig, layout, measures_in_pathways, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard)
 
     # Add vertical lines to the plot
-    fig = add_vertical_lines(self, fig, action_transitions, action_pairs, measures_in_pathways, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard)
+    fig = add_vertical_lines(self, fig, action_transitions, layout, measures_in_pathways, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard)
 
     # Add markers to the plot
-    fig = add_actions(self, fig, data, self.line_width_marker, self.size_marker, risk_owner_hazard)
+    fig = add_actions(self, fig, layout, self.line_width_marker, self.size_marker, risk_owner_hazard)
 
     # Optionally add measure logos to the plot
     if ylabels == 'logos':
@@ -84,8 +83,7 @@ def base_figure_plotly(self, data, action_pairs, action_transitions, offsets, pr
 
     return fig
 
-def pathways_plotly_with_background(self, data_new, action_pairs_new, action_transitions_new, data_old,
-                                    action_pairs_old, action_transitions_old, offsets, preferred_dict_inv,
+def pathways_plotly_with_background(self, layout_new, action_transitions_new, layout_old, action_transitions_old, offsets, preferred_dict_inv,
                                     measures_in_pathways_new, measures_in_pathways_old, planning_horizon,
                                     risk_owner_hazard, figure_title, ylabels, color):
     """
@@ -93,11 +91,9 @@ def pathways_plotly_with_background(self, data_new, action_pairs_new, action_tra
 
     Parameters:
     - self: The class instance containing various configurations.
-    - data_new: Dict containing plotting data to be highlighed organized by measure.
-    - action_pairs_new: Dict containing the start and end coordinates of actions to be highlighed.
+    - layout_new: MarkerLayout with the positions of the markers and segments to be highlighed.
     - action_transitions_new: List of transitions between actions to be highlighed.
-    - data_old: Dict containing plotting data for reference organized by measure.
-    - action_pairs_old: Dict containing the start and end coordinates of actions for reference.
+    - layout_old: MarkerLayout with the positions of the markers and segments for reference.
     - action_transitions_old: List of transitions between actions for reference.
     - offsets: Dict of offsets for measures.
     - preferred_dict_inv: Dict for measure button mappings.
@@ -113,14 +109,14 @@ def pathways_plotly_with_background(self, data_new, action_pairs_new, action_tra
     row = self.row
 
     # Add old pathways (colored grey)
-    fig = add_horizontal_lines(self, fig, action_pairs_old, measures_in_pathways_old, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard, color, other_pathways=True, col=col, row=row)
-    fig = add_vertical_lines(self, fig, action_transitions_old, action_pairs_old, measures_in_pathways_old, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard, color, other_pathways=True, col=col, row=row)
-    fig = add_actions(self, fig, data_old, self.line_width_marker, self.size_marker, risk_owner_hazard, color, other_pathways=True, change_plot=True, col=col, row=row)
+    fig = add_horizontal_lines(self, fig, layout_old, measures_in_pathways_old, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard, color, other_pathways=True, col=col, row=row)
+    fig = add_vertical_lines(self, fig, action_transitions_old, layout_old, measures_in_pathways_old, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard, color, other_pathways=True, col=col, row=row)
+    fig = add_actions(self, fig, layout_old, self.line_width_marker, self.size_marker, risk_owner_hazard, color, other_pathways=True, change_plot=True, col=col, row=row)
 
     # Add new pathways
-    fig = add_horizontal_lines(self, fig, action_pairs_new, measures_in_pathways_new, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard, col=col, row=row)
-    fig = add_vertical_lines(self, fig, action_transitions_new, action_pairs_new, measures_in_pathways_new, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard, col=col, row=row)
-    fig = add_actions(self, fig, data_new, self.line_width_marker, self.size_marker, risk_owner_hazard, change_plot=True, col=col, row=row)
+    fig = add_horizontal_lines(self, fig, layout_new, measures_in_pathways_new, self.line_choice, self.replacing_measure, self.measure_colors, risk_owner_hazard, col=col, row=row)
+    fig = add_vertical_lines(self, fig, action_transitions_new, layout_new, measures_in_pathways_new, offsets, self.line_width_line, self.measure_colors, risk_owner_hazard, col=col, row=row)
+    fig = add_actions(self, fig, layout_new, self.line_width_marker, self.size_marker, risk_owner_hazard, change_plot=True, col=col, row=row)
 
     # Optionally add measure logos to the plot
     if ylabels == 'logos':
@@ -171,13 +167,13 @@ def pathways_plotly_with_background(self, data_new, action_pairs_new, action_tra
 
     return fig
 
-def add_actions(self, fig, data, line_width_marker, size_marker, risk_owner_hazard, color='grey', other_pathways=False, change_plot=False, col = None, row = None):
+def add_actions(self, fig, layout, line_width_marker, size_marker, risk_owner_hazard, color='grey', other_pathways=False, change_plot=False, col = None, row = None):
     """
     Adds action markers to the Plotly figure.
 
     Parameters:
     - fig: The Plotly figure to add markers to.
-    - data: Dict containing plotting data organized by measure.
+    - layout: MarkerLayout with the positions and pathways of the markers.
     - line_width_marker: Width of the marker lines.
     - size_marker: Size of the markers.
     - other_pathways: Boolean indicating whether the markers belong to other pathways (colored grey).
@@ -185,69 +181,68 @@ def add_actions(self, fig, data, line_width_marker, size_marker, risk_owner_haza
     Returns:
     - fig: The Plotly figure with added action markers.
     """
-    for measure, points in data.items():
-        for point in points:
-            x, y = point[0]
-            first_part = f"<b>Pathway {point[4][0]}</b>" if len(
-                point[4]) == 1 else f"<b>Pathways {', '.join(point[4])}</b>"
-            second_part = f': ' if change_plot == False else f' (no interactions): ' if other_pathways else f' (with interactions): '
-            third_part = f"'{self.measure_dict[self.inverted_measure_numbers[int(measure)]]}' implemented as new measure in year {int(x)}" if point[3] != 'w' \
-                else f"Tipping point reached in year {int(x)}: current measures not sufficient anymore."
-            hover_text = (
-                first_part + second_part + third_part
-            )
+    for marker_index, measure, x, y, marker_color, marker_facecolor in layout.markers():
+        pathways = layout.marker_pathways(marker_index)
+        first_part = f"<b>Pathway {pathways[0]}</b>" if len(
+            pathways) == 1 else f"<b>Pathways {', '.join(pathways)}</b>"
+        second_part = f': ' if change_plot == False else f' (no interactions): ' if other_pathways else f' (with interactions): '
+        third_part = f"'{self.measure_dict[self.inverted_measure_numbers[int(measure)]]}' implemented as new measure in year {int(x)}" if marker_facecolor != 'w' \
+            else f"Tipping point reached in year {int(x)}: current measures not sufficient anymore."
+        hover_text = (
+            first_part + second_part + third_part
+        )
 
-            symbol = 'circle'
+        symbol = 'circle'
 
-            if col == None and row == None:
-                facecolor = 'white' if point[3] == 'w' else color if other_pathways else point[3]
-                marker = dict(
-                    symbol=symbol,
-                    size=size_marker,
-                    color=facecolor,
-                    line=dict(color=color if other_pathways else point[2], width=line_width_marker)
-                )
-                fig.add_trace(go.Scatter(
-                    x=[x],
-                    y=[y],
-                    mode='markers',
-                    marker=marker,
-                    showlegend=False,
-                    customdata=[point[4]],  # Full list of groups for each point without additional nesting
-                    text=hover_text,  # Display the pathways correctly
-                    hovertemplate="%{x}<extra></extra>",  # Ensure text is used in hover data
-                    # hoverinfo='none',  # Disable default hover info on the plot
-                    # hovertemplate = hover_text,
-                ))
-            else:
-                facecolor = 'white' if point[3] == 'w' else color if other_pathways else self.base_colors_sectors[risk_owner_hazard]
-                marker = dict(
-                    symbol=symbol,
-                    size=size_marker-5,
-                    color=facecolor,
-                    line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard], width=line_width_marker)
-                )
-                fig.add_trace(go.Scatter(
-                    x=[x],
-                    y=[y],
-                    mode='markers',
-                    marker=marker,
-                    showlegend=False,
-                    customdata=[point[4]],  # Full list of groups for each point without additional nesting
-                    # text=hover_text,  # Display the pathways correctly
-                    hovertemplate=hover_text,  # Ensure text is used in hover data
-                    hoverinfo='none',  # Disable default hover info on the plot
-                    # hovertemplate = hover_text,
-                ), row=row, col=col)
+        if col == None and row == None:
+            facecolor = 'white' if marker_facecolor == 'w' else color if other_pathways else marker_facecolor
+            marker = dict(
+                symbol=symbol,
+                size=size_marker,
+                color=facecolor,
+                line=dict(color=color if other_pathways else marker_color, width=line_width_marker)
+            )
+            fig.add_trace(go.Scatter(
+                x=[x],
+                y=[y],
+                mode='markers',
+                marker=marker,
+                showlegend=False,
+                customdata=[pathways],  # Full list of groups for each point without additional nesting
+                text=hover_text,  # Display the pathways correctly
+                hovertemplate="%{x}<extra></extra>",  # Ensure text is used in hover data
+                # hoverinfo='none',  # Disable default hover info on the plot
+                # hovertemplate = hover_text,
+            ))
+        else:
+            facecolor = 'white' if marker_facecolor == 'w' else color if other_pathways else self.base_colors_sectors[risk_owner_hazard]
+            marker = dict(
+                symbol=symbol,
+                size=size_marker-5,
+                color=facecolor,
+                line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard], width=line_width_marker)
+            )
+            fig.add_trace(go.Scatter(
+                x=[x],
+                y=[y],
+                mode='markers',
+                marker=marker,
+                showlegend=False,
+                customdata=[pathways],  # Full list of groups for each point without additional nesting
+                # text=hover_text,  # Display the pathways correctly
+                hovertemplate=hover_text,  # Ensure text is used in hover data
+                hoverinfo='none',  # Disable default hover info on the plot
+                # hovertemplate = hover_text,
+            ), row=row, col=col)
     return fig
 
-def add_horizontal_lines(self, fig, action_pairs, measures_in_pathways, line_choice, replacing_measure, measure_colors, risk_owner_hazard, color='grey',  other_pathways=False, col=None, row=None):
+def add_horizontal_lines(self, fig, layout, measures_in_pathways, line_choice, replacing_measure, measure_colors, risk_owner_hazard, color='grey',  other_pathways=False, col=None, row=None):
     """
     Adds horizontal lines to the Plotly figure.
 
     Parameters:
     - fig: The Plotly figure to add lines to.
-    - action_pairs: Dict containing the start and end coordinates of actions.
+    - layout: MarkerLayout with the positions of the segments.
     - measures_in_pathways: Dict of measures in each pathway.
     - line_choice: Indicating whether different pathways are drawn with unique lines for active measures or just overlaid
     - replacing_measure: Dict of measures being replaced.
@@ -257,12 +252,12 @@ def add_horizontal_lines(self, fig, action_pairs, measures_in_pathways, line_cho
     Returns:
     - fig: The Plotly figure with added horizontal lines.
     """
+    pathway_index = index_pathways(measures_in_pathways)  # Pathways per measure instance, built once
 
     if line_choice == 'pathways_and_unique_lines':
         # Plot current measure
-        coords = action_pairs[('0', '0')]
-        begin_coords = coords['Begin']
-        end_coords = coords['End']
+        begin_coords = layout.begin('0', '0')
+        end_coords = layout.end('0', '0')
 
         if col == None and row == None:
             fig.add_trace(go.Scatter(
@@ -290,17 +285,15 @@ def add_horizontal_lines(self, fig, action_pairs, measures_in_pathways, line_cho
         for pathway, measures in measures_in_pathways.items():
             old_keys = []
             measures_split = [tuple(item.replace(']', '').split('[')) for item in measures]
-            relevant_measures = {action_pairs[measure_instance]['Begin'][0]: measure_instance for measure_instance in measures_split if len(measure_instance) > 1}
+            relevant_measures = {layout.begin(*measure_instance)[0]: measure_instance for measure_instance in measures_split if len(measure_instance) > 1}
             sorted_years = sorted(relevant_measures)
 
             # add lines based on increasing years
             for year in sorted_years:
-                measure_instance = relevant_measures[year]
-                coords = action_pairs[measure_instance]
-                begin_coords = coords['Begin']
-                end_coords = coords['End']
-                measure, instance = measure_instance
-                customdata = [key for key, array in measures_in_pathways.items() if f'{measure}[{instance}]' in array or (measure == '0' and f'{measure}' in array)]
+                measure, instance = relevant_measures[year]
+                begin_coords = layout.begin(measure, instance)
+                end_coords = layout.end(measure, instance)
+                customdata = pathways_with_measure_instance(pathway_index, measure, instance)
 
                 if col == None and row == None:
                     fig.add_trace(go.Scatter(
@@ -368,42 +361,39 @@ def add_horizontal_lines(self, fig, action_pairs, measures_in_pathways, line_cho
                             ), row=row, col=col)
                 old_keys.append(measure)
     else:
-        for (measure, instance), coords in action_pairs.items():
-            customdata = [key for key, array in measures_in_pathways.items() if f'{measure}[{instance}]' in array or (measure == '0' and f'{measure}' in array)]
-            if 'Begin' in coords and 'End' in coords:
-                begin_coords = coords['Begin']
-                end_coords = coords['End']
-                if col == None and row == None:
-                    fig.add_trace(go.Scatter(
-                        x=[begin_coords[0], end_coords[0]],
-                        y=[begin_coords[1], end_coords[1]],
-                        mode='lines',
-                        line=dict(color=color if other_pathways else measure_colors.get(measure, 'pink'), width=self.line_width_line, dash='dash' if other_pathways else 'solid'),
-                        showlegend=False,
-                        customdata=customdata,
-                        hovertext=customdata
-                    ))
-                else:
-                    fig.add_trace(go.Scatter(
-                        x=[begin_coords[0], end_coords[0]],
-                        y=[begin_coords[1], end_coords[1]],
-                        mode='lines',
-                        line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard],
-                                  width=self.line_width_line, dash='solid'),
-                        showlegend=False,
-                        customdata=customdata,
-                        hovertext=customdata
-                    ), row=row, col=col)
+        for measure, instance, begin_coords, end_coords in layout.complete_segments():
+            customdata = pathways_with_measure_instance(pathway_index, measure, instance)
+            if col == None and row == None:
+                fig.add_trace(go.Scatter(
+                    x=[begin_coords[0], end_coords[0]],
+                    y=[begin_coords[1], end_coords[1]],
+                    mode='lines',
+                    line=dict(color=color if other_pathways else measure_colors.get(measure, 'pink'), width=self.line_width_line, dash='dash' if other_pathways else 'solid'),
+                    showlegend=False,
+                    customdata=customdata,
+                    hovertext=customdata
+                ))
+            else:
+                fig.add_trace(go.Scatter(
+                    x=[begin_coords[0], end_coords[0]],
+                    y=[begin_coords[1], end_coords[1]],
+                    mode='lines',
+                    line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard],
+                              width=self.line_width_line, dash='solid'),
+                    showlegend=False,
+                    customdata=customdata,
+                    hovertext=customdata
+                ), row=row, col=col)
     return fig
 
-def add_vertical_lines(self, fig, action_transitions, action_pairs, measures_in_pathways, offsets, line_width_line, measure_colors, risk_owner_hazard, color='grey',  other_pathways=False, row=None, col=None):
+def add_vertical_lines(self, fig, action_transitions, layout, measures_in_pathways, offsets, line_width_line, measure_colors, risk_owner_hazard, color='grey',  other_pathways=False, row=None, col=None):
     """
     Adds vertical lines to the Plotly figure.
 
     Parameters:
     - fig: The Plotly figure to add lines to.
-    - action_transitions: List of transitions between actions.
-    - action_pairs: Dict containing the start and end coordinates of actions.
+    - action_transitions: List of Transition records of the edges between actions.
+    - layout: MarkerLayout with the positions of the segments.
     - measures_in_pathways: Dict of measures in each pathway.
     - offsets: Dict of offsets for measures.
     - line_width_line: Width of the lines.
@@ -413,47 +403,47 @@ def add_vertical_lines(self, fig, action_transitions, action_pairs, measures_in_
     Returns:
     - fig: The Plotly figure with added vertical lines.
     """
+    pathway_index = index_pathways(measures_in_pathways)  # Pathways per measure instance, built once
     for transition in action_transitions:
-        if isinstance(transition[2], int):
+        if not transition.vertical:
             # Skip horizontal lines
             continue
         else:
-            start_measure, start_instance = find_first_and_second_integers(transition[0])
-            end_measure, end_instance = find_first_and_second_integers(transition[2])
-            end_x_pos = transition[1]
+            start_measure, start_instance = transition.from_measure, transition.from_instance
+            end_measure, end_instance = transition.to_measure, transition.to_instance
+            end_x_pos = transition.year
 
-            customdata = [key for key, array in measures_in_pathways.items() if f'{end_measure}[{end_instance}]' in array or (end_measure == '0' and f'{end_measure}' in array)]
+            customdata = pathways_with_measure_instance(pathway_index, end_measure, end_instance)
 
             if start_measure != '0':
                 group_offset = offsets.get(start_measure, 0)
                 end_x_pos += group_offset
 
-            if (start_measure, start_instance) in action_pairs:
-                if 'Begin' in action_pairs[(start_measure, start_instance)]:
-                    start_y_pos = action_pairs[(start_measure, start_instance)]['Begin'][1]
-                    end_y_pos = action_pairs[(end_measure, end_instance)]['End'][1]
-
-                    if col == None and row == None:
-                        fig.add_trace(go.Scatter(
-                            x=[end_x_pos, end_x_pos],
-                            y=[start_y_pos, end_y_pos],
-                            mode='lines',
-                            line=dict(color=color if other_pathways else measure_colors.get(start_measure, 'pink'), width=line_width_line, dash='dash' if other_pathways else 'solid'),
-                            showlegend=False,
-                            customdata=customdata,
-                            hovertext=customdata
-                        ))
-                    else:
-                        fig.add_trace(go.Scatter(
-                            x=[end_x_pos, end_x_pos],
-                            y=[start_y_pos, end_y_pos],
-                            mode='lines',
-                            line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard],
-                                      width=line_width_line, dash='solid'),
-                            showlegend=False,
-                            customdata=customdata,
-                            hovertext=customdata
-                        ), row=row, col=col)
+            if layout.has_begin(start_measure, start_instance):
+                start_y_pos = layout.begin(start_measure, start_instance)[1]
+                end_y_pos = layout.end(end_measure, end_instance)[1]
+
+                if col == None and row == None:
+                    fig.add_trace(go.Scatter(
+                        x=[end_x_pos, end_x_pos],
+                        y=[start_y_pos, end_y_pos],
+                        mode='lines',
+                        line=dict(color=color if other_pathways else measure_colors.get(start_measure, 'pink'), width=line_width_line, dash='dash' if other_pathways else 'solid'),
+                        showlegend=False,
+                        customdata=customdata,
+                        hovertext=customdata
+                    ))
+                else:
+                    fig.add_trace(go.Scatter(
+                        x=[end_x_pos, end_x_pos],
+                        y=[start_y_pos, end_y_pos],
+                        mode='lines',
+                        line=dict(color=color if other_pathways else self.base_colors_sectors[risk_owner_hazard],
+                                  width=line_width_line, dash='solid'),
+                        showlegend=False,
+                        customdata=customdata,
+                        hovertext=customdata
+                    ), row=row, col=col)
     return fig
 
 def add_measure_buttons_plotly(self, fig, preferred_dict_inv, planning_horizon, risk_owner_hazard, col=None, row=None):
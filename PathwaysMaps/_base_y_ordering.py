@@ -0,0 +1,203 @@
+import numpy as np
+
+BASE_Y_EXACT_LIMIT = 16  # Largest number of measures ordered with the exact solver, memory grows with 2^n * n
+
+
+def vertical_transitions(actions, action_transitions):
+    """
+    Collects the vertical transitions that count for the total vertical distance, as in create_optimized_positions.
+
+    Parameters:
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
+    - action_transitions: List of Transition records.
+
+    Returns:
+    - transitions: List of tuples (start_measure, start_instance, end_measure, end_instance) of the vertical
+      transitions that start at a measure instance with a Begin marker.
+    """
+    begins = {(key.measure, key.instance) for key in actions if key.kind == 'Begin'}
+    return [(transition.from_measure, transition.from_instance, transition.to_measure, transition.to_instance)
+            for transition in action_transitions
+            if transition.vertical and (transition.from_measure, transition.from_instance) in begins]
+
+
+def vertical_edges(actions, action_transitions, base_y_values, y_offsets):
+    """
+    Collects the vertical transitions with the difference of their y-offsets.
+
+    Parameters:
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
+    - action_transitions: List of Transition records.
+    - base_y_values: Dict of base y-values keyed by measure identifiers.
+    - y_offsets: Dict of y-offsets keyed by measure and instance.
+
+    Returns:
+    - edges: List of tuples (start_measure, end_measure, offset_difference). The vertical distance of an edge is
+      |base_y[start_measure] - base_y[end_measure] + offset_difference|.
+    """
+    def y_offset(measure, instance):
+        return y_offsets[measure][str(instance)] if measure != '0' else 0
+
+    return [(start_measure, end_measure, y_offset(start_measure, start_instance) - y_offset(end_measure, end_instance))
+            for start_measure, start_instance, end_measure, end_instance
+            in vertical_transitions(actions, action_transitions)]
+
+
+def total_distance(edges, base_y_values):
+    """
+    Computes the total vertical distance of the edges for an assignment of base y-values.
+
+    Parameters:
+    - edges: List returned by vertical_edges.
+    - base_y_values: Dict of base y-values keyed by measure identifiers, measures without value are at 0.
+
+    Returns:
+    - y_dist: The sum of the absolute vertical distances.
+    """
+    return sum(abs(int(base_y_values.get(start, 0)) - int(base_y_values.get(end, 0)) + difference)
+               for start, end, difference in edges)
+
+
+def order_base_y_values(base_y_values, edges, exact_limit=BASE_Y_EXACT_LIMIT):
+    """
+    Assigns the base y-values to the measures, so that the total vertical distance of the edges is minimal and the
+    current situation ('0') is at the top (maximum base y-value).
+
+    The exact solver is a dynamic program over the subsets of measures that fill the top positions. Because the
+    offsets are smaller than the distance between two base y-values, the distance of an edge only depends on the
+    base y-values it spans and on which of its measures is on top, so the cost of a subset does not depend on the
+    order within the subset. If the offsets are too large for this, a local search that swaps pairs of measures
+    improves the order of the dynamic program. Above exact_limit measures, only the local search is used.
+
+    Parameters:
+    - base_y_values: Dict of base y-values keyed by measure identifiers.
+    - edges: List returned by vertical_edges.
+    - exact_limit: Largest number of measures for the exact solver.
+
+    Returns:
+    - preferred_base: Dict of base y-values for the optimal assignment, in the key order of base_y_values.
+    """
+    measures = list(base_y_values)
+    slot_values = sorted(base_y_values.values(), reverse=True)  # Top position first
+    slot_ints = [int(value) for value in slot_values]
+    gaps = np.diff(slot_ints)
+    index = {measure: position for position, measure in enumerate(measures)}
+    number_measures = len(measures)
+
+    # Split the edges into single measure (other measure fixed at 0) and pairwise terms, the others are constant
+    unary = np.zeros((number_measures, number_measures))  # measure, slot
+    weights = np.zeros((number_measures, number_measures))  # Number of edges between two measures
+    above = np.zeros((number_measures, number_measures))  # Offset term if the first measure is above the second
+    largest_difference = 0
+    for start, end, difference in edges:
+        if start in index and end in index and start != end:
+            weights[index[start], index[end]] += 1
+            weights[index[end], index[start]] += 1
+            above[index[start], index[end]] += difference
+            above[index[end], index[start]] -= difference
+            largest_difference = max(largest_difference, abs(difference))
+        elif start in index and start != end:
+            unary[index[start]] += np.abs(np.array(slot_ints) + difference)
+        elif end in index and start != end:
+            unary[index[end]] += np.abs(difference - np.array(slot_ints))
+
+    order = None
+    if number_measures <= exact_limit:
+        order = exact_order(index['0'], gaps, unary, weights, above)
+    exact = (order is not None and len(set(slot_ints)) == number_measures
+             and (number_measures < 2 or largest_difference <= -gaps.max()))
+    if not exact:
+        # The dynamic program is not exact for these offsets, improve its order (if any) by swapping measures
+        order = swap_search_order(index['0'], slot_ints, edges, measures, order)
+
+    slot_of = {measures[measure]: slot for slot, measure in enumerate(order)}
+    return {measure: slot_values[slot_of[measure]] for measure in measures}
+
+
+def exact_order(top, gaps, unary, weights, above):
+    """
+    Finds the optimal order of the measures from top to bottom with a dynamic program over subsets, O(2^n * n).
+
+    Parameters:
+    - top: Index of the measure that is pinned at the top.
+    - gaps: Array with the (negative) differences between the integer base y-values of consecutive positions.
+    - unary: Array (measure, position) with the cost of the edges to measures outside the ordering.
+    - weights: Array (measure, measure) with the number of edges between two measures.
+    - above: Array (measure, measure) with the offset cost if the first measure is above the second.
+
+    Returns:
+    - order: List of the measure indices from top to bottom.
+    """
+    number_measures = len(unary)
+    masks = np.arange(2 ** number_measures)
+    bits = (masks[:, None] >> np.arange(number_measures)) & 1
+    sizes = bits.sum(axis=1)
+    # Number of edges between a subset and the other measures, and the offset cost of a measure below a subset
+    internal = ((bits @ weights) * bits).sum(axis=1) / 2
+    cut = bits @ weights.sum(axis=0) - 2 * internal
+    below = bits @ above
+
+    def step_cost(subset, measure, size):
+        return -gaps[size - 1] * cut[subset] + below[subset, measure] + unary[measure, size]
+
+    cost = np.full(len(masks), np.inf)
+    cost[1 << top] = unary[top, 0]
+    for size in range(1, number_measures):
+        layer = masks[(sizes == size) & np.isfinite(cost)]
+        for measure in range(number_measures):
+            subsets = layer[bits[layer, measure] == 0]
+            np.minimum.at(cost, subsets | (1 << measure), cost[subsets] + step_cost(subsets, measure, size))
+
+    # Reconstruct the order from the bottom
+    order = []
+    subset = len(masks) - 1
+    for size in range(number_measures - 1, 0, -1):
+        candidates = [measure for measure in range(number_measures) if measure != top and bits[subset, measure]]
+        measure = min(candidates, key=lambda candidate: cost[subset ^ (1 << candidate)]
+                      + step_cost(subset ^ (1 << candidate), candidate, size))
+        order.append(measure)
+        subset ^= 1 << measure
+    order.append(top)
+    return order[::-1]
+
+
+def swap_search_order(top, slot_ints, edges, measures, order=None):
+    """
+    Improves the order of the measures by swapping pairs of measures as long as the total distance decreases.
+
+    Parameters:
+    - top: Index of the measure that is pinned at the top.
+    - slot_ints: List with the integer base y-value of every position, top first.
+    - edges: List returned by vertical_edges.
+    - measures: List of the measures.
+    - order: Optional; the initial order of the measure indices from top to bottom. Default: the order of measures.
+
+    Returns:
+    - order: List of the measure indices from top to bottom.
+    """
+    index = {measure: position for position, measure in enumerate(measures)}
+    starts = np.array([index.get(start, -1) for start, _, _ in edges], dtype=np.int64)
+    ends = np.array([index.get(end, -1) for _, end, _ in edges], dtype=np.int64)
+    differences = np.array([difference for _, _, difference in edges], dtype=float)
+
+    def distance(order):
+        y = np.zeros(len(measures) + 1)  # The last entry is for measures without base y-value
+        y[order] = slot_ints
+        return np.abs(y[starts] - y[ends] + differences).sum()
+
+    if order is None:
+        order = [top] + [measure for measure in range(len(measures)) if measure != top]
+    order = list(order)
+    best = distance(order)
+    improved = True
+    while improved:
+        improved = False
+        for first in range(1, len(order)):
+            for second in range(first + 1, len(order)):
+                order[first], order[second] = order[second], order[first]
+                candidate = distance(order)
+                if candidate < best:
+                    best, improved = candidate, True
+                else:
+                    order[first], order[second] = order[second], order[first]
+    return order
@@ -1,5 +1,8 @@
 import numpy as np
 
+from PathwaysMaps._marker_layout import MarkerLayout
+from PathwaysMaps._pathway_index import index_pathways
+
 
 def get_closest_instance(y_offsets, measure, instance, max_search_range=5):
     # First, check if the exact instance exists
@@ -22,66 +25,62 @@ def get_closest_instance(y_offsets, measure, instance, max_search_range=5):
 
 def create_marker_dictionary(self, actions, base_y_values, instance_dict, y_offsets, measures_in_pathways, line_choice):
     """
-    Processes musical actions to create dictionaries for plotting and line drawing.
+    Processes musical actions to create the marker layout for plotting and line drawing.
 
     Parameters:
     - self: The class instance containing various configurations.
-    - actions: Dict of action data keyed by composite identifiers including measure and instance.
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
     - base_y_values: Dict mapping measure identifiers to base y-values.
     - instance_dict: Dict mapping measures to another dict that maps instances to unique numbers.
     - y_offsets: Dict mapping unique instance numbers to y-offsets for vertical positioning.
     - measures_in_pathways: Dict mapping pathways to their associated measures.
 
     Returns:
-    - action_pairs: Dict for storing Begin and End coordinates by measure and instance.
-    - data: Organized list of tuples containing adjusted y-values, markers, colors, and face colors for plotting.
+    - layout: MarkerLayout with the positions of the markers and segments, and the pathways of every marker.
     """
-
-    action_pairs = {}  # Stores the coordinate pairs for drawing lines between points.
-    data = {}  # Stores visual plotting data organized by measure.
-
-    # Iterate through each action to parse and process its components
-    for key, value in actions.items():
-        parts = key.split('[')  # Split the key to extract measure and instance information
-        measure = parts[0].split('(')[1][1:]  # Extract measure part
-        instance = parts[1].split(']')[0]  # Extract instance part
-        base_y = base_y_values.get(measure, 0)  # Get base y-value for the measure, default to 0
-
-        # Setup marker styles and colors based on action type
-        marker = 'o'
-        action_type = "Begin" if "Begin" in key else "End"
-        color = self.measure_colors[str(measure)]  # Color for the measure
-        facecolor = 'w' if "End" in key else color  # Hollow for "End", filled for "Begin"
-
-        # Adjust y-value based on the instance's unique number and its offset
-        if len(instance_dict[measure]) < 2 or all(value == 1 for value in instance_dict[measure].values()) or line_choice=='overlay':
-            # Make sure that measures where we only have one instance have no offset
+    pathways, pathway_positions = index_pathways(measures_in_pathways)  # Pathways per measure instance, built once
+
+    # Encode the measures and instances of the actions
+    measure_codes = {}
+    codes = np.empty(len(actions), dtype=np.int16)
+    instances = np.empty(len(actions), dtype=np.int16)
+    is_begin = np.empty(len(actions), dtype=bool)
+    x = np.empty(len(actions))
+    for marker, (key, value) in enumerate(actions.items()):
+        codes[marker] = measure_codes.setdefault(key.measure, len(measure_codes))
+        instances[marker] = int(key.instance)
+        is_begin[marker] = key.kind == 'Begin'
+        x[marker] = value[0]
+    measures = list(measure_codes)
+    colors = [self.measure_colors[str(measure)] for measure in measures]  # Color for the measure
+
+    # Measures where we only have one instance have no offset
+    no_offset = [len(instance_dict[measure]) < 2 or all(value == 1 for value in instance_dict[measure].values())
+                 or line_choice == 'overlay' for measure in measures]
+
+    # Adjust y-value based on the instance's unique number and its offset
+    y_adjustments = np.zeros(len(actions))
+    pathway_matrix = np.zeros((len(actions), len(pathways)), dtype=bool)
+    y_adjustment = 0
+    for marker, key in enumerate(actions):
+        measure, instance = key.measure, key.instance
+        if no_offset[codes[marker]]:
             y_adjustment = 0
         else:
-            # print(measure, y_offsets)
             try:
                 y_adjustment = get_closest_instance(y_offsets, measure, instance)
             except KeyError as e:
                 print(e)
-        value_adjusted = np.array([value[0], int(base_y) + y_adjustment])  # Adjust y-value
+        y_adjustments[marker] = y_adjustment
 
         # Information on pathways_number
-        if measure == '0':
-            pathways_with_measure_instance = [key for key, array in measures_in_pathways.items() if f'{measure}' in array]
-        else:
-            pathways_with_measure_instance = [key for key, array in measures_in_pathways.items() if f'{measure}[{instance}]' in array]
+        entry = f'{measure}' if measure == '0' else f'{measure}[{instance}]'
+        pathway_matrix[marker, pathway_positions.get(entry, [])] = True
 
-        # Organize data by measure for plotting
-        if measure not in data:
-            data[measure] = []
-        data[measure].append((value_adjusted, marker, color, facecolor, pathways_with_measure_instance))
-
-        # Prepare action_pairs for line drawing
-        coord_key = (measure, instance)
-        if coord_key not in action_pairs:
-            action_pairs[coord_key] = {}
-        action_pairs[coord_key][action_type] = value_adjusted
-    return action_pairs, data  # Return the dictionaries for plotting and drawing
+    base_y = np.array([int(base_y_values.get(measure, 0)) for measure in measures])  # Default to 0
+    y = base_y[codes] + y_adjustments
+    return MarkerLayout(measures, colors, pathways, codes, instances, is_begin, x, y,
+                        np.packbits(pathway_matrix, axis=1))
 
 
 
@@ -91,14 +90,12 @@ def create_marker_dictionary_optimization(actions, base_y_values, y_offsets):
     data = {}
     # print(base_y_values)
     for key, value in actions.items():
-        parts = key.split('[')
-        measure = parts[0].split('(')[1][1:]
-        instance = parts[1].split(']')[0]
+        measure, instance = key.measure, key.instance
 
         base_y = base_y_values.get(measure, 0)  # Default to 0 if measure not in base_y_values
 
         marker = 'o'
-        action_type = "Begin" if "Begin" in key else "End"
+        action_type = key.kind
 
         # Adjust y-values slightly based on instance (unique measure-instance combination)
         if measure != '0':
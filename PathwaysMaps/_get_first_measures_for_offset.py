@@ -1,10 +1,16 @@
+def get_first_measures_for_offset(edge_list):
+    """
+    Finds the measure instances that directly follow the current situation, these are placed without y-offset.
 
+    Parameters:
+    - edge_list: List of Transition records.
 
-def get_first_measures_for_offset(edge_list):
+    Returns:
+    - y_offsets_at_zero: Dictionary mapping measures to a dictionary with the instance that has offset 0.
+    """
     y_offsets_at_zero = {'0': {'0': 0}}
 
     for edge in edge_list:
-        if 'End(0[0]' in edge[0]:
-            measure_instance_zero_offset = edge[2].split('ActionBegin(')[1].split('[')
-            y_offsets_at_zero[measure_instance_zero_offset[0]] = {measure_instance_zero_offset[1][:-1]: 0 }
-    return y_offsets_at_zero
\ No newline at end of file
+        if edge.vertical and edge.from_measure == '0' and edge.from_instance == '0':
+            y_offsets_at_zero[edge.to_measure] = {edge.to_instance: 0}
+    return y_offsets_at_zero
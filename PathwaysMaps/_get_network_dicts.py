@@ -7,8 +7,20 @@ from adaptation_pathways.graph import (
     sequence_graph_to_pathway_map,
     sequences_to_sequence_graph,
 )
+from adaptation_pathways.graph.node import ActionBegin
 from adaptation_pathways.plot.pathway_map.classic import _layout as pathway_layout
 from PathwaysMaps._get_first_measures_for_offset import get_first_measures_for_offset
+from PathwaysMaps._input_cache import (
+    load_cache,
+    load_sequences_table,
+    select_lines,
+    table_to_sequences,
+    table_to_tipping_points,
+    write_cache,
+)
+from PathwaysMaps._network_cache import load_network_dicts, network_cache_key, store_network_dicts
+from PathwaysMaps._network_records import ActionKey, action_key_from_node, transition_from_edge
+from PathwaysMaps._renamer import get_renamer
 
 
 def replace_strings_in_list(lst, replacements):
@@ -22,24 +34,7 @@ def replace_strings_in_list(lst, replacements):
     Returns:
     - new_list: A new list with strings replaced according to the replacements dictionary.
     """
-
-    if not isinstance(lst, list):
-        return lst  # If lst is not a list, return it as is
-
-    new_list = []
-    for item in lst:
-        if isinstance(item, dict):
-            new_list.append(replace_strings_in_dict_keys(item, replacements))  # Handle nested dictionaries
-        elif isinstance(item, list):
-            new_list.append(replace_strings_in_list(item, replacements))  # Handle nested lists
-        elif isinstance(item, str):
-            new_item = item
-            for old, new in replacements.items():
-                new_item = new_item.replace(old, new)  # Replace substrings
-            new_list.append(new_item)
-        else:
-            new_list.append(item)  # Append non-string items unchanged
-    return new_list
+    return get_renamer(replacements).rename_list(lst)
 
 def replace_strings_in_dict_keys(d, replacements):
     """
@@ -52,21 +47,27 @@ def replace_strings_in_dict_keys(d, replacements):
     Returns:
     - new_dict: A new dictionary with keys replaced according to the replacements dictionary.
     """
-    if not isinstance(d, dict):
-        return d  # If d is not a dictionary, return it as is
-
-    new_dict = {}
-    for k, v in d.items():
-        new_key = k
-        for old, new in replacements.items():
-            new_key = new_key.replace(old, new)  # Replace substrings in keys
-        if isinstance(v, dict):
-            new_dict[new_key] = replace_strings_in_dict_keys(v, replacements)  # Handle nested dictionaries
-        elif isinstance(v, list):
-            new_dict[new_key] = replace_strings_in_list(v, replacements)  # Handle nested lists
-        else:
-            new_dict[new_key] = v  # Append values unchanged
-    return new_dict
+    return get_renamer(replacements).rename_dict_keys(d)
+
+def index_lines(keys, entry_lines):
+    """
+    Groups the line ids of the entries of a column by key.
+
+    Parameters:
+    - keys: Array with the key of every entry.
+    - entry_lines: Array with the line id of every entry.
+
+    Returns:
+    - lines_by_key: Dictionary mapping every key to an array with the sorted, unique ids of its lines.
+    """
+    order = np.lexsort((entry_lines, keys))
+    keys, entry_lines = keys[order], entry_lines[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (entry_lines[1:] != entry_lines[:-1])  # Drop repeated pairs
+    keys, entry_lines = keys[keep], entry_lines[keep]
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1))
+    ends = np.append(starts[1:], len(keys))
+    return {key: entry_lines[start:end] for key, start, end in zip(keys[starts].tolist(), starts, ends)}
 
 def get_sequences_only(input_file, file_sequence_only, renaming_dict, sector_pathway, basic):
     """
@@ -81,11 +82,17 @@ def get_sequences_only(input_file, file_sequence_only, renaming_dict, sector_pat
     - measures_in_pathways: A dictionary mapping pathways to their associated measures.
     """
     print(input_file)
-    with open(input_file, 'r') as file:
-        all_lines = file.readlines()  # Read all lines from the file
-    full_input = [item.split(' ') for item in all_lines]  # Split lines into components
-    split_lines = [item.split(' ')[:2] for item in all_lines]  # Extract first two columns
-    pathways = [item.split(' ')[-1].replace('\n', '').split(';') for item in all_lines]  # Extract pathways
+    table = load_sequences_table(input_file)  # Binary cache of the input file, or the parsed text file if stale
+    action_names = table['actions'].tolist()
+    from_names = [action_names[from_action] for from_action in table['from_actions'].tolist()]
+    to_names = [action_names[to_action] for to_action in table['to_actions'].tolist()]
+    pathway_names = table['pathways'].tolist()
+
+    # Inverted index of the pathway column: ids of the lines that belong to each pathway, built in one pass
+    entry_lines = np.repeat(np.arange(len(from_names)), np.diff(table['pathway_offsets']))
+    lines_by_name = index_lines(table['pathway_ids'], entry_lines)
+    pathway_numbers = np.array([int(renaming_dict.get(key, key)) for key in pathway_names], dtype=np.int64)
+    lines_by_number = index_lines(pathway_numbers[table['pathway_ids']], entry_lines)
 
     if sector_pathway:  # spotlight one pathway
         for key in renaming_dict.keys():
@@ -94,26 +101,24 @@ def get_sequences_only(input_file, file_sequence_only, renaming_dict, sector_pat
 
         unique_pathways = [str(int(sector_pathway))]
     else:
-        unique_flat_list = list(set(item for sublist in pathways for item in sublist))
+        unique_flat_list = list(set(pathway_names))
         unique_pathways = [renaming_dict.get(key, key) for key in unique_flat_list]
 
-    measures_in_pathways = {pathway: set() for pathway in unique_pathways}
+    # Only the measure names are renamed, as for the nodes and edges of the pathway map in build_network_dicts
+    renamer = get_renamer(renaming_dict)
+    measures_in_pathways = {}
     for pathway in unique_pathways:
-        for sublist in full_input:
-            pw_list = [renaming_dict.get(key, key) for key in sublist[2].replace('\n', '').split(';')]
-            clean_ps = [int(p) for p in pw_list]
-            if int(pathway) in clean_ps:
-                measures_in_pathways[pathway].add(sublist[0])
-                measures_in_pathways[pathway].add(sublist[1])
-        measures_in_pathways[pathway] = list(measures_in_pathways[pathway])
-    measures_in_pathways = replace_strings_in_dict_keys(measures_in_pathways, renaming_dict)
+        measures = set()
+        for line in lines_by_number.get(int(pathway), []):
+            measures.add(from_names[line])
+            measures.add(to_names[line])
+        measures_in_pathways[renamer.rename(pathway)] = [renamer.rename_action(measure) for measure in measures]
 
+    indices = list(range(len(from_names)))
     if sector_pathway:
-        # Step 1: Find indices where sector_pathway is present in pathways
-        indices = [i for i, path in enumerate(pathways) if original_name in path]
-
-        # Step 2: Extract elements from 'full' using these indices
-        split_lines = [split_lines[i] for i in indices]
+        # Lines of the spotlighted pathway
+        indices = lines_by_name[pathway_names.index(original_name)].tolist() if original_name in pathway_names else []
+    split_lines = [[from_names[i], to_names[i]] for i in indices]  # First two columns
 
     if basic:
         pass
@@ -123,6 +128,7 @@ def get_sequences_only(input_file, file_sequence_only, renaming_dict, sector_pat
             for item in sequences_only:
                 new_file.write(item)  # Write the sequences to a new file
         new_file.close()  # Ensure the file is closed
+        write_cache(file_sequence_only, select_lines(table, indices))  # get_pathway_map reads the cache
     return measures_in_pathways
 
 def get_pathway_map(sequences_txt, tipping_points_txt):
@@ -136,12 +142,21 @@ def get_pathway_map(sequences_txt, tipping_points_txt):
     Returns:
     - pathway_map: A pathway map object with assigned tipping points and levels.
     """
-    sequences = read_sequences(sequences_txt)  # Read sequences from the file
+    # Read from the binary caches, fall back to the text files if the caches are missing or stale
+    sequences_table = load_cache(sequences_txt, 'from_actions')
+    if sequences_table is not None:
+        sequences = table_to_sequences(sequences_table)
+    else:
+        sequences = read_sequences(sequences_txt)  # Read sequences from the file
     sequence_graph = sequences_to_sequence_graph(sequences)  # Create a sequence graph
     level_by_action = action_level_by_first_occurrence(sequences)  # Determine action levels
     pathway_map = sequence_graph_to_pathway_map(sequence_graph)  # Convert to pathway map
 
-    tipping_points = read_tipping_points(tipping_points_txt, pathway_map.actions())
+    tipping_points_table = load_cache(tipping_points_txt, 'tipping_actions')
+    if tipping_points_table is not None:
+        tipping_points = table_to_tipping_points(tipping_points_table, pathway_map.actions())
+    else:
+        tipping_points = read_tipping_points(tipping_points_txt, pathway_map.actions())
     pathway_map.assign_tipping_points(tipping_points)  # Assign tipping points to the map
     pathway_map.set_attribute("level", level_by_action)  # Set levels in the pathway map
 
@@ -152,25 +167,6 @@ def get_pathway_map(sequences_txt, tipping_points_txt):
 
     return pathway_map
 
-def clean_list(lst):
-    """
-    Cleans up strings in a list by removing specific characters and converting pure numbers to integers.
-
-    Parameters:
-    - lst: List of strings to be cleaned.
-
-    Returns:
-    - cleaned_list: List with cleaned and converted elements.
-    """
-    cleaned_list = []
-    for item in lst:
-        cleaned_item = item.replace('"', "").replace(")", "").replace("((", "")
-        if cleaned_item.strip().isdigit():
-            cleaned_list.append(int(cleaned_item.strip()))  # Convert to integer if it's a number
-        else:
-            cleaned_list.append(cleaned_item.strip())  # Strip whitespace from non-numbers
-    return cleaned_list
-
 def generate_unique_offsets_with_zero(keys, max_offset):
     """
     Generates unique offsets for a list of keys, ensuring that zero is included in the offsets.
@@ -195,6 +191,57 @@ def generate_unique_offsets_with_zero(keys, max_offset):
     return offset_dict
 
 def get_network_dicts(self, input_file, file_sequence_only, file_tipping_points, max_offset, planning_horizon, sector_pathway, basic):
+    """
+    Generates network dictionaries and layouts from input files and renaming parameters. Results are stored in a cache
+    keyed by the content of the input files and the parameters, so unchanged inputs skip the graph construction.
+
+    Parameters:
+    - input_file: Path to the input file containing sequences.
+    - file_sequence_only: Path to save the extracted sequences only.
+    - file_tipping_points: Path to the file containing tipping points.
+    - max_offset: Maximum absolute value for the offsets.
+    - self.network_cache_directory: Directory of the cache, or None to disable the cache.
+
+    Returns:
+    - See build_network_dicts.
+    """
+    if not self.network_cache_directory:
+        return build_network_dicts(self, input_file, file_sequence_only, file_tipping_points, max_offset,
+                                   planning_horizon, sector_pathway, basic)
+
+    # The sequences only file is an input if it is not (re)written from the input file
+    writes_sequences_only = self.input_with_pathways and not basic
+    files = [input_file if self.input_with_pathways else None, file_tipping_points,
+             None if writes_sequences_only else file_sequence_only]
+    key = network_cache_key([file_path for file_path in files if file_path],
+                            [self.renaming_dict, max_offset, list(planning_horizon), sector_pathway, basic,
+                             self.input_with_pathways])
+    entry = load_network_dicts(self.network_cache_directory, key)
+    if entry is not None:
+        network_dicts, sequences_only = entry
+        if writes_sequences_only:
+            # Restore the sequences only file, which is also an output of get_network_dicts
+            try:
+                with open(file_sequence_only, 'r') as file:
+                    up_to_date = file.read() == sequences_only
+            except OSError:
+                up_to_date = False
+            if not up_to_date:
+                with open(file_sequence_only, 'w') as file:
+                    file.write(sequences_only)
+        return network_dicts
+
+    network_dicts = build_network_dicts(self, input_file, file_sequence_only, file_tipping_points, max_offset,
+                                        planning_horizon, sector_pathway, basic)
+    sequences_only = None
+    if writes_sequences_only:
+        with open(file_sequence_only, 'r') as file:
+            sequences_only = file.read()
+    store_network_dicts(self.network_cache_directory, key, (network_dicts, sequences_only),
+                        self.network_cache_size)
+    return network_dicts
+
+def build_network_dicts(self, input_file, file_sequence_only, file_tipping_points, max_offset, planning_horizon, sector_pathway, basic):
     """
     Generates network dictionaries and layouts from input files and renaming parameters.
 
@@ -206,8 +253,8 @@ def get_network_dicts(self, input_file, file_sequence_only, file_tipping_points,
     - self.with_pathways: Boolean indicating whether pathways information is included.
 
     Returns:
-    - pw_layout_renamed: Dictionary representing the renamed pathway layout.
-    - edge_list_renamed: List of renamed edges for the network.
+    - pw_layout_renamed: Dictionary mapping the ActionKey of every node to its position in the pathway layout.
+    - edge_list_renamed: List of Transition records of the edges, with renamed measures.
     - base_y_values_renamed: Dictionary of renamed base y-values for measures.
     - x_offsets: Dictionary of unique offsets for each measure.
     - measures_in_pathways: Dictionary mapping pathways to their associated measures.
@@ -218,29 +265,23 @@ def get_network_dicts(self, input_file, file_sequence_only, file_tipping_points,
         measures_in_pathways = 'No information about different pathways provided.'
     pathway_map = get_pathway_map(file_sequence_only, file_tipping_points)
     pw_layout = pathway_layout(pathway_map)
-    pw_layout_repr = {repr(key): value for key, value in pw_layout.items()}
 
-    pw_layout_renamed = replace_strings_in_dict_keys(pw_layout_repr, self.renaming_dict)
+    # Measure names are renamed once, the nodes and edges are converted to typed records
+    renamer = get_renamer(self.renaming_dict)  # Compiled once per renaming dictionary
+    measure_names = {action.name: renamer.rename(action.name) for action in pathway_map.actions()}
+    pw_layout_renamed = {action_key_from_node(node, measure_names): value for node, value in pw_layout.items()}
 
-    for_ybasevalues = {str(key): value for key, value in pw_layout.items()}
-    base_y_values = {}
-    for key, value in for_ybasevalues.items():
-        if key.startswith('['):
-            base_y_values[key[1:]] = value[1]
-    base_y_values_renamed = replace_strings_in_dict_keys(base_y_values, self.renaming_dict)
+    base_y_values_renamed = {}
+    for node, value in pw_layout.items():
+        if isinstance(node, ActionBegin):
+            base_y_values_renamed[measure_names[node.action.name]] = value[1]
 
     x_offsets = generate_unique_offsets_with_zero(base_y_values_renamed.keys(), max_offset)
 
-    edge_list = []
-    for edge in pathway_map.graph.edges.items():
-        repr_edge = repr(edge).replace('((', '').replace('), {})', '').split(',')
-        repr_edge = clean_list(repr_edge)
-        edge_list.append(repr_edge)
-
-    edge_list_renamed = replace_strings_in_list(edge_list, self.renaming_dict)
+    edge_list_renamed = [transition_from_edge(begin, end, measure_names) for begin, end in pathway_map.graph.edges]
 
     base_y_offsets = get_first_measures_for_offset(edge_list_renamed)
 
-    pw_layout_renamed['ActionBegin("0[0]")'][0] = planning_horizon[0] - 20
+    pw_layout_renamed[ActionKey('Begin', '0', '0')][0] = planning_horizon[0] - 20
 
     return pw_layout_renamed, edge_list_renamed, base_y_values_renamed, x_offsets, measures_in_pathways, base_y_offsets
\ No newline at end of file
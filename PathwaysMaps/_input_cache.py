@@ -0,0 +1,280 @@
+import glob
+import os
+import re
+
+import numpy as np
+
+from adaptation_pathways import Action
+
+CACHE_VERSION = 1
+ACTION_PATTERN = re.compile(r'(\w+)(?:\[(\d+)\])?')
+
+
+def cache_path(text_file):
+    """
+    Returns the path of the binary cache belonging to a text input file.
+
+    Parameters:
+    - text_file: Path to the text file, e.g. data/inputs/all_sequences_flood_agr_Wp_average.txt.
+
+    Returns:
+    - cache_file: Path to the .npz file next to the text file.
+    """
+    return f'{os.path.splitext(text_file)[0]}.npz'
+
+
+def read_columns(text_file):
+    """
+    Reads the whitespace separated columns of a text input file, skipping comments and empty lines.
+
+    Parameters:
+    - text_file: Path to the text file.
+
+    Returns:
+    - rows: List with the columns of every line.
+    """
+    with open(text_file, 'r') as file:
+        rows = [line.split('#', 1)[0].split() for line in file]
+    return [columns for columns in rows if columns]
+
+
+def encode_actions(names):
+    """
+    Encodes action names like 'current' or '10[2]' into a vocabulary with integer measure codes and instances.
+
+    Parameters:
+    - names: List with the action name of every entry.
+
+    Returns:
+    - arrays: Dictionary with the action vocabulary ('actions', 'measures', 'action_measures', 'action_instances')
+      and the action code of every entry ('codes'). Actions without instance get instance -1.
+    """
+    action_codes = {}
+    measure_codes = {}
+    action_measures = []
+    action_instances = []
+    codes = np.empty(len(names), dtype=np.int32)
+    for index, name in enumerate(names):
+        code = action_codes.get(name)
+        if code is None:
+            match = ACTION_PATTERN.fullmatch(name)
+            if match is None:
+                raise ValueError(f"Cannot parse action: {name}")
+            code = action_codes[name] = len(action_codes)
+            action_measures.append(measure_codes.setdefault(match.group(1), len(measure_codes)))
+            action_instances.append(int(match.group(2)) if match.group(2) is not None else -1)
+        codes[index] = code
+    return {
+        'actions': np.array(list(action_codes), dtype=str),
+        'measures': np.array(list(measure_codes), dtype=str),
+        'action_measures': np.array(action_measures, dtype=np.int32),
+        'action_instances': np.array(action_instances, dtype=np.int32),
+        'codes': codes,
+    }
+
+
+def parse_sequences_file(text_file):
+    """
+    Parses a sequences file with columns 'from to' and an optional column with ';' separated pathways into arrays.
+
+    Parameters:
+    - text_file: Path to the text file.
+
+    Returns:
+    - table: Dictionary of arrays. 'from_actions' and 'to_actions' hold the action codes of every line, the
+      pathways of line i are pathway_ids[pathway_offsets[i]:pathway_offsets[i + 1]].
+    """
+    rows = read_columns(text_file)
+    table = encode_actions([name for columns in rows for name in columns[:2]])
+    codes = table.pop('codes')
+    table['from_actions'] = codes[0::2]
+    table['to_actions'] = codes[1::2]
+
+    pathway_codes = {}
+    pathway_ids = []
+    pathway_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    for index, columns in enumerate(rows):
+        if len(columns) > 2:
+            pathway_ids.extend(pathway_codes.setdefault(pathway, len(pathway_codes))
+                               for pathway in columns[2].split(';'))
+        pathway_offsets[index + 1] = len(pathway_ids)
+    table['pathways'] = np.array(list(pathway_codes), dtype=str)
+    table['pathway_ids'] = np.array(pathway_ids, dtype=np.int32)
+    table['pathway_offsets'] = pathway_offsets
+    return table
+
+
+def parse_tipping_points_file(text_file):
+    """
+    Parses a tipping points file with columns 'action year' into arrays.
+
+    Parameters:
+    - text_file: Path to the text file.
+
+    Returns:
+    - table: Dictionary of arrays with the action vocabulary, the action code ('tipping_actions') and the
+      year ('years') of every line.
+    """
+    rows = read_columns(text_file)
+    if any(len(columns) != 2 or not columns[1].isdigit() for columns in rows):
+        raise ValueError(f"Cannot parse tipping points in {text_file}")
+    table = encode_actions([columns[0] for columns in rows])
+    table['tipping_actions'] = table.pop('codes')
+    table['years'] = np.array([int(columns[1]) for columns in rows], dtype=np.int64)
+    return table
+
+
+def write_cache(text_file, table):
+    """
+    Stores a parsed table in the binary cache of a text file, together with the size and modification time of the
+    text file that are used to detect a stale cache.
+
+    Parameters:
+    - text_file: Path to the text file the table was parsed from.
+    - table: Dictionary of arrays.
+    """
+    status = os.stat(text_file)
+    np.savez(cache_path(text_file), version=np.int64(CACHE_VERSION), source_size=np.int64(status.st_size),
+             source_mtime=np.int64(status.st_mtime_ns), **table)
+
+
+def load_cache(text_file, required_key):
+    """
+    Loads the binary cache of a text file.
+
+    Parameters:
+    - text_file: Path to the text file.
+    - required_key: Array that the table needs to contain, 'from_actions' for sequences and 'tipping_actions' for
+      tipping points.
+
+    Returns:
+    - table: Dictionary of arrays, or None if there is no cache, the cache holds another kind of table or the text
+      file changed after the conversion.
+    """
+    try:
+        status = os.stat(text_file)
+        with np.load(cache_path(text_file), allow_pickle=False) as cache:
+            if (cache['version'] != CACHE_VERSION or cache['source_size'] != status.st_size
+                    or cache['source_mtime'] != status.st_mtime_ns or required_key not in cache.files):
+                return None
+            return {key: cache[key] for key in cache.files
+                    if key not in ('version', 'source_size', 'source_mtime')}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_sequences_table(text_file):
+    """
+    Loads a sequences file from its binary cache, falling back to the text file if the cache is missing or stale.
+
+    Parameters:
+    - text_file: Path to the text file.
+
+    Returns:
+    - table: Dictionary of arrays (see parse_sequences_file).
+    """
+    table = load_cache(text_file, 'from_actions')
+    return table if table is not None else parse_sequences_file(text_file)
+
+
+def convert_input_files(directory):
+    """
+    Converts all sequences and tipping points files in a directory and its subdirectories to binary caches.
+
+    Parameters:
+    - directory: Directory with the input files, e.g. data/inputs.
+
+    Returns:
+    - converted: List of the converted text files.
+    """
+    converted = []
+    for text_file in sorted(glob.glob(os.path.join(directory, '**', '*.txt'), recursive=True)):
+        name = os.path.basename(text_file)
+        if name.startswith('all_sequences'):
+            write_cache(text_file, parse_sequences_file(text_file))
+        elif name.startswith('all_tp_timings'):
+            write_cache(text_file, parse_tipping_points_file(text_file))
+        else:
+            continue
+        converted.append(text_file)
+    return converted
+
+
+def select_lines(table, indices):
+    """
+    Selects lines of a sequences table, dropping the pathways column.
+
+    Parameters:
+    - table: Dictionary of arrays (see parse_sequences_file).
+    - indices: Indices of the lines to keep.
+
+    Returns:
+    - selection: Dictionary of arrays with the selected lines.
+    """
+    selection = {key: table[key] for key in ('actions', 'measures', 'action_measures', 'action_instances')}
+    selection['from_actions'] = table['from_actions'][indices]
+    selection['to_actions'] = table['to_actions'][indices]
+    selection['pathways'] = np.array([], dtype=str)
+    selection['pathway_ids'] = np.array([], dtype=np.int32)
+    selection['pathway_offsets'] = np.zeros(len(selection['from_actions']) + 1, dtype=np.int64)
+    return selection
+
+
+def action_keys(table):
+    """
+    Returns the (name, edition) of every action in the vocabulary of a table, as used by adaptation_pathways.
+
+    Parameters:
+    - table: Dictionary of arrays.
+
+    Returns:
+    - keys: List of tuples (name, edition).
+    """
+    measures = table['measures'].tolist()
+    return [(measures[measure], max(instance, 0)) for measure, instance in
+            zip(table['action_measures'].tolist(), table['action_instances'].tolist())]
+
+
+def table_to_sequences(table):
+    """
+    Creates the sequences of actions of a sequences table, like adaptation_pathways.graph.read_sequences.
+
+    Parameters:
+    - table: Dictionary of arrays (see parse_sequences_file).
+
+    Returns:
+    - sequences: List of tuples (from_action, to_action) with one Action object per name and edition.
+    """
+    action_by_name_and_edition = {}
+    actions = []
+    for key in action_keys(table):
+        if key not in action_by_name_and_edition:
+            action_by_name_and_edition[key] = Action(*key)
+        actions.append(action_by_name_and_edition[key])
+    return [(actions[from_action], actions[to_action]) for from_action, to_action in
+            zip(table['from_actions'].tolist(), table['to_actions'].tolist())]
+
+
+def table_to_tipping_points(table, actions):
+    """
+    Assigns the tipping points of a tipping points table to actions, like adaptation_pathways.graph.read_tipping_points.
+
+    Parameters:
+    - table: Dictionary of arrays (see parse_tipping_points_file).
+    - actions: List of actions of the pathway map.
+
+    Returns:
+    - tipping_points: Dictionary mapping actions to their tipping point.
+    """
+    keys = action_keys(table)
+    tipping_point_by_name_and_edition = {}
+    for action, year in zip(table['tipping_actions'].tolist(), table['years'].tolist()):
+        if keys[action] in tipping_point_by_name_and_edition:
+            raise ValueError(f"Multiple tipping points found for action {keys[action][0]}[{keys[action][1]}]")
+        tipping_point_by_name_and_edition[keys[action]] = year
+
+    action_by_name_and_edition = {}
+    for action in actions:
+        action_by_name_and_edition.setdefault((action.name, action.edition), action)
+    return {action_by_name_and_edition[key]: year for key, year in tipping_point_by_name_and_edition.items()
+            if key in action_by_name_and_edition}
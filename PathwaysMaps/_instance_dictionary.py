@@ -1,4 +1,141 @@
-import numpy as np
+import math
+
+
+class InstanceAssigner:
+    """
+    Assigns unique numbers to the instances of measures based on the x-positions of their End actions.
+
+    Keeps the highest number per measure, so a new number does not need a scan over all x-positions. For the overlay
+    mode, the x-positions of every measure are indexed in buckets of one year, so the first known x-position within
+    the tolerance of np.isclose(x_pos, x_position, atol=0.1) is found by looking at the neighbouring buckets only.
+
+    Parameters:
+    - instance_dict: Dictionary to store instances of measures.
+    - x_position_dict: Dictionary to store x-positions of measures.
+    """
+
+    bucket_width = 1.0
+
+    def __init__(self, instance_dict, x_position_dict):
+        self.instance_dict = instance_dict
+        self.x_position_dict = x_position_dict
+        self.max_numbers = {}  # Highest instance number per measure
+        self.buckets = {}  # Per measure: bucket -> list of (insertion rank, x-position)
+        self.ranks = {}  # Per measure: number of indexed x-positions
+
+    def next_number(self, measure):
+        """
+        Returns the next instance number of a measure, the highest assigned number + 1.
+
+        Parameters:
+        - measure: The measure.
+
+        Returns:
+        - number: The next instance number.
+        """
+        if measure not in self.max_numbers:
+            self.max_numbers[measure] = max(self.x_position_dict[measure].values())
+        self.max_numbers[measure] += 1
+        return self.max_numbers[measure]
+
+    def add_x_position(self, measure, x_position, number):
+        """
+        Stores the instance number of an x-position and adds the x-position to the tolerance index.
+
+        Parameters:
+        - measure: The measure.
+        - x_position: The x-position.
+        - number: The instance number.
+        """
+        new_position = x_position not in self.x_position_dict[measure]
+        self.x_position_dict[measure][x_position] = number
+        if measure in self.max_numbers:
+            self.max_numbers[measure] = max(self.max_numbers[measure], number)
+        if measure in self.buckets and new_position:
+            self.index_x_position(measure, x_position)
+
+    def index_x_position(self, measure, x_position):
+        """
+        Adds an x-position to the tolerance index of a measure.
+
+        Parameters:
+        - measure: The measure.
+        - x_position: The x-position.
+        """
+        bucket = math.floor(x_position / self.bucket_width)
+        self.buckets[measure].setdefault(bucket, []).append((self.ranks[measure], x_position))
+        self.ranks[measure] += 1
+
+    def find_close_x_position(self, measure, x_position):
+        """
+        Finds the first stored x-position of a measure that is approximately the same as the given x-position.
+
+        Parameters:
+        - measure: The measure.
+        - x_position: The x-position to match.
+
+        Returns:
+        - x_pos: The first (in insertion order) x-position within the tolerance, or None.
+        """
+        if measure not in self.buckets:
+            # Index the x-positions that are already known, e.g. from the base input
+            self.buckets[measure] = {}
+            self.ranks[measure] = 0
+            for x_pos in self.x_position_dict[measure]:
+                self.index_x_position(measure, x_pos)
+
+        tolerance = 0.1 + 1e-05 * abs(x_position)  # Tolerance of np.isclose with atol=0.1 and the default rtol
+        first = None
+        for bucket in range(math.floor((x_position - tolerance) / self.bucket_width),
+                            math.floor((x_position + tolerance) / self.bucket_width) + 1):
+            for rank, x_pos in self.buckets[measure].get(bucket, []):
+                if abs(x_pos - x_position) <= tolerance and (first is None or rank < first[0]):
+                    first = (rank, x_pos)
+        return None if first is None else first[1]
+
+    def assign(self, measure, instance, x_position, overlay):
+        """
+        Assigns an instance number to an instance of a measure.
+
+        Parameters:
+        - measure: The measure.
+        - instance: The instance of the measure.
+        - x_position: The x-position of the End action of the instance.
+        - overlay: Whether instances with approximately the same x-position share their number.
+        """
+        if measure not in self.x_position_dict:
+            self.x_position_dict[measure] = {}
+
+        close_x_position = None
+        if not overlay:
+            # Assign unique instance numbers to new x-positions
+            if measure not in self.instance_dict:
+                self.instance_dict[measure] = {}
+                self.add_x_position(measure, x_position, 1)  # Start instance numbering from 1
+            elif instance not in self.instance_dict[measure]:
+                # Increment the instance number for a new x-position
+                self.add_x_position(measure, x_position, self.next_number(measure))
+        else:
+            # Reuse instance numbers for x-positions that are close
+            close_x_position = self.find_close_x_position(measure, x_position)
+            if close_x_position is None:
+                # Assign a new instance number for a new x-position
+                if measure not in self.instance_dict:
+                    self.instance_dict[measure] = {}
+                    self.add_x_position(measure, x_position, 1)  # Start instance numbering from 1
+                else:
+                    # Increment the instance number for a new x-position
+                    self.add_x_position(measure, x_position, self.next_number(measure))
+
+        # Assign the determined instance number to the instance
+        instances = self.instance_dict.setdefault(measure, {})
+        if instance not in instances:  # Don't overwrite existing instance counts
+            if x_position in self.x_position_dict[measure]:
+                instances[instance] = self.x_position_dict[measure][x_position]
+            else:
+                # Matched an approximately equal x-position, use its number
+                instances[instance] = self.x_position_dict[measure][close_x_position]
+
 
 def create_instance_dictionary(self, actions, instance_dict, initial_max_instance, x_position_dict):
     """
@@ -6,7 +143,7 @@ def create_instance_dictionary(self, actions, instance_dict, initial_max_instanc
 
     Parameters:
     - self: The class instance containing various configurations.
-    - actions: Dict of actions with keys that include measure and instance information.
+    - actions: Dict of actions keyed by ActionKey records (kind, measure, instance).
     - instance_dict: Dictionary to store instances of measures.
     - initial_max_instance: The initial maximum instance number before processing actions.
     - x_position_dict: Dictionary to store x-positions of measures.
@@ -16,60 +153,12 @@ def create_instance_dictionary(self, actions, instance_dict, initial_max_instanc
     - max_index: The highest instance number assigned across all measures.
     - x_position_dict: Updated dictionary of x-positions for each measure.
     """
+    overlay = not (self.line_choice == 'pathways_and_unique_lines' or self.line_choice == 'pathways')
+    assigner = InstanceAssigner(instance_dict, x_position_dict)
     for key, value in actions.items():
-        if key.startswith('ActionEnd'):
-            # Split the key to extract measure and instance information
-            parts = key.split('[')
-            measure = parts[0].split('(')[1][1:]  # Extract measure part
-            instance = parts[1].split(']')[0]  # Extract instance part
-            x_position = value[0]  # Get the x-position from the value
-            # print('inputs', measure, instance, x_position)
-            if measure not in x_position_dict:
-                x_position_dict[measure] = {}
-
-            if self.line_choice == 'pathways_and_unique_lines' or self.line_choice == 'pathways':
-                # Assign unique instance numbers to new x-positions
-                if measure not in instance_dict:
-                    instance_dict[measure] = {}
-                    x_position_dict[measure][x_position] = 1  # Start instance numbering from 1
-                else:
-                    # Increment the instance number for a new x-position
-                    if instance not in instance_dict[measure]:
-                        if x_position not in x_position_dict[measure]:
-                            new_index = max(x_position_dict[measure].values()) + 1
-                        else:
-                            new_index = max(x_position_dict[measure].values()) + 1
-                        x_position_dict[measure][x_position] = new_index
-                    else:
-                        new_index = 0
-                    if new_index > initial_max_instance:
-                        initial_max_instance = new_index
-            else:
-                # Reuse instance numbers for x-positions that are close
-                found = False
-                for x_pos in x_position_dict[measure]:
-                    if np.isclose(x_pos, x_position, atol=0.1):  # Check if positions are approximately the same
-                        instance_number = x_position_dict[measure][x_pos]
-                        found = True
-                        break
-
-                if not found:
-                    # Assign a new instance number for a new x-position
-                    if measure not in instance_dict:
-                        instance_dict[measure] = {}
-                        x_position_dict[measure][x_position] = 1  # Start instance numbering from 1
-                    else:
-                        # Increment the instance number for a new x-position
-                        new_index = max(x_position_dict[measure].values()) + 1
-                        x_position_dict[measure][x_position] = new_index
-
-            # Assign the determined instance number to the instance
-            # print('xpositions2', x_position_dict[measure])
-            if instance not in instance_dict[measure]:  # Don't overwrite existing instance counts
-                # instance_number = x_position_dict[measure].get(x_position, 0)
-                instance_number = x_position_dict[measure][x_position]
-                instance_dict[measure][instance] = instance_number  # Store the instance number in the dictionary
-            # print('instance_dict', instance_dict)
+        if key.kind == 'End':
+            assigner.assign(key.measure, key.instance, value[0], overlay)  # value[0] is the x-position
+
     # Determine the maximum instance number across all measures
     max_index = 0
     for value in instance_dict.values():
@@ -0,0 +1,159 @@
+import numpy as np
+
+
+class MarkerLayout:
+    """
+    Positions of the markers and horizontal segments of a pathways map, stored as arrays instead of nested dicts.
+
+    Every action (Begin or End of a measure instance) is a marker, every measure instance is a segment between its
+    Begin and End marker. Measures and pathways are stored once, markers and segments refer to them by code.
+
+    Parameters:
+    - measures: List of the measures, in order of their first marker.
+    - colors: List with the color of every measure.
+    - pathways: List of the pathways.
+    - measure_codes: Array with the measure code of every marker.
+    - instances: Array with the instance of every marker.
+    - is_begin: Boolean array indicating whether a marker is a Begin (True) or End (False) marker.
+    - x: Array with the x-position of every marker.
+    - y: Array with the y-position of every marker.
+    - pathway_bits: Array (markers, bytes) with the packed bits of the pathways every marker belongs to.
+    """
+
+    def __init__(self, measures, colors, pathways, measure_codes, instances, is_begin, x, y, pathway_bits):
+        self.measures = measures
+        self.colors = colors
+        self.pathways = pathways
+        self.measure_codes = measure_codes
+        self.instances = instances
+        self.is_begin = is_begin
+        self.x = x
+        self.y = y
+        self.pathway_bits = pathway_bits
+
+        # Markers grouped by measure, in order of the first marker of every measure
+        self.marker_order = np.argsort(measure_codes, kind='stable')
+
+        # One segment per measure instance, in order of the first marker. A later marker of the same kind overwrites
+        # an earlier one, a missing marker is NaN.
+        self.segment_rows = {}
+        segment_of_marker = np.empty(len(measure_codes), dtype=np.int64)
+        for marker, (measure_code, instance) in enumerate(zip(measure_codes.tolist(), instances.tolist())):
+            segment_of_marker[marker] = self.segment_rows.setdefault((measures[measure_code], str(instance)),
+                                                                     len(self.segment_rows))
+        number_segments = len(self.segment_rows)
+        self.segment_measure_codes = np.zeros(number_segments, dtype=np.int16)
+        self.segment_measure_codes[segment_of_marker] = measure_codes
+        self.begin_x, self.begin_y, self.end_x, self.end_y = np.full((4, number_segments), np.nan)
+        self.begin_x[segment_of_marker[is_begin]] = x[is_begin]
+        self.begin_y[segment_of_marker[is_begin]] = y[is_begin]
+        self.end_x[segment_of_marker[~is_begin]] = x[~is_begin]
+        self.end_y[segment_of_marker[~is_begin]] = y[~is_begin]
+
+    def has_begin(self, measure, instance):
+        """
+        Checks whether a measure instance has a Begin marker.
+
+        Parameters:
+        - measure: The measure.
+        - instance: The instance of the measure.
+
+        Returns:
+        - has_begin: True if the measure instance has a Begin marker.
+        """
+        row = self.segment_rows.get((measure, instance))
+        return row is not None and not np.isnan(self.begin_x[row])
+
+    def begin(self, measure, instance):
+        """
+        Returns the coordinates of the Begin marker of a measure instance.
+
+        Parameters:
+        - measure: The measure.
+        - instance: The instance of the measure.
+
+        Returns:
+        - coords: Tuple (x, y).
+        """
+        row = self.segment_rows[(measure, instance)]
+        return self.begin_x[row], self.begin_y[row]
+
+    def end(self, measure, instance):
+        """
+        Returns the coordinates of the End marker of a measure instance.
+
+        Parameters:
+        - measure: The measure.
+        - instance: The instance of the measure.
+
+        Returns:
+        - coords: Tuple (x, y).
+        """
+        row = self.segment_rows[(measure, instance)]
+        return self.end_x[row], self.end_y[row]
+
+    def complete_segments(self):
+        """
+        Returns the segments that have both a Begin and an End marker.
+
+        Returns:
+        - segments: List of tuples (measure, instance, begin_coords, end_coords), in order of the first marker.
+        """
+        complete = ~(np.isnan(self.begin_x) | np.isnan(self.end_x))
+        return [(measure, instance, (self.begin_x[row], self.begin_y[row]), (self.end_x[row], self.end_y[row]))
+                for (measure, instance), row in self.segment_rows.items() if complete[row]]
+
+    def marker_pathways(self, marker):
+        """
+        Returns the pathways a marker belongs to.
+
+        Parameters:
+        - marker: Index of the marker.
+
+        Returns:
+        - pathways: List of the pathways, in the order of the pathways of the layout.
+        """
+        bits = np.unpackbits(self.pathway_bits[marker], count=len(self.pathways))
+        return [self.pathways[position] for position in np.flatnonzero(bits).tolist()]
+
+    def markers(self):
+        """
+        Iterates over the markers grouped by measure.
+
+        Returns:
+        - markers: Iterator of tuples (marker, measure, x, y, color, facecolor), facecolor 'w' for End markers.
+        """
+        for marker in self.marker_order.tolist():
+            measure_code = self.measure_codes[marker]
+            color = self.colors[measure_code]
+            yield (marker, self.measures[measure_code], self.x[marker], self.y[marker], color,
+                   color if self.is_begin[marker] else 'w')
+
+    def to_action_pairs(self):
+        """
+        Converts the layout to the nested dict of Begin and End coordinates by measure and instance.
+
+        Returns:
+        - action_pairs: Dict mapping (measure, instance) to a dict with 'Begin' and/or 'End' coordinates.
+        """
+        action_pairs = {}
+        for (measure, instance), row in self.segment_rows.items():
+            action_pairs[(measure, instance)] = {}
+            if not np.isnan(self.begin_x[row]):
+                action_pairs[(measure, instance)]['Begin'] = np.array([self.begin_x[row], self.begin_y[row]])
+            if not np.isnan(self.end_x[row]):
+                action_pairs[(measure, instance)]['End'] = np.array([self.end_x[row], self.end_y[row]])
+        return action_pairs
+
+    def to_data(self):
+        """
+        Converts the layout to the dict of plotting data organized by measure.
+
+        Returns:
+        - data: Dict mapping measures to lists of tuples (coords, marker, color, facecolor, pathways).
+        """
+        data = {}
+        for marker, measure, x, y, color, facecolor in self.markers():
+            data.setdefault(measure, []).append((np.array([x, y]), 'o', color, facecolor,
+                                                 self.marker_pathways(marker)))
+        return data
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import pickle
+
+NETWORK_CACHE_VERSION = 5
+# In the data directory of the repository (ignored by git), independent of the working directory
+NETWORK_CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache',
+                                       'network_dicts')
+NETWORK_CACHE_MAX_BYTES = 64 * 1024 ** 2
+
+
+def file_digest(file_path):
+    """
+    Hashes the content of a file.
+
+    Parameters:
+    - file_path: Path to the file.
+
+    Returns:
+    - digest: Hex digest of the content, or None if the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        return None
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 ** 2), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def network_cache_key(files, parameters):
+    """
+    Creates the content-addressed key of a get_network_dicts result.
+
+    Parameters:
+    - files: List of paths to the input files the result depends on.
+    - parameters: List of the other (JSON serializable) inputs, e.g. renaming_dict, max_offset and planning_horizon.
+
+    Returns:
+    - key: Hex digest of the file contents and parameters.
+    """
+    content = json.dumps([NETWORK_CACHE_VERSION, [file_digest(file_path) for file_path in files], parameters],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def load_network_dicts(cache_directory, key):
+    """
+    Loads a cached get_network_dicts result.
+
+    Parameters:
+    - cache_directory: Directory of the cache.
+    - key: Key returned by network_cache_key.
+
+    Returns:
+    - entry: The cached entry, or None if the key is not in the cache.
+    """
+    cache_file = os.path.join(cache_directory, f'{key}.pkl')
+    try:
+        with open(cache_file, 'rb') as file:
+            entry = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    os.utime(cache_file)  # Mark as recently used for the eviction
+    return entry
+
+
+def store_network_dicts(cache_directory, key, entry, max_bytes=NETWORK_CACHE_MAX_BYTES):
+    """
+    Stores a get_network_dicts result and evicts the least recently used entries if the cache exceeds its size.
+
+    Parameters:
+    - cache_directory: Directory of the cache.
+    - key: Key returned by network_cache_key.
+    - entry: The result to store.
+    - max_bytes: Maximum total size of the cache in bytes.
+    """
+    os.makedirs(cache_directory, exist_ok=True)
+    cache_file = os.path.join(cache_directory, f'{key}.pkl')
+    temporary_file = f'{cache_file}.{os.getpid()}.tmp'
+    with open(temporary_file, 'wb') as file:
+        pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file, cache_file)  # Readers never see partially written entries
+    evict_network_dicts(cache_directory, max_bytes)
+
+
+def evict_network_dicts(cache_directory, max_bytes):
+    """
+    Removes the least recently used entries until the cache fits into the maximum size.
+
+    Parameters:
+    - cache_directory: Directory of the cache.
+    - max_bytes: Maximum total size of the cache in bytes.
+    """
+    entries = []
+    for name in os.listdir(cache_directory):
+        if name.endswith('.pkl'):
+            try:
+                status = os.stat(os.path.join(cache_directory, name))
+            except OSError:
+                continue  # Removed by another process
+            entries.append((status.st_mtime_ns, status.st_size, name))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_directory, name))
+        except OSError:
+            pass
+        total_size -= size
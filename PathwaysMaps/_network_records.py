@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+from adaptation_pathways.graph.node import ActionBegin, ActionEnd
+
+# Key of a node of the pathway map, e.g. ActionKey('Begin', '13', '6') for the node ActionBegin("13[6]"). Measures and
+# instances are strings, as used in action_pairs, instance_dict and the optimized offsets.
+ActionKey = namedtuple('ActionKey', ['kind', 'measure', 'instance'])
+
+# Transition between two nodes of the pathway map. Horizontal transitions run from the begin to the end of one action
+# (its tipping point is the year), vertical transitions switch at the tipping point of the first action to the next.
+Transition = namedtuple('Transition', ['from_measure', 'from_instance', 'to_measure', 'to_instance', 'year',
+                                       'vertical'])
+
+
+def action_key_from_node(node, measure_names):
+    """
+    Creates the key of a node of the pathway map.
+
+    Parameters:
+    - node: The node (ActionBegin or ActionEnd).
+    - measure_names: Dictionary mapping the measure names of the pathway map to the renamed measures.
+
+    Returns:
+    - action_key: The ActionKey with the renamed measure.
+    """
+    kind = 'Begin' if isinstance(node, ActionBegin) else 'End'
+    return ActionKey(kind, measure_names[node.action.name], str(node.action.edition))
+
+
+def transition_from_edge(begin, end, measure_names):
+    """
+    Creates the transition record of an edge of the pathway map directly from its nodes.
+
+    Parameters:
+    - begin: The node the edge starts at (ActionBegin or ActionEnd).
+    - end: The node the edge ends at.
+    - measure_names: Dictionary mapping the measure names of the pathway map to the renamed measures.
+
+    Returns:
+    - transition: The Transition with measures as renamed strings and instances as strings.
+    """
+    vertical = isinstance(begin, ActionEnd)
+    year = begin.tipping_point if vertical else end.tipping_point
+    return Transition(measure_names[begin.action.name], str(begin.action.edition), measure_names[end.action.name],
+                      str(end.action.edition), year, vertical)
@@ -1,10 +1,42 @@
-import itertools
+from PathwaysMaps._base_y_ordering import order_base_y_values, vertical_edges, vertical_transitions
 from PathwaysMaps._create_marker_dictionary import create_marker_dictionary_optimization
-from PathwaysMaps._find_integers import find_first_and_second_integers
+from PathwaysMaps._all_possible_offsets import offsets_to_optimize, offset_choices
+from PathwaysMaps._position_search import PositionSearch, LOCAL_SEARCH_ITERATIONS, LOCAL_SEARCH_SEED
 
 import numpy as np
 import json
 
+def vertical_distance(actions, action_transitions, base_y_values, y_offsets):
+    """
+    Calculates the total vertical distance of the action transitions for given base y-values and y-offsets.
+
+    Parameters:
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
+    - action_transitions: List of Transition records.
+    - base_y_values: Dict of base y-values keyed by measure identifiers.
+    - y_offsets: Dict of y-offsets keyed by measure and instance.
+
+    Returns:
+    - y_dist: The sum of the absolute vertical distances.
+    """
+    y_dist = 0
+    action_pairs, _ = create_marker_dictionary_optimization(actions, base_y_values, y_offsets)
+
+    for transition in action_transitions:
+        # Determine the type of transition (vertical or horizontal) and extract relevant information
+        if transition.vertical:
+            start_measure, start_instance = transition.from_measure, transition.from_instance
+            end_measure, end_instance = transition.to_measure, transition.to_instance
+
+            # Use the adjusted coordinates from the action_pairs to calculate the vertical distance
+            if (start_measure, start_instance) in action_pairs:
+                if 'Begin' in action_pairs[(start_measure, start_instance)]:
+                    start_y_pos = action_pairs[(start_measure, start_instance)]['Begin'][1]
+                    end_y_pos = action_pairs[(end_measure, end_instance)]['End'][1]
+
+                    y_dist += abs(start_y_pos - end_y_pos)  # Sum the absolute distances
+    return y_dist
+
 def create_optimized_positions(self, base_y_values, y_offsets, actions, action_transitions, file_offset,
                                file_base, num_iterations, optimize_position='both'):
     """
@@ -15,11 +47,11 @@ def create_optimized_positions(self, base_y_values, y_offsets, actions, action_t
     - base_y_values: Dict of base y-values keyed by measure identifiers.
     - instance_dict: Dict mapping measures to their instances.
     - y_offsets: Dict of y-offsets keyed by instance numbers.
-    - actions: Dict of action data keyed by composite identifiers including measure and instance.
-    - action_transitions: List of transitions, each represented as a tuple (start, year, end) or (start, end, year).
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
+    - action_transitions: List of Transition records.
     - file_offset: Path to save the optimal offset JSON file.
     - file_base: Path to save the optimal base y-values JSON file.
-    - num_iterations: Optional; the number of iterations to run. If False, all permutations are considered.
+    - num_iterations: Optional; the number of offset permutations to evaluate. If False, all permutations are considered.
     - optimize_position: Specifies whether to optimize 'both', 'offset', or 'base_y' positions.
 
     Returns:
@@ -27,68 +59,34 @@ def create_optimized_positions(self, base_y_values, y_offsets, actions, action_t
     - preferred_offset: Dict of y-offsets for the optimal combination.
     """
 
-    tick = 1
-    # Generate permutations for y-offsets and base y-values
+    # Generate permutations for y-offsets
     if optimize_position == 'both' or optimize_position == 'offset':
         offset_permutations = y_offsets  # Generate all permutations of y-offsets
     else:
         offset_permutations = [y_offsets[0]]  # Use the existing y-offsets as the only permutation
-    if optimize_position == 'both' or optimize_position == 'base_y':
-        base_y_values_permutations = list(itertools.permutations(base_y_values.values()))  # Generate all permutations of base y-values
-    else:
-        base_y_values_permutations = [list(base_y_values.values())]  # Use the existing base y-values as the only permutation
 
     preferred_offset = None  # Default or initial value for preferred offsets
     preferred_base = None  # Default or initial value for preferred base y-values
 
-    base_y_values_keys = list(base_y_values.keys())  # Extract keys for base y-values
-
     y_dist_min = 300000  # Initialize minimum distance to a large value
     if isinstance(num_iterations, int):
         print('iterations cover ',
-              np.round(num_iterations / (len(offset_permutations) * len(base_y_values_permutations)), 3) * 100,
-              f'% of all possible permutations. Number offset-permutations:{len(offset_permutations)}; Number offset-permutations:{len(base_y_values_permutations)}')
+              np.round(num_iterations / len(offset_permutations), 3) * 100,
+              f'% of all possible permutations. Number offset-permutations:{len(offset_permutations)}')
     else:
-        num_iterations = len(offset_permutations) * len(base_y_values_permutations)  # Total number of permutations
-
-    progress_percentage = 0
-    for base_permutation in base_y_values_permutations:
-        # Create a dictionary for the current permutation of base y-values
-        base_y_values_permutation = dict(zip(base_y_values_keys, base_permutation))
-        if base_y_values_permutation['0'] == max(base_y_values.values()):
-            if tick > num_iterations:
-                print('Not all permutations were considered for the optimization.')
-                break  # Stop if the number of iterations exceeds the limit
-
-            y_dist = 0
-            # Calculate the total vertical distance for the current permutation
-            action_pairs, _ = create_marker_dictionary_optimization(actions, base_y_values_permutation, offset_permutations[0])
-
-            for transition in action_transitions:
-                # Determine the type of transition (vertical or horizontal) and extract relevant information
-                if isinstance(transition[1], int):
-                    start_measure, start_instance = find_first_and_second_integers(transition[0])
-                    end_measure, end_instance = find_first_and_second_integers(transition[2])
-
-                    # Use the adjusted coordinates from the action_pairs to calculate the vertical distance
-                    if (start_measure, start_instance) in action_pairs:
-                        if 'Begin' in action_pairs[(start_measure, start_instance)]:
-                            start_y_pos = action_pairs[(start_measure, start_instance)]['Begin'][1]
-                            end_y_pos = action_pairs[(end_measure, end_instance)]['End'][1]
-
-                            y_dist += abs(start_y_pos - end_y_pos)  # Sum the absolute distances
-
-            if y_dist < y_dist_min:
-                # Update the minimum distance and preferred permutations if a better combination is found
-                y_dist_min = y_dist
-                preferred_base = base_y_values_permutation
+        num_iterations = len(offset_permutations)  # Total number of permutations
 
-            progress_percentage = np.round(tick / len(base_y_values_permutations),
-                                           3) * 100
-            tick += 1
-        print(f'\rOptimization Progress (y_base): {progress_percentage}% (Shortest distance: {y_dist_min}); '
-              f'Number base_y-permutations:{len(base_y_values_permutations)})',
-              end='')
+    if optimize_position == 'both' or optimize_position == 'base_y':
+        # Optimal assignment of the base y-values with '0' at the top, instead of evaluating all permutations
+        edges = vertical_edges(actions, action_transitions, base_y_values, offset_permutations[0])
+        preferred_base = order_base_y_values(base_y_values, edges, self.base_y_exact_limit)
+    elif base_y_values['0'] == max(base_y_values.values()):
+        preferred_base = dict(base_y_values)  # Use the existing base y-values
+    if preferred_base is not None:
+        y_dist_min = vertical_distance(actions, action_transitions, preferred_base, offset_permutations[0])
+    print(f'\rOptimization Progress (y_base): 100.0% (Shortest distance: {y_dist_min}); '
+          f'Number base_y-values:{len(base_y_values)})',
+          end='')
     print()
     # Save the optimal base y-values dictionary to a JSON file
     with open(f'{file_base}.json', 'r') as file:
@@ -106,23 +104,8 @@ def create_optimized_positions(self, base_y_values, y_offsets, actions, action_t
             # print('Not all permutations were considered for the optimization.')
             break  # Stop if the number of iterations exceeds the limit
         else:
-            y_dist = 0
             # Calculate the total vertical distance for the current permutation
-            action_pairs, _ = create_marker_dictionary_optimization(actions, preferred_base, off_permutation)
-
-            for transition in action_transitions:
-                # Determine the type of transition (vertical or horizontal) and extract relevant information
-                if isinstance(transition[1], int):
-                    start_measure, start_instance = find_first_and_second_integers(transition[0])
-                    end_measure, end_instance = find_first_and_second_integers(transition[2])
-
-                    # Use the adjusted coordinates from the action_pairs to calculate the vertical distance
-                    if (start_measure, start_instance) in action_pairs:
-                        if 'Begin' in action_pairs[(start_measure, start_instance)]:
-                            start_y_pos = action_pairs[(start_measure, start_instance)]['Begin'][1]
-                            end_y_pos = action_pairs[(end_measure, end_instance)]['End'][1]
-
-                            y_dist += abs(start_y_pos - end_y_pos)  # Sum the absolute distances
+            y_dist = vertical_distance(actions, action_transitions, preferred_base, off_permutation)
 
             if y_dist < y_dist_min:
                 # Update the minimum distance and preferred permutations if a better combination is found
@@ -148,3 +131,64 @@ def create_optimized_positions(self, base_y_values, y_offsets, actions, action_t
 
     print() # to break the line after the progress
     # return preferred_base, preferred_offset
+
+def create_local_search_positions(self, base_y_values, base_y_offsets, instance_dict, y_offsets, actions,
+                                  action_transitions, file_offset, file_base, num_iterations, seed=LOCAL_SEARCH_SEED):
+    """
+    Finds base y-values and y-offsets with a short total vertical distance with simulated annealing, for maps that are
+    too large to evaluate the offset permutations.
+
+    Parameters:
+    - self: The class instance containing various configurations.
+    - base_y_values: Dict of base y-values keyed by measure identifiers.
+    - base_y_offsets: Dict of the known y-offsets keyed by measure and instance.
+    - instance_dict: Dict mapping measures to their instances.
+    - y_offsets: List of the y-offsets that can be assigned to the instances, in order of preference.
+    - actions: Dict of action data keyed by ActionKey records (kind, measure, instance).
+    - action_transitions: List of Transition records.
+    - file_offset: Path to save the optimal offset JSON file.
+    - file_base: Path to save the optimal base y-values JSON file.
+    - num_iterations: Optional; the number of moves of the local search. If not an integer, LOCAL_SEARCH_ITERATIONS.
+    - seed: Seed of the local search, the same seed gives the same positions.
+    """
+    if not isinstance(num_iterations, int):
+        num_iterations = LOCAL_SEARCH_ITERATIONS
+
+    # Start with the first y-offsets of every measure, as the first offset permutation
+    initial_offset, keys_to_optimize = offsets_to_optimize(base_y_offsets, instance_dict)
+    variable_offsets = {}
+    for measure, instances in keys_to_optimize.items():
+        choices = offset_choices(len(instances), y_offsets)
+        initial_offset[measure].update(zip(instances, choices))
+        variable_offsets[measure] = (instances, choices)
+
+    if len(base_y_values) <= self.base_y_exact_limit:
+        edges = vertical_edges(actions, action_transitions, base_y_values, initial_offset)
+        initial_base = order_base_y_values(base_y_values, edges, self.base_y_exact_limit)
+    else:
+        # Move the current situation ('0') to the top, the local search keeps it there
+        initial_base = dict(base_y_values)
+        top = max(initial_base, key=initial_base.get)
+        initial_base['0'], initial_base[top] = initial_base[top], initial_base['0']
+
+    search = PositionSearch(vertical_transitions(actions, action_transitions), initial_base, initial_offset,
+                            variable_offsets, seed)
+    y_dist_min, preferred_base, preferred_offset = search.anneal(num_iterations)
+    print(f'Optimization Progress (local search): 100.0% (Shortest distance: {y_dist_min}); '
+          f'Number moves:{num_iterations})')
+
+    # Save the optimal base y-values dictionary to a JSON file
+    with open(f'{file_base}.json', 'r') as file:
+        base_y = json.load(file)
+
+    base_y.update(preferred_base)
+    with open(f'{file_base}.json', 'w') as file:
+        json.dump(base_y, file)
+
+    # Save the optimal offset dictionary to a JSON file
+    with open(f'{file_offset}.json', 'r') as file:
+        base_y_offsets = json.load(file)
+
+    base_y_offsets.update(preferred_offset)
+    with open(f'{file_offset}.json', 'w') as file:
+        json.dump(base_y_offsets, file)
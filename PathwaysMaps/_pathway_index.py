@@ -0,0 +1,55 @@
+def index_pathways(measures_in_pathways):
+    """
+    Creates an inverted index of the measures in the pathways, so the pathways of a measure instance are found without
+    scanning all pathways.
+
+    Parameters:
+    - measures_in_pathways: Dict mapping pathways to their associated measures, e.g. {'3': ['0', '10[2]', '13[6]']}.
+
+    Returns:
+    - pathway_index: Tuple with the list of pathways and a dict mapping every measure (instance) to the sorted
+      positions of the pathways it belongs to.
+    """
+    pathways = list(measures_in_pathways)
+    positions = {}
+    for position, measures in enumerate(measures_in_pathways.values()):
+        for measure in set(measures):
+            positions.setdefault(measure, []).append(position)
+    return pathways, positions
+
+
+def find_pathways(pathway_index, *entries):
+    """
+    Finds the pathways that contain any of the given measures (instances).
+
+    Parameters:
+    - pathway_index: Index returned by index_pathways.
+    - entries: Measure instances like '10[2]', or measures without instance like '0'.
+
+    Returns:
+    - pathways: List of the pathways containing any of the entries, in the order of measures_in_pathways.
+    """
+    pathways, positions = pathway_index
+    if len(entries) == 1:
+        return [pathways[position] for position in positions.get(entries[0], [])]
+    found = set()
+    for entry in entries:
+        found.update(positions.get(entry, []))
+    return [pathways[position] for position in sorted(found)]
+
+
+def pathways_with_measure_instance(pathway_index, measure, instance):
+    """
+    Finds the pathways of a line segment. The current situation ('0') also matches pathways listing it without instance.
+
+    Parameters:
+    - pathway_index: Index returned by index_pathways.
+    - measure: The measure of the segment.
+    - instance: The instance of the measure.
+
+    Returns:
+    - pathways: List of the pathways containing the measure instance, in the order of measures_in_pathways.
+    """
+    if measure == '0':
+        return find_pathways(pathway_index, f'{measure}[{instance}]', f'{measure}')
+    return find_pathways(pathway_index, f'{measure}[{instance}]')
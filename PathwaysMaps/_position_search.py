@@ -0,0 +1,253 @@
+import math
+import random
+
+LOCAL_SEARCH_ITERATIONS = 20000  # Default number of moves of the local search
+LOCAL_SEARCH_SEED = 0  # Default seed of the local search, so that the same map gives the same layout
+
+
+class PositionSearch:
+    """
+    Simulated annealing over the base y-values and y-offsets of the measures, minimizing the total vertical distance
+    of the vertical transitions.
+
+    A move swaps the base y-values of two measures, swaps the y-offsets of two instances of a measure or gives an
+    instance an unused y-offset of its measure. The change of the total distance is computed from the transitions of
+    the moved measures or instances only. The current situation ('0') keeps its base y-value and has no y-offset.
+
+    Parameters:
+    - transitions: List of tuples (start_measure, start_instance, end_measure, end_instance), see vertical_transitions.
+    - base_y_values: Dict of the initial base y-values keyed by measure identifiers.
+    - y_offsets: Dict of the initial y-offsets keyed by measure and instance.
+    - variable_offsets: Dict mapping measures to tuples (instances, choices) of the instances whose y-offset is
+      optimized and the y-offsets they can take.
+    - seed: Seed of the random moves.
+    """
+
+    def __init__(self, transitions, base_y_values, y_offsets, variable_offsets, seed=LOCAL_SEARCH_SEED):
+        self.random = random.Random(seed)
+        self.base_y_values = dict(base_y_values)
+        self.y_offsets = {measure: dict(offsets) for measure, offsets in y_offsets.items()}
+        self.measures = [measure for measure in base_y_values if measure != '0']
+
+        # Nodes are the measure instances, their y-position is the base y-value plus the y-offset
+        self.nodes = {}
+        self.node_keys = []
+        self.start_nodes = [self._node(start, start_instance) for start, start_instance, _, _ in transitions]
+        self.end_nodes = [self._node(end, end_instance) for _, _, end, end_instance in transitions]
+
+        self.variable_nodes = {}
+        self.unused_offsets = {}
+        for measure, (instances, choices) in variable_offsets.items():
+            if measure == '0':
+                continue  # The current situation has no y-offset
+            nodes = [self._node(measure, str(instance)) for instance in instances]
+            if len(nodes) > 0:
+                self.variable_nodes[measure] = nodes
+                self.unused_offsets[measure] = [choice for choice in choices
+                                                if choice not in [self._offset(node) for node in nodes]]
+
+        self.nodes_of_measure = {}
+        for node, (measure, _) in enumerate(self.node_keys):
+            self.nodes_of_measure.setdefault(measure, []).append(node)
+        self.edges_of_node = [[] for _ in self.node_keys]
+        for edge, (start, end) in enumerate(zip(self.start_nodes, self.end_nodes)):
+            self.edges_of_node[start].append(edge)
+            if end != start:
+                self.edges_of_node[end].append(edge)
+        self.edges_of_measure = {measure: sorted({edge for node in nodes for edge in self.edges_of_node[node]})
+                                 for measure, nodes in self.nodes_of_measure.items()}
+
+        self._restore(self._snapshot())
+
+    def _node(self, measure, instance):
+        key = (measure, instance)
+        if key not in self.nodes:
+            self.nodes[key] = len(self.node_keys)
+            self.node_keys.append(key)
+        return self.nodes[key]
+
+    def _offset(self, node):
+        measure, instance = self.node_keys[node]
+        return self.y_offsets[measure][instance] if measure != '0' else 0
+
+    def _position(self, node):
+        return int(self.base_y_values.get(self.node_keys[node][0], 0)) + self._offset(node)
+
+    def _set_offset(self, node, offset):
+        measure, instance = self.node_keys[node]
+        self.y_offsets[measure][instance] = offset
+        self.y[node] = self._position(node)
+
+    def _delta(self, edges):
+        """
+        Updates the costs of the edges to the current y-positions.
+
+        Parameters:
+        - edges: Iterable of the edges of the moved nodes.
+
+        Returns:
+        - delta: The change of the total distance.
+        - old_costs: List of tuples (edge, old cost) to undo the update.
+        """
+        delta = 0
+        old_costs = []
+        for edge in edges:
+            cost = abs(self.y[self.start_nodes[edge]] - self.y[self.end_nodes[edge]])
+            old_costs.append((edge, self.costs[edge]))
+            delta += cost - self.costs[edge]
+            self.costs[edge] = cost
+        return delta, old_costs
+
+    def _swap_base(self, first, second):
+        self.base_y_values[first], self.base_y_values[second] = self.base_y_values[second], self.base_y_values[first]
+        for node in self.nodes_of_measure.get(first, []) + self.nodes_of_measure.get(second, []):
+            self.y[node] = self._position(node)
+
+    def _swap_offsets(self, first, second):
+        first_offset, second_offset = self._offset(first), self._offset(second)
+        self._set_offset(first, second_offset)
+        self._set_offset(second, first_offset)
+
+    def _replace_offset(self, measure, node, position):
+        old_offset = self._offset(node)
+        self._set_offset(node, self.unused_offsets[measure][position])
+        self.unused_offsets[measure][position] = old_offset
+
+    def moves(self):
+        """
+        Lists all moves of the neighbourhood.
+
+        Returns:
+        - moves: List of tuples (kind, arguments), kind 'base', 'swap' or 'replace'.
+        """
+        moves = [('base', (first, second)) for position, first in enumerate(self.measures)
+                 for second in self.measures[position + 1:]]
+        for measure, nodes in self.variable_nodes.items():
+            moves += [('swap', (first, second)) for position, first in enumerate(nodes) for second in nodes[position + 1:]]
+            moves += [('replace', (measure, node, position)) for node in nodes
+                      for position in range(len(self.unused_offsets[measure]))]
+        return moves
+
+    def apply(self, move):
+        """
+        Applies a move and updates the total distance.
+
+        Parameters:
+        - move: Tuple (kind, arguments) as returned by moves.
+
+        Returns:
+        - delta: The change of the total distance.
+        - old_costs: List of tuples (edge, old cost) to undo the move.
+        """
+        kind, arguments = move
+        if kind == 'base':
+            self._swap_base(*arguments)
+            edges = set(self.edges_of_measure.get(arguments[0], [])).union(self.edges_of_measure.get(arguments[1], []))
+        elif kind == 'swap':
+            self._swap_offsets(*arguments)
+            edges = set(self.edges_of_node[arguments[0]]).union(self.edges_of_node[arguments[1]])
+        else:
+            self._replace_offset(*arguments)
+            edges = self.edges_of_node[arguments[1]]
+        delta, old_costs = self._delta(edges)
+        self.distance += delta
+        return delta, old_costs
+
+    def undo(self, move, delta, old_costs):
+        """
+        Reverts a move applied with apply.
+
+        Parameters:
+        - move: The applied move.
+        - delta: The change of the total distance returned by apply.
+        - old_costs: The old costs returned by apply.
+        """
+        kind, arguments = move
+        if kind == 'base':
+            self._swap_base(*arguments)
+        elif kind == 'swap':
+            self._swap_offsets(*arguments)
+        else:
+            self._replace_offset(*arguments)
+        for edge, cost in old_costs:
+            self.costs[edge] = cost
+        self.distance -= delta
+
+    def state(self):
+        """
+        Returns a copy of the current base y-values and y-offsets.
+
+        Returns:
+        - base_y_values: Dict of base y-values keyed by measure identifiers.
+        - y_offsets: Dict of y-offsets keyed by measure and instance.
+        """
+        return dict(self.base_y_values), {measure: dict(offsets) for measure, offsets in self.y_offsets.items()}
+
+    def _snapshot(self):
+        return self.state() + ({measure: list(offsets) for measure, offsets in self.unused_offsets.items()},)
+
+    def _restore(self, snapshot):
+        base_y_values, self.y_offsets, self.unused_offsets = snapshot
+        self.base_y_values = base_y_values
+        self.y = [self._position(node) for node in range(len(self.node_keys))]
+        self.costs = [abs(self.y[start] - self.y[end]) for start, end in zip(self.start_nodes, self.end_nodes)]
+        self.distance = sum(self.costs)
+
+    def anneal(self, num_iterations=LOCAL_SEARCH_ITERATIONS):
+        """
+        Runs simulated annealing with random moves followed by a descent to a local minimum.
+
+        Parameters:
+        - num_iterations: Number of random moves. The temperature cools geometrically from the mean increase of the
+          total distance by a move to a thousandth of it.
+
+        Returns:
+        - distance: The shortest total distance found.
+        - base_y_values: Dict of base y-values of the shortest total distance.
+        - y_offsets: Dict of y-offsets of the shortest total distance.
+        """
+        moves = self.moves()
+        best_distance, best_state = self.distance, self._snapshot()
+        if len(moves) > 0 and num_iterations > 0:
+            # Initial temperature from a sample of moves
+            increases = []
+            for move in self.random.sample(moves, min(len(moves), 100)):
+                delta, old_costs = self.apply(move)
+                self.undo(move, delta, old_costs)
+                if delta > 0:
+                    increases.append(delta)
+            temperature = sum(increases) / len(increases) if increases else 1
+            cooling = 1e-3 ** (1 / num_iterations)
+
+            for _ in range(num_iterations):
+                move = self.random.choice(moves)
+                delta, old_costs = self.apply(move)
+                if delta > 0 and self.random.random() >= math.exp(-delta / temperature):
+                    self.undo(move, delta, old_costs)
+                elif self.distance < best_distance - 1e-9:
+                    best_distance, best_state = self.distance, self._snapshot()
+                temperature *= cooling
+
+        self._restore(best_state)
+        return self.descend()
+
+    def descend(self):
+        """
+        Applies improving moves until no move decreases the total distance.
+
+        Returns:
+        - distance: The total distance of the local minimum.
+        - base_y_values: Dict of base y-values of the local minimum.
+        - y_offsets: Dict of y-offsets of the local minimum.
+        """
+        improved = True
+        while improved:
+            improved = False
+            for move in self.moves():
+                delta, old_costs = self.apply(move)
+                if delta < -1e-9:  # Ignore rounding errors
+                    improved = True
+                else:
+                    self.undo(move, delta, old_costs)
+        self.distance = sum(self.costs)
+        return (self.distance,) + self.state()
@@ -0,0 +1,113 @@
+import functools
+import re
+
+
+class Renamer:
+    """
+    Replaces substrings of strings in nested lists and dictionary keys in a single pass per string.
+
+    The replacements are compiled into one regular expression with the longest names first, so overlapping names like
+    '1' and '10' are replaced independently of the order of the renaming dictionary and a replaced part is never
+    renamed again.
+
+    Parameters:
+    - replacements: A dictionary where keys are substrings to be replaced, and values are the replacements.
+    """
+
+    def __init__(self, replacements):
+        self.replacements = {str(old): str(new) for old, new in replacements.items() if str(old)}
+        if self.replacements:
+            alternatives = sorted(self.replacements, key=len, reverse=True)
+            self.pattern = re.compile('|'.join(re.escape(old) for old in alternatives))
+        else:
+            self.pattern = None
+
+    def rename(self, string):
+        """
+        Replaces all substrings of a string.
+
+        Parameters:
+        - string: The string to rename.
+
+        Returns:
+        - renamed: The renamed string.
+        """
+        if self.pattern is None:
+            return string
+        return self.pattern.sub(lambda match: self.replacements[match.group(0)], string)
+
+    def rename_action(self, action):
+        """
+        Replaces the substrings of the measure name of an action, the instance in brackets is kept.
+
+        Parameters:
+        - action: The action, e.g. '10[2]' or 'current'.
+
+        Returns:
+        - renamed: The action with the renamed measure name.
+        """
+        name, bracket, instance = action.partition('[')
+        return self.rename(name) + bracket + instance
+
+    def rename_list(self, lst):
+        """
+        Recursively replaces strings in a list, and the keys of dictionaries in the list.
+
+        Parameters:
+        - lst: The list containing strings and other elements.
+
+        Returns:
+        - new_list: A new list with strings replaced, or lst itself if it is not a list.
+        """
+        if not isinstance(lst, list):
+            return lst
+        new_list = []
+        for item in lst:
+            if isinstance(item, dict):
+                new_list.append(self.rename_dict_keys(item))
+            elif isinstance(item, list):
+                new_list.append(self.rename_list(item))
+            elif isinstance(item, str):
+                new_list.append(self.rename(item))
+            else:
+                new_list.append(item)
+        return new_list
+
+    def rename_dict_keys(self, d):
+        """
+        Recursively replaces strings in dictionary keys, and the strings in lists that are values of the dictionary.
+
+        Parameters:
+        - d: The dictionary containing keys to be processed.
+
+        Returns:
+        - new_dict: A new dictionary with keys replaced, or d itself if it is not a dictionary.
+        """
+        if not isinstance(d, dict):
+            return d
+        new_dict = {}
+        for k, v in d.items():
+            if isinstance(v, dict):
+                v = self.rename_dict_keys(v)
+            elif isinstance(v, list):
+                v = self.rename_list(v)
+            new_dict[self.rename(k) if isinstance(k, str) else k] = v
+        return new_dict
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_renamer(replacements):
+    return Renamer(dict(replacements))
+
+
+def get_renamer(replacements):
+    """
+    Returns the compiled Renamer for a renaming dictionary, compiling it only once per set of replacements.
+
+    Parameters:
+    - replacements: A dictionary where keys are substrings to be replaced, and values are the replacements.
+
+    Returns:
+    - renamer: The Renamer.
+    """
+    return _compiled_renamer(tuple(sorted((str(old), str(new)) for old, new in replacements.items())))
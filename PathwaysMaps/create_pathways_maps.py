@@ -75,12 +75,12 @@ def create_pathways_maps(line_choice, input_with_pathways, file_offset, file_bas
         preferred_base = json.load(file)
 
     # Create markers
-    action_pairs, data, preferred_dict_inv = NewPathwayMaps.create_markers(
+    layout, preferred_dict_inv = NewPathwayMaps.create_markers(
         actions, instance_dict, preferred_offset, preferred_base, measures_in_pathways, line_choice
     )
     if interaction_identifier:
         # Create markers with interactions
-        action_pairs_i, data_i, preferred_dict_inv = NewPathwayMaps.create_markers(
+        layout_i, preferred_dict_inv = NewPathwayMaps.create_markers(
             actions_i, instance_dict, preferred_offset, preferred_base, measures_in_pathways_i, line_choice
         )
     # Generate and save the base figure without interactions
@@ -88,7 +88,7 @@ def create_pathways_maps(line_choice, input_with_pathways, file_offset, file_bas
     if interaction_identifier:
         if plot_type == 'plotly':
             fig = NewPathwayMaps.pathways_plotly_with_background(
-                data_i, action_pairs_i, action_transitions_i, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv,
+                layout_i, action_transitions_i, layout, action_transitions, x_offsets, preferred_dict_inv,
                 measures_in_pathways_i, measures_in_pathways, planning_horizon, risk_owner_hazard, figure_title, ylabels, color='#d9d9d9'
             )
 
@@ -103,9 +103,9 @@ def create_pathways_maps(line_choice, input_with_pathways, file_offset, file_bas
             # with open(f'{savepath}.json', 'w') as f:
             #     json.dump(fig_json, f)
         elif plot_type == 'matplotlib':
-            fig = NewPathwayMaps.create_base_figure(data, action_pairs, action_transitions, x_offsets, preferred_dict_inv,
+            fig = NewPathwayMaps.create_base_figure(layout, action_transitions, x_offsets, preferred_dict_inv,
                            measures_in_pathways, planning_horizon, ylabels)
-            fig = NewPathwayMaps.add_other_map(data_i, action_pairs_i, action_transitions_i, x_offsets, preferred_dict_inv,
+            fig = NewPathwayMaps.add_other_map(layout_i, action_transitions_i, x_offsets, preferred_dict_inv,
                                          measures_in_pathways_i, planning_horizon, ylabels)
 
             fig.savefig(f'{visualization_output_plot}_{interaction_identifier}.png', dpi=300)
@@ -113,7 +113,7 @@ def create_pathways_maps(line_choice, input_with_pathways, file_offset, file_bas
     else:
         if plot_type == 'plotly':
             fig = NewPathwayMaps.create_base_figure_plotly(
-                data, action_pairs, action_transitions, x_offsets, preferred_dict_inv,
+                layout, action_transitions, x_offsets, preferred_dict_inv,
                 measures_in_pathways, planning_horizon, risk_owner_hazard, figure_title, ylabels=ylabels
             )
 
@@ -128,7 +128,7 @@ def create_pathways_maps(line_choice, input_with_pathways, file_offset, file_bas
             # with open(f'{savepath}.json', 'w') as f:
             #     json.dump(fig_json, f)
         elif plot_type == 'matplotlib':
-            fig = NewPathwayMaps.create_base_figure(data, action_pairs, action_transitions, x_offsets,
+            fig = NewPathwayMaps.create_base_figure(layout, action_transitions, x_offsets,
                                                     preferred_dict_inv,
                                                     measures_in_pathways, planning_horizon, ylabels)
             fig.savefig(f'{visualization_output_plot}.png', dpi=300)
@@ -76,17 +76,17 @@ def create_pathways_maps_multi_risk(focus, line_choice, input_with_pathways, fil
         preferred_base = json.load(file)
 
     # Create markers
-    action_pairs, data, preferred_dict_inv = NewPathwayMaps.create_markers(
+    layout, preferred_dict_inv = NewPathwayMaps.create_markers(
         actions, instance_dict, preferred_offset, preferred_base, measures_in_pathways, line_choice
     )
 
     # Create markers for spotlight
-    action_pairs_i, data_i, preferred_dict_inv = NewPathwayMaps.create_markers(
+    layout_i, preferred_dict_inv = NewPathwayMaps.create_markers(
         actions_i, instance_dict, preferred_offset, preferred_base, measures_in_pathways_i, line_choice
     )
 
     NewPathwayMaps.pathways_plotly_with_background(
-        data_i, action_pairs_i, action_transitions_i, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv,
+        layout_i, action_transitions_i, layout, action_transitions, x_offsets, preferred_dict_inv,
         measures_in_pathways_i, measures_in_pathways, planning_horizon, risk_owner_hazard, figure_title, ylabels, color='#d9d9d9'
     )
     # fig.show()
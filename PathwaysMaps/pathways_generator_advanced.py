@@ -1,12 +1,15 @@
 import json
 import numpy as np
-from PathwaysMaps._optimize_positions import create_optimized_positions
+from PathwaysMaps._optimize_positions import create_optimized_positions, create_local_search_positions
 from PathwaysMaps._create_marker_dictionary import create_marker_dictionary
 from PathwaysMaps._instance_dictionary import create_instance_dictionary
 from PathwaysMaps._base_figure import base_figure, other_figure
 from PathwaysMaps._base_figure_plotly import base_figure_plotly, pathways_plotly_with_background
 from PathwaysMaps._get_network_dicts import get_network_dicts
 from PathwaysMaps._all_possible_offsets import all_possible_offsets
+from PathwaysMaps._network_cache import NETWORK_CACHE_DIRECTORY, NETWORK_CACHE_MAX_BYTES
+from PathwaysMaps._base_y_ordering import BASE_Y_EXACT_LIMIT
+from PathwaysMaps._position_search import LOCAL_SEARCH_SEED
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 
@@ -41,7 +44,9 @@ class Pathways_Generator_Advanced():
     def __init__(self, measure_colors, base_colors_sectors, measure_numbers_inv, replacing_measure, line_choice,
                  max_y_offset, fonts, fig_dimensions, line_width_marker, size_marker, line_width_line, max_line_offset,
                  measure_numbers, inverted_measure_numbers, measure_dict, renaming_dict,
-                 input_with_pathways, plot_type, fig=None, col=None, row=None):
+                 input_with_pathways, plot_type, fig=None, col=None, row=None,
+                 network_cache_directory=NETWORK_CACHE_DIRECTORY, network_cache_size=NETWORK_CACHE_MAX_BYTES,
+                 base_y_exact_limit=BASE_Y_EXACT_LIMIT):
         """
         Initializes the Pathways_Generator_Advanced instance.
 
@@ -51,6 +56,10 @@ class Pathways_Generator_Advanced():
         - replacing_measure: Dictionary mapping measures to their replacements.
         - line_choice: Design choice for line representation.
         - input_with_pathways: Boolean indicating whether the input file contains pathway numbers.
+        - network_cache_directory: Directory to cache the network dictionaries in, or None to disable the cache.
+        - network_cache_size: Maximum size of the cache in bytes, least recently used entries are removed first.
+        - base_y_exact_limit: Largest number of measures for which the order of the base y-values is optimized exactly,
+          larger maps use a local search.
         """
         if plot_type == 'matplotlib':
             if fig:
@@ -83,6 +92,9 @@ class Pathways_Generator_Advanced():
         self.size_marker = size_marker
         self.line_width_line = line_width_line
         self.max_line_offset = max_line_offset
+        self.network_cache_directory = network_cache_directory
+        self.network_cache_size = network_cache_size
+        self.base_y_exact_limit = base_y_exact_limit
 
     def create_start_files(self, input_file_with_pathways, file_sequence_only, file_tipping_points, renaming_dict,
                            max_x_offset, planning_horizon, initial_measures_in_pathways=False, initial_base_y_values=False,
@@ -155,7 +167,7 @@ class Pathways_Generator_Advanced():
         return instance_dict, actions, action_transitions, base_y_values, x_offsets, measures_in_pathways, max_instance, base_y_offsets, x_position_dict
 
     def optimize_positions(self, instance_dict, actions, action_transitions, base_y_values, max_instance,base_y_offsets, max_y_offset,
-                           file_offset, file_base, num_iterations, optimize_position='both'):
+                           file_offset, file_base, num_iterations, optimize_position='both', seed=LOCAL_SEARCH_SEED):
         """
         Optimizes the positions to minimize total vertical distance for action transitions.
 
@@ -169,7 +181,10 @@ class Pathways_Generator_Advanced():
         - file_offset: Path to save the optimal offset JSON file.
         - file_base: Path to save the optimal base y-values JSON file.
         - num_iterations: Optional; the number of iterations to run for optimization. If 'all', all permutations are considered.
-        - optimize_positions: Specifies whether to optimize 'both', 'offset', or 'base_y' positions.
+          With 'local_search', the number of moves of the local search.
+        - optimize_positions: Specifies whether to optimize 'both', 'offset', or 'base_y' positions, or 'local_search'
+          to search both with simulated annealing.
+        - seed: Seed of the 'local_search', the same seed gives the same positions.
 
         Returns:
         - None
@@ -194,6 +209,12 @@ class Pathways_Generator_Advanced():
         for i in range(1, len(y_offsets1)):
             rearranged_offsets.append(y_offsets1[i])
             rearranged_offsets.append(y_offsets2[i])
+        if optimize_position == 'local_search':
+            # Search base y-values and y-offsets together, without generating the offset permutations
+            create_local_search_positions(self, base_y_values, base_y_offsets, instance_dict, rearranged_offsets,
+                                          actions, action_transitions, file_offset, file_base, num_iterations, seed)
+            return
+
         all_possible_offsets_dict = all_possible_offsets(base_y_offsets, instance_dict, rearranged_offsets, num_iterations)
         create_optimized_positions(self, base_y_values, all_possible_offsets_dict, actions, action_transitions,
                                    file_offset, file_base, num_iterations, optimize_position)
@@ -210,17 +231,16 @@ class Pathways_Generator_Advanced():
         - measures_in_pathways: Dictionary mapping pathways to their associated measures.
 
         Returns:
-        - action_pairs: Dictionary for storing Begin and End coordinates by measure and instance.
-        - data: Organized list of tuples containing adjusted y-values, markers, colors, and face colors for plotting.
+        - layout: MarkerLayout with the positions of the markers and segments, and the pathways of every marker.
         - preferred_dict_inv: Inverse dictionary of preferred base y-values.
         """
         # Create an inverse dictionary for preferred base y-values
         preferred_dict_inv = {v: k for k, v in preferred_base.items()}
 
-        # Initialize a dictionary to store begin and end coordinates for each measure and instance
-        action_pairs, data = create_marker_dictionary(self, actions, preferred_base, instance_dict, preferred_offset,
-                                                      measures_in_pathways, line_choice)
-        return action_pairs, data, preferred_dict_inv
+        # Positions of the markers and of the begin and end coordinates for each measure and instance
+        layout = create_marker_dictionary(self, actions, preferred_base, instance_dict, preferred_offset,
+                                          measures_in_pathways, line_choice)
+        return layout, preferred_dict_inv
 
     def manual_adjust_base_positions(self, original_base_positions, changing_positions, change_type):
         """
@@ -244,14 +264,13 @@ class Pathways_Generator_Advanced():
 
         return original_base_positions
 
-    def create_base_figure(self, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv,
+    def create_base_figure(self, layout, action_transitions, x_offsets, preferred_dict_inv,
                            measures_in_pathways, planning_horizon, ylabels):
         """
         Creates the base figure for the pathways plot using Matplotlib.
 
         Parameters:
-        - data: Organized list of tuples containing adjusted y-values, markers, colors, and face colors for plotting.
-        - action_pairs: Dictionary for storing Begin and End coordinates by measure and instance.
+        - layout: MarkerLayout with the positions of the markers and segments.
         - action_transitions: List of action transitions.
         - x_offsets: Dictionary of x-offsets.
         - preferred_dict_inv: Inverse dictionary of preferred base y-values.
@@ -264,19 +283,18 @@ class Pathways_Generator_Advanced():
 
 
         # Generate the base figure and save it
-        base_figure(self, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
+        base_figure(self, layout, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
                     planning_horizon, ylabels)
 
         return self.figure
 
-    def create_base_figure_plotly(self, data, action_pairs, action_transitions, offsets, preferred_dict_inv,
+    def create_base_figure_plotly(self, layout, action_transitions, offsets, preferred_dict_inv,
                                   measures_in_pathways, planning_horizon, risk_owner_hazard, figure_title, ylabels):
         """
         Creates the base figure for the pathways plot using Plotly.
 
         Parameters:
-        - data: Organized list of tuples containing adjusted y-values, markers, colors, and face colors for plotting.
-        - action_pairs: Dictionary for storing Begin and End coordinates by measure and instance.
+        - layout: MarkerLayout with the positions of the markers and segments.
         - action_transitions: List of action transitions.
         - offsets: Dictionary of x-offsets.
         - preferred_dict_inv: Inverse dictionary of preferred base y-values.
@@ -287,12 +305,11 @@ class Pathways_Generator_Advanced():
         - None
         """
         # Generate the base figure and save it
-        base_figure_plotly(self, data, action_pairs, action_transitions, offsets, preferred_dict_inv,
+        base_figure_plotly(self, layout, action_transitions, offsets, preferred_dict_inv,
                            measures_in_pathways, planning_horizon, figure_title, ylabels, risk_owner_hazard)
         return self.figure
 
-    def pathways_plotly_with_background(self, data_new, action_pairs_new, action_transitions_new, data_old,
-                                        action_pairs_old,
+    def pathways_plotly_with_background(self, layout_new, action_transitions_new, layout_old,
                                         action_transitions_old, offsets, preferred_dict_inv, measures_in_pathways,
                                         measures_in_pathways_old, planning_horizon, risk_owner_hazard, figure_title, ylabels,
                                         color='#d9d9d9'):
@@ -300,11 +317,9 @@ class Pathways_Generator_Advanced():
         Creates a pathways change plot using Plotly.
 
         Parameters:
-        - data_new: New pathways data for plotting.
-        - action_pairs_new: New action pairs for pathways.
+        - layout_new: MarkerLayout of the new pathways.
         - action_transitions_new: New action transitions.
-        - data_old: Old pathways data for plotting.
-        - action_pairs_old: Old action pairs for pathways.
+        - layout_old: MarkerLayout of the old pathways.
         - action_transitions_old: Old action transitions.
         - offsets: Dictionary of x-offsets.
         - preferred_dict_inv: Inverse dictionary of preferred base y-values.
@@ -316,22 +331,20 @@ class Pathways_Generator_Advanced():
         - None
         """
         # Generate the base figure and save it
-        pathways_plotly_with_background(self, data_new, action_pairs_new, action_transitions_new, data_old,
-                                        action_pairs_old,
+        pathways_plotly_with_background(self, layout_new, action_transitions_new, layout_old,
                                         action_transitions_old, offsets, preferred_dict_inv, measures_in_pathways,
                                         measures_in_pathways_old, planning_horizon, risk_owner_hazard, figure_title,
                                         ylabels,
                                         color)
         return self.figure
 
-    def add_other_map(self, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
+    def add_other_map(self, layout, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
                       planning_horizon, ylabels, color='#d9d9d9', alpha=0.8):
         """
         Adds another pathways map to the existing figure using Matplotlib.
 
         Parameters:
-        - data: Organized list of tuples containing adjusted y-values, markers, colors, and face colors for plotting.
-        - action_pairs: Dictionary for storing Begin and End coordinates by measure and instance.
+        - layout: MarkerLayout with the positions of the markers and segments.
         - action_transitions: List of action transitions.
         - x_offsets: Dictionary of x-offsets.
         - preferred_dict_inv: Inverse dictionary of preferred base y-values.
@@ -343,6 +356,6 @@ class Pathways_Generator_Advanced():
         Returns:
         - None
         """
-        other_figure(self, data, action_pairs, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
+        other_figure(self, layout, action_transitions, x_offsets, preferred_dict_inv, measures_in_pathways,
                      planning_horizon, ylabels, color, alpha)
         return self.figure
@@ -30,8 +30,8 @@ file_base = f'data/inputs/processed/{risk_owner_hazard}_optimized_base'
 # Design Choices
 line_choice = 'pathways_and_unique_lines'  # options: 'pathways', 'overlay', 'pathways_and_unique_lines'
 input_with_pathways = True  # True if input file contains pathway numbers
-optimize_marker_positions = False  # Specifies whether to optimize 'both', 'offset', or 'base_y' positions. Or False to not optimize
-num_iterations = 'all'  # options: number (int) to specify number of iterations for optimization or 'all' to consider all possible combinations for optimization
+optimize_marker_positions = False  # Specifies whether to optimize 'both', 'offset', or 'base_y' positions, or 'local_search' for large maps. Or False to not optimize
+num_iterations = 'all'  # options: number (int) to specify number of iterations for optimization or 'all' to consider all possible combinations for optimization (number of moves for 'local_search')
 ylabels = 'logos'  # options: 'logos', 'names', 'numbers'
 plot_type = 'matplotlib' # alternatives: 'plotly', 'matplotlib'
 
@@ -4,8 +4,6 @@ import matplotlib.pyplot as plt
 
 from adaptation_pathways.graph import (
     action_level_by_first_occurrence,
-    read_sequences,
-    read_tipping_points,
     sequence_graph_to_pathway_map,
     sequences_to_sequence_graph,
 )
@@ -52,19 +50,13 @@ filtering_conditions = {
     'Co-Benefits': ('between', ['----', '++'])
 }
 
-identifier = 'test'
+pg_sequences, tipping_points = generate_input_files(action_characterization, evaluation_keys, filtering_conditions,
+                                                   end_current_system=0, N=1000, m=3)
 
-generate_input_files(action_characterization, evaluation_keys, filtering_conditions,
-                     f'data/pathways_generator/sequences_{identifier}.txt',
-                     f'data/pathways_generator/xpositions_{identifier}.txt',
-                     0,1000,3 )
-
-pg_sequences = read_sequences('sequences.txt')
 sequence_graph = sequences_to_sequence_graph(pg_sequences)
 level_by_action = action_level_by_first_occurrence(pg_sequences)
 
 pathway_map = sequence_graph_to_pathway_map(sequence_graph)
-tipping_points = read_tipping_points('xpositions.txt', pathway_map.actions(),)
 
 pathway_map.assign_tipping_points(tipping_points)
 pathway_map.set_attribute("level", level_by_action)
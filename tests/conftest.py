@@ -0,0 +1,82 @@
+import os
+import random
+import shutil
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def make_generator():
+    """
+    Creates a Pathways_Generator_Advanced with the case study settings, without network cache unless requested.
+    """
+    from case_study_information import MEASURE_NUMBERS, INVERTED_MEASURE_NUMBERS, MEASURE_DICT
+    from PathwaysMaps._create_colors import MEASURE_COLORS, BASE_COLORS_SECTORS
+    from PathwaysMaps.pathways_generator_advanced import Pathways_Generator_Advanced
+
+    def make(line_choice='pathways_and_unique_lines', plot_type='matplotlib', renaming_dict=None, **parameters):
+        parameters.setdefault('network_cache_directory', None)
+        return Pathways_Generator_Advanced(MEASURE_COLORS, BASE_COLORS_SECTORS, INVERTED_MEASURE_NUMBERS, {},
+                                           line_choice, .48, {'annotations': 12, 'main': 12, 'title': 15},
+                                           {'width': 1300, 'height': 1000}, 2, 35, 2, .2, MEASURE_NUMBERS,
+                                           INVERTED_MEASURE_NUMBERS, MEASURE_DICT, renaming_dict or {'current': '0'}, True,
+                                           plot_type,
+                                           **parameters)
+    return make
+
+
+@pytest.fixture
+def case_study_inputs(tmp_path):
+    """
+    Copies the input files of a case study hazard into a temporary directory, so that tests do not write into data.
+    """
+    def copy(hazard):
+        files = {}
+        for name, source in [('sequences', f'data/inputs/all_sequences_{hazard}_Wp_average.txt'),
+                             ('tipping_points', f'data/inputs/all_tp_timings_{hazard}_Wp_average.txt'),
+                             ('offset', f'data/inputs/processed/{hazard}_optimized_offset.json'),
+                             ('base', f'data/inputs/processed/{hazard}_optimized_base.json')]:
+            files[name] = str(tmp_path / os.path.basename(source))
+            shutil.copy(os.path.join(REPOSITORY, source), files[name])
+        files['sequences_only'] = str(tmp_path / f'{hazard}_only_sequences.txt')
+        return files
+    return copy
+
+
+@pytest.fixture
+def random_characterization():
+    """
+    Creates random action characterizations with requirement rules, including rules that cannot be satisfied.
+    """
+    def make(seed, number_actions=5, rules=4, interactions=0):
+        rng = random.Random(seed)
+        actions = [f'Action {code}' for code in range(number_actions)]
+        characterization = {}
+        for action in actions:
+            characterization[action] = {
+                'effectiveness': rng.choice(['-', '0', '+', '++', '+++']),
+                'Costs': rng.choice([rng.randint(0, 100), float(rng.randint(0, 100)) / 4]),
+                'Co-Benefits': rng.choice(['--', '-', '0', '+', '++']),
+                'requirements_action': [],
+                'interactions_performance': [],
+            }
+        for _ in range(rules):
+            action = rng.choice(actions)
+            condition = rng.choice(['blocks', 'after', 'before', 'directly before', 'directly after'])
+            target = rng.choice(actions + ['Unknown'])
+            characterization[action]['requirements_action'].append((condition, target))
+        for _ in range(interactions):
+            action, target = rng.sample(actions, 2)
+            characterization[action]['interactions_performance'].append(rng.choice([
+                ('replaces', target),
+                ('increase', 'effectiveness', target, rng.randint(1, 20)),
+                ('decrease', 'effectiveness', target, f'{rng.randint(1, 50)}%'),
+                ('increases', 'Costs', target, f'{rng.randint(1, 50)}%', [0, rng.randint(1, 3)]),
+            ]))
+        return characterization
+    return make
@@ -0,0 +1,58 @@
+import itertools
+import random
+
+import pytest
+
+from PathwaysMaps._base_y_ordering import order_base_y_values, total_distance
+
+
+def random_problem(rng, large_offsets=False):
+    number_measures = rng.randint(1, 7)
+    measures = ['0'] + [str(measure) for measure in range(10, 10 + number_measures - 1)]
+    values = rng.sample(range(-5, 6), number_measures)
+    if rng.random() < 0.3:
+        values = [float(value) for value in values]
+    base_y_values = dict(zip(rng.sample(measures, number_measures), values))
+    pool = measures + ['99']  # Measures without base y-value are at 0
+    edges = [(rng.choice(pool), rng.choice(pool), rng.choice([0, .48, -.48, .24, -.96, .3]))
+             for _ in range(rng.randint(0, 15))]
+    if large_offsets:
+        edges.append((rng.choice(measures), rng.choice(measures), rng.choice([1.7, -2.5])))
+    return base_y_values, edges
+
+
+def brute_force_distance(base_y_values, edges):
+    # All permutations of the base y-values with the current situation on top, as create_optimized_positions did
+    top = max(base_y_values.values())
+    return min(total_distance(edges, dict(zip(base_y_values, permutation)))
+               for permutation in itertools.permutations(base_y_values.values())
+               if dict(zip(base_y_values, permutation))['0'] == top)
+
+
+def assert_valid_assignment(result, base_y_values):
+    assert list(result) == list(base_y_values)
+    assert sorted(result.values()) == sorted(base_y_values.values())
+    assert result['0'] == max(base_y_values.values())
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_exact_order_matches_brute_force(seed):
+    base_y_values, edges = random_problem(random.Random(seed))
+    result = order_base_y_values(base_y_values, edges)
+    assert_valid_assignment(result, base_y_values)
+    assert total_distance(edges, result) == pytest.approx(brute_force_distance(base_y_values, edges))
+
+
+@pytest.mark.parametrize('seed', range(50))
+@pytest.mark.parametrize('exact_limit', [0, 16])
+def test_swap_search_ends_in_a_local_minimum(seed, exact_limit):
+    base_y_values, edges = random_problem(random.Random(seed), large_offsets=True)
+    result = order_base_y_values(base_y_values, edges, exact_limit)
+    assert_valid_assignment(result, base_y_values)
+
+    # No swap of two measures below the current situation shortens the total distance
+    distance = total_distance(edges, result)
+    for first, second in itertools.combinations([measure for measure in result if measure != '0'], 2):
+        swapped = dict(result)
+        swapped[first], swapped[second] = result[second], result[first]
+        assert total_distance(edges, swapped) >= distance - 1e-9
@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+from adaptation_pathways.graph import read_sequences, read_tipping_points
+
+from PathwaysMaps._get_network_dicts import get_pathway_map
+from PathwaysMaps._input_cache import (
+    convert_input_files,
+    load_cache,
+    load_sequences_table,
+    parse_sequences_file,
+    parse_tipping_points_file,
+    select_lines,
+    table_to_sequences,
+    table_to_tipping_points,
+    write_cache,
+)
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HAZARDS = ['drought_agr', 'drought_shp', 'flood_agr', 'flood_urb']
+
+
+def names(sequences):
+    return [(first.name, first.edition, second.name, second.edition) for first, second in sequences]
+
+
+def by_name(tipping_points):
+    return {(action.name, action.edition): tipping_point for action, tipping_point in tipping_points.items()}
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    # Text input files of a hazard, with the pathways column removed for read_sequences
+    def copy(hazard):
+        sequences_file = tmp_path / f'all_sequences_{hazard}_Wp_average.txt'
+        tipping_points_file = tmp_path / f'all_tp_timings_{hazard}_Wp_average.txt'
+        shutil.copy(os.path.join(REPOSITORY, 'data', 'inputs', sequences_file.name), sequences_file)
+        shutil.copy(os.path.join(REPOSITORY, 'data', 'inputs', tipping_points_file.name), tipping_points_file)
+        pairs_file = tmp_path / f'{hazard}_pairs.txt'
+        pairs_file.write_text(''.join(' '.join(line.split()[:2]) + '\n'
+                                      for line in sequences_file.read_text().splitlines() if line.strip()))
+        return str(sequences_file), str(tipping_points_file), str(pairs_file)
+    return copy
+
+
+@pytest.mark.parametrize('hazard', HAZARDS)
+def test_tables_match_adaptation_pathways_readers(input_files, hazard):
+    sequences_file, tipping_points_file, pairs_file = input_files(hazard)
+    expected_sequences = read_sequences(pairs_file)
+    actions = [action for pair in expected_sequences for action in pair]
+
+    sequences = table_to_sequences(parse_sequences_file(sequences_file))
+    assert names(sequences) == names(expected_sequences)
+    # One Action object per name and edition, like read_sequences
+    assert len({id(action) for pair in sequences for action in pair}) == len(set(actions))
+    assert by_name(table_to_tipping_points(parse_tipping_points_file(tipping_points_file), actions)) == by_name(
+        read_tipping_points(tipping_points_file, actions))
+
+
+@pytest.mark.parametrize('hazard', HAZARDS)
+def test_pathway_map_from_cache_matches_text_files(input_files, hazard):
+    sequences_file, tipping_points_file, pairs_file = input_files(hazard)
+    text_map = get_pathway_map(pairs_file, tipping_points_file)
+
+    table = parse_sequences_file(sequences_file)
+    write_cache(pairs_file, select_lines(table, np.arange(len(table['from_actions']))))
+    write_cache(tipping_points_file, parse_tipping_points_file(tipping_points_file))
+    assert load_cache(pairs_file, 'from_actions') is not None
+    assert load_cache(tipping_points_file, 'tipping_actions') is not None
+    cached_map = get_pathway_map(pairs_file, tipping_points_file)
+
+    assert [repr(edge) for edge in cached_map.graph.edges] == [repr(edge) for edge in text_map.graph.edges]
+
+
+def test_stale_and_foreign_caches_are_ignored(input_files):
+    sequences_file, tipping_points_file, _ = input_files('flood_urb')
+    assert convert_input_files(os.path.dirname(sequences_file)) == sorted([sequences_file, tipping_points_file])
+    assert load_cache(sequences_file, 'tipping_actions') is None
+    np.testing.assert_equal(load_sequences_table(sequences_file), parse_sequences_file(sequences_file))
+
+    with open(sequences_file, 'a') as file:
+        file.write('current 99[0] 99\n')
+    assert load_cache(sequences_file, 'from_actions') is None
+    assert load_sequences_table(sequences_file)['actions'][-1] == '99[0]'
@@ -0,0 +1,73 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from PathwaysMaps._instance_dictionary import create_instance_dictionary
+from PathwaysMaps._network_records import ActionKey
+
+
+def old_instance_dictionary(self, actions, instance_dict, x_position_dict):
+    # The scan over all x-positions of a measure that create_instance_dictionary did before the InstanceAssigner
+    for key, value in actions.items():
+        if key.kind != 'End':
+            continue
+        measure, instance, x_position = key.measure, key.instance, value[0]
+        x_position_dict.setdefault(measure, {})
+        if self.line_choice in ('pathways_and_unique_lines', 'pathways'):
+            if measure not in instance_dict:
+                instance_dict[measure] = {}
+                x_position_dict[measure][x_position] = 1
+            elif instance not in instance_dict[measure]:
+                x_position_dict[measure][x_position] = max(x_position_dict[measure].values()) + 1
+        elif not any(np.isclose(x_pos, x_position, atol=0.1) for x_pos in x_position_dict[measure]):
+            if measure not in instance_dict:
+                instance_dict[measure] = {}
+                x_position_dict[measure][x_position] = 1
+            else:
+                x_position_dict[measure][x_position] = max(x_position_dict[measure].values()) + 1
+        if instance not in instance_dict[measure]:
+            instance_dict[measure][instance] = x_position_dict[measure][x_position]
+    return instance_dict, max((len(value) for value in instance_dict.values()), default=0), x_position_dict
+
+
+def random_actions(rng, number_actions):
+    years = [2030 + rng.random() * 60 for _ in range(6)]
+    actions = {}
+    for _ in range(number_actions):
+        x_position = rng.choice(years) + rng.choice([0, 0, 0.05, -0.05, 0.1, -0.1, 0.102, 0.3, rng.random()])
+        actions[ActionKey(rng.choice(['Begin', 'End', 'End']), str(rng.randint(0, 8)), str(rng.randint(0, 12)))] = \
+            [x_position, 0]
+    return actions
+
+
+@pytest.mark.parametrize('line_choice', ['overlay', 'pathways', 'pathways_and_unique_lines'])
+def test_assigner_matches_old_scan(line_choice):
+    rng = random.Random(line_choice)
+    generator = SimpleNamespace(line_choice=line_choice)
+    compared = 0
+    for _ in range(300):
+        first_actions, second_actions = random_actions(rng, rng.randint(1, 40)), random_actions(rng, rng.randint(1, 40))
+        try:
+            # Two calls, the second one continues with the dictionaries of the first like create_start_files does
+            expected = old_instance_dictionary(generator, first_actions, {}, {})
+            expected = old_instance_dictionary(generator, second_actions, expected[0], expected[2])
+        except KeyError:
+            continue  # The old scan failed on x-positions that were only approximately equal
+        result = create_instance_dictionary(generator, first_actions, {}, 0, {})
+        result = create_instance_dictionary(generator, second_actions, result[0], 0, result[2])
+        assert result[:2] == expected[:2]
+        assert {measure: list(positions.items()) for measure, positions in result[2].items()} == {
+            measure: list(positions.items()) for measure, positions in expected[2].items()}
+        compared += 1
+    assert compared > 100
+
+
+def test_overlay_reuses_numbers_of_close_x_positions():
+    generator = SimpleNamespace(line_choice='overlay')
+    actions = {ActionKey('End', '3', '0'): [2040.0, 0], ActionKey('End', '3', '1'): [2040.05, 0],
+               ActionKey('End', '3', '2'): [2055.0, 0]}
+    instance_dict, max_index, _ = create_instance_dictionary(generator, actions, {}, 0, {})
+    assert instance_dict == {'3': {'0': 1, '1': 1, '2': 2}}
+    assert max_index == 3
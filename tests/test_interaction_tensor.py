@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from Code_for_GenerationEvaluation.InteractionTensor import InteractionTensor
+
+EVALUATION_KEYS = ['effectiveness', 'Costs', 'Co-Benefits']
+
+
+def net_score(value):
+    return value.count('+') - value.count('-') if isinstance(value, str) else value
+
+
+def reference_changes(sequence, characterization):
+    # Applies the rules of every action in the sequence one by one
+    changes = [0] * len(EVALUATION_KEYS)
+    for source_position, source in enumerate(sequence):
+        for rule in characterization[source]['interactions_performance']:
+            for target_position, target in enumerate(sequence):
+                offset = target_position - source_position
+                if rule[0] == 'replaces':
+                    if target == rule[1] and offset < 0:
+                        changes[0] -= net_score(characterization[target]['effectiveness'])
+                    continue
+                kind, criterion, rule_target, amount = rule[:4]
+                low, high = rule[4] if len(rule) > 4 else (-np.inf, np.inf)
+                if target != rule_target or target == source or not low <= offset <= high:
+                    continue
+                sign = 1 if kind.startswith('increase') else -1
+                value = net_score(characterization[target][criterion])
+                change = value * float(amount[:-1]) / 100 if isinstance(amount, str) else amount
+                changes[EVALUATION_KEYS.index(criterion)] += sign * change
+    return changes
+
+
+def values_of(sequence, characterization):
+    return [[net_score(characterization[action][key]) for key in EVALUATION_KEYS] for action in sequence]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_sequence_modifiers_match_rule_by_rule_application(random_characterization, seed):
+    characterization = random_characterization(seed, interactions=8)
+    tensor = InteractionTensor(characterization, EVALUATION_KEYS)
+    for sequence in itertools.permutations(characterization, 4):
+        assert tensor.sequence_modifiers(sequence, values_of(sequence, characterization)) == pytest.approx(
+            reference_changes(sequence, characterization))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_vectorized_modifiers_match_sequence_modifiers(random_characterization, seed):
+    characterization = random_characterization(seed, interactions=8)
+    tensor = InteractionTensor(characterization, EVALUATION_KEYS)
+    actions = list(characterization)
+    sequences = [sequence for length in range(1, 5) for sequence in itertools.permutations(actions, length)]
+
+    # Sequences padded with the row of zeros after the last action
+    codes = np.full((len(sequences), 4), len(actions))
+    for row, sequence in enumerate(sequences):
+        codes[row, :len(sequence)] = [actions.index(action) for action in sequence]
+    score_matrix = np.zeros((len(actions) + 1, len(EVALUATION_KEYS)))
+    score_matrix[:-1] = values_of(actions, characterization)
+
+    changes, _ = tensor.modifiers(codes, score_matrix)
+    for sequence, change in zip(sequences, changes):
+        assert change == pytest.approx(tensor.sequence_modifiers(sequence, values_of(sequence, characterization)))
+
+
+def test_unknown_rule_raises():
+    with pytest.raises(ValueError):
+        InteractionTensor({'a': {'interactions_performance': [('doubles', 'b')]}, 'b': {}}, EVALUATION_KEYS)
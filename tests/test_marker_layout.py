@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pytest
+
+from PathwaysMaps._create_marker_dictionary import create_marker_dictionary, get_closest_instance
+from PathwaysMaps._pathway_index import find_pathways, index_pathways
+
+
+def old_marker_dictionary(generator, actions, base_y_values, instance_dict, y_offsets, measures_in_pathways,
+                          line_choice):
+    # The nested dicts create_marker_dictionary returned before the MarkerLayout
+    action_pairs = {}
+    data = {}
+    pathway_index = index_pathways(measures_in_pathways)
+    y_adjustment = 0
+    for key, value in actions.items():
+        measure, instance = key.measure, key.instance
+        base_y = base_y_values.get(measure, 0)
+        color = generator.measure_colors[str(measure)]
+        facecolor = 'w' if key.kind == 'End' else color
+        if (len(instance_dict[measure]) < 2 or all(value == 1 for value in instance_dict[measure].values())
+                or line_choice == 'overlay'):
+            y_adjustment = 0
+        else:
+            try:
+                y_adjustment = get_closest_instance(y_offsets, measure, instance)
+            except KeyError:
+                pass
+        value_adjusted = np.array([value[0], int(base_y) + y_adjustment])
+        pathways = find_pathways(pathway_index, f'{measure}' if measure == '0' else f'{measure}[{instance}]')
+        data.setdefault(measure, []).append((value_adjusted, 'o', color, facecolor, pathways))
+        action_pairs.setdefault((measure, instance), {})[key.kind] = value_adjusted
+    return action_pairs, data
+
+
+@pytest.mark.parametrize('hazard', ['drought_agr', 'drought_shp', 'flood_agr', 'flood_urb'])
+@pytest.mark.parametrize('line_choice', ['pathways_and_unique_lines', 'overlay'])
+def test_layout_matches_old_dictionaries(make_generator, case_study_inputs, hazard, line_choice):
+    files = case_study_inputs(hazard)
+    generator = make_generator(line_choice)
+    instance_dict, actions, _, _, _, measures_in_pathways, *_ = generator.create_start_files(
+        files['sequences'], files['sequences_only'], files['tipping_points'], {}, .7, [2020, 2120])
+    with open(files['base']) as file:
+        base_y_values = json.load(file)
+    with open(files['offset']) as file:
+        y_offsets = json.load(file)
+
+    layout = create_marker_dictionary(generator, actions, base_y_values, instance_dict, y_offsets,
+                                      measures_in_pathways, line_choice)
+    action_pairs, data = old_marker_dictionary(generator, actions, base_y_values, instance_dict, y_offsets,
+                                               measures_in_pathways, line_choice)
+
+    np.testing.assert_equal(layout.to_action_pairs(), action_pairs)
+    np.testing.assert_equal(layout.to_data(), data)
+    assert [(measure, instance) for measure, instance, *_ in layout.complete_segments()] == [
+        key for key, coords in action_pairs.items() if 'Begin' in coords and 'End' in coords]
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+
+from PathwaysMaps._network_cache import (NETWORK_CACHE_DIRECTORY, load_network_dicts, network_cache_key,
+                                         store_network_dicts)
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_default_directory_is_in_the_repository():
+    assert os.path.isabs(NETWORK_CACHE_DIRECTORY)
+    assert NETWORK_CACHE_DIRECTORY == os.path.join(REPOSITORY, 'data', 'cache', 'network_dicts')
+
+
+def test_key_depends_on_file_content_and_parameters(tmp_path):
+    input_file = tmp_path / 'sequences.txt'
+    input_file.write_text('current a[1]\n')
+    key = network_cache_key([str(input_file)], [{}, 0.7])
+    assert network_cache_key([str(input_file)], [{}, 0.7]) == key
+    assert network_cache_key([str(input_file)], [{}, 0.5]) != key
+    input_file.write_text('current b[1]\n')
+    assert network_cache_key([str(input_file)], [{}, 0.7]) != key
+
+
+def test_store_load_and_evict(tmp_path):
+    cache_directory = str(tmp_path / 'cache')
+    assert load_network_dicts(cache_directory, 'missing') is None
+    store_network_dicts(cache_directory, 'first', {'value': 'x' * 1000})
+    assert load_network_dicts(cache_directory, 'first') == {'value': 'x' * 1000}
+
+    # The least recently used entry is removed when the cache exceeds its size
+    os.utime(os.path.join(cache_directory, 'first.pkl'), ns=(0, 0))
+    store_network_dicts(cache_directory, 'second', {'value': 'y' * 1000}, max_bytes=1500)
+    assert load_network_dicts(cache_directory, 'first') is None
+    assert load_network_dicts(cache_directory, 'second') == {'value': 'y' * 1000}
+
+
+def test_get_network_dicts_from_cache_matches_build(tmp_path, make_generator, case_study_inputs):
+    from PathwaysMaps._get_network_dicts import build_network_dicts, get_network_dicts
+
+    files = case_study_inputs('flood_agr')
+    arguments = (files['sequences'], files['sequences_only'], files['tipping_points'], .7, [2020, 2120], False, False)
+    expected = build_network_dicts(make_generator(), *arguments)
+
+    generator = make_generator(network_cache_directory=str(tmp_path / 'cache'))
+    np.testing.assert_equal(get_network_dicts(generator, *arguments), expected)  # Built and stored
+    os.remove(files['sequences_only'])
+    np.testing.assert_equal(get_network_dicts(generator, *arguments), expected)  # Loaded from the cache
+    assert os.path.exists(files['sequences_only'])  # The sequences only file is restored
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from adaptation_pathways.plot.pathway_map.classic import _layout as pathway_layout
+
+from PathwaysMaps._get_network_dicts import get_pathway_map
+from PathwaysMaps._network_records import action_key_from_node, transition_from_edge
+from PathwaysMaps._renamer import get_renamer
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HAZARDS = ['drought_agr', 'drought_shp', 'flood_agr', 'flood_urb']
+
+
+@pytest.fixture
+def pathway_map(tmp_path):
+    # Pathway map of a case study hazard, read from the sequences without the pathways column
+    def read(hazard):
+        inputs = os.path.join(REPOSITORY, 'data', 'inputs')
+        pairs_file = tmp_path / f'{hazard}_pairs.txt'
+        with open(os.path.join(inputs, f'all_sequences_{hazard}_Wp_average.txt')) as file:
+            pairs_file.write_text(''.join(' '.join(line.split()[:2]) + '\n' for line in file if line.strip()))
+        return get_pathway_map(str(pairs_file), os.path.join(inputs, f'all_tp_timings_{hazard}_Wp_average.txt'))
+    return read
+
+
+def clean_list(lst):
+    # Parsing of the repr of an edge, as get_network_dicts did before the transition records
+    cleaned_list = []
+    for item in lst:
+        cleaned_item = item.replace('"', "").replace(")", "").replace("((", "")
+        if cleaned_item.strip().isdigit():
+            cleaned_list.append(int(cleaned_item.strip()))
+        else:
+            cleaned_list.append(cleaned_item.strip())
+    return cleaned_list
+
+
+def old_edge(edge_item):
+    return clean_list(repr(edge_item).replace('((', '').replace('), {})', '').split(','))
+
+
+@pytest.mark.parametrize('hazard', HAZARDS)
+def test_transitions_match_parsed_edges(pathway_map, hazard):
+    pathway_map = pathway_map(hazard)
+    measure_names = {action.name: action.name for action in pathway_map.actions()}
+    for edge_item in pathway_map.graph.edges.items():
+        transition = transition_from_edge(*edge_item[0], measure_names)
+        start = f'{transition.from_measure}[{transition.from_instance}]'
+        end = f'{transition.to_measure}[{transition.to_instance}]'
+        if transition.vertical:
+            expected = [f'ActionEnd({start}', transition.year, f'ActionBegin({end}']
+        else:
+            expected = [f'ActionBegin({start}', f'ActionEnd({end}', transition.year]
+        assert old_edge(edge_item) == expected
+
+
+def test_transitions_use_renamed_measures(pathway_map):
+    pathway_map = pathway_map('drought_shp')
+    measure_names = {action.name: f'renamed {action.name}' for action in pathway_map.actions()}
+    for begin, end in pathway_map.graph.edges:
+        transition = transition_from_edge(begin, end, measure_names)
+        assert (transition.from_measure, transition.to_measure) == (measure_names[begin.action.name],
+                                                                    measure_names[end.action.name])
+        assert (transition.from_instance, transition.to_instance) == (str(begin.action.edition),
+                                                                      str(end.action.edition))
+
+
+def old_action_key(renamed_repr):
+    # Parsing of the renamed repr of a layout node, as the marker dictionaries did before the ActionKey records
+    parts = renamed_repr.split('[')
+    return ("Begin" if "Begin" in renamed_repr else "End"), parts[0].split('(')[1][1:], parts[1].split(']')[0]
+
+
+@pytest.mark.parametrize('hazard', HAZARDS)
+def test_action_keys_match_parsed_layout_keys(pathway_map, hazard):
+    pathway_map = pathway_map(hazard)
+    renamer = get_renamer({'current': '0'})
+    measure_names = {action.name: renamer.rename(action.name) for action in pathway_map.actions()}
+    layout = pathway_layout(pathway_map)
+
+    for node in layout:
+        assert tuple(action_key_from_node(node, measure_names)) == old_action_key(renamer.rename(repr(node)))
+
+    # Base y-values of the measures, read from the str keys of the layout before
+    old_base_y_values = renamer.rename_dict_keys({str(node)[1:]: value[1] for node, value in layout.items()
+                                                  if str(node).startswith('[')})
+    base_y_values = {}
+    for node, value in layout.items():
+        key = action_key_from_node(node, measure_names)
+        if key.kind == 'Begin':
+            base_y_values[key.measure] = value[1]
+    assert base_y_values == old_base_y_values
@@ -0,0 +1,38 @@
+import json
+import random
+
+import pytest
+
+from PathwaysMaps._optimize_positions import vertical_distance
+
+
+def optimize(generator, files, num_iterations, optimize_position, **parameters):
+    instance_dict, actions, action_transitions, base_y_values, _, _, max_instance, base_y_offsets, _ = \
+        generator.create_start_files(files['sequences'], files['sequences_only'], files['tipping_points'], {}, .7,
+                                     [2020, 2120])
+    file_offset, file_base = files['offset'][:-len('.json')], files['base'][:-len('.json')]
+    generator.optimize_positions(instance_dict, actions, action_transitions, base_y_values, max_instance,
+                                 base_y_offsets, .48, file_offset, file_base, num_iterations, optimize_position,
+                                 **parameters)
+    with open(files['base']) as file:
+        base = json.load(file)
+    with open(files['offset']) as file:
+        offset = json.load(file)
+    return base, offset, vertical_distance(actions, action_transitions, base, offset)
+
+
+@pytest.mark.parametrize('hazard', ['drought_shp', 'flood_urb'])
+def test_local_search_is_reproducible(make_generator, case_study_inputs, hazard):
+    results = []
+    for _ in range(2):
+        random.seed()  # The local search must not depend on the global random state
+        results.append(optimize(make_generator(), case_study_inputs(hazard), 500, 'local_search', seed=3))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize('hazard', ['drought_shp', 'flood_urb'])
+def test_local_search_not_worse_than_capped_search(make_generator, case_study_inputs, hazard):
+    random.seed(0)  # all_possible_offsets samples the offset permutations
+    *_, capped_distance = optimize(make_generator(), case_study_inputs(hazard), 20, 'both')
+    *_, local_distance = optimize(make_generator(), case_study_inputs(hazard), 'all', 'local_search')
+    assert local_distance <= capped_distance + 1e-9
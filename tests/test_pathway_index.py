@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from PathwaysMaps._pathway_index import find_pathways, index_pathways, pathways_with_measure_instance
+
+
+def random_measures_in_pathways(seed):
+    rng = random.Random(seed)
+    measures = ['0', '0[0]'] + [f'{measure}[{instance}]' for measure in range(1, 6) for instance in range(3)]
+    return {str(pathway): rng.sample(measures, rng.randint(1, 8)) + rng.choice([[], ['0']])
+            for pathway in rng.sample(range(1, 40), 12)}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_index_matches_scan_of_all_pathways(seed):
+    measures_in_pathways = random_measures_in_pathways(seed)
+    pathway_index = index_pathways(measures_in_pathways)
+
+    for measure in ['0'] + [str(measure) for measure in range(1, 7)]:
+        for instance in range(4):
+            # The scans of the plotting functions before the inverted index
+            expected = [key for key, array in measures_in_pathways.items()
+                        if f'{measure}[{instance}]' in array or (measure == '0' and f'{measure}' in array)]
+            assert pathways_with_measure_instance(pathway_index, measure, str(instance)) == expected
+            assert find_pathways(pathway_index, f'{measure}[{instance}]') == [
+                key for key, array in measures_in_pathways.items() if f'{measure}[{instance}]' in array]
+
+
+def test_find_pathways_of_several_entries_keeps_the_pathway_order():
+    pathway_index = index_pathways({'7': ['1[0]', '2[0]'], '3': ['2[1]'], '5': ['1[0]']})
+    assert find_pathways(pathway_index, '2[1]', '1[0]', '9[0]') == ['7', '3', '5']
+    assert find_pathways(pathway_index, '9[0]') == []
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from PathwaysMaps._get_network_dicts import get_sequences_only, index_lines
+from PathwaysMaps._renamer import get_renamer
+
+HAZARDS = ['drought_agr', 'drought_shp', 'flood_agr', 'flood_urb']
+
+
+def scan_lines(input_file, renaming_dict, sector_pathway):
+    # Measures of every pathway and the selected lines, found by scanning all lines for every pathway
+    with open(input_file) as file:
+        rows = [line.split() for line in file if line.strip()]
+    renamer = get_renamer(renaming_dict)
+    pathway_names = {pathway for columns in rows for pathway in columns[2].split(';')}
+    unique_pathways = ([str(int(sector_pathway))] if sector_pathway else
+                       [renaming_dict.get(name, name) for name in pathway_names])
+
+    measures_in_pathways = {}
+    for pathway in unique_pathways:
+        measures = set()
+        for columns in rows:
+            if int(pathway) in [int(renaming_dict.get(name, name)) for name in columns[2].split(';')]:
+                measures.update(renamer.rename_action(name) for name in columns[:2])
+        measures_in_pathways[renamer.rename(pathway)] = measures
+
+    if sector_pathway:
+        original_name = next(key for key, value in renaming_dict.items() if value == str(int(sector_pathway)))
+        rows = [columns for columns in rows if original_name in columns[2].split(';')]
+    return measures_in_pathways, [' '.join(columns[:2]) for columns in rows]
+
+
+@pytest.mark.parametrize('hazard', HAZARDS)
+@pytest.mark.parametrize('renaming_dict, sector_pathway', [
+    ({}, None),
+    ({'current': '0', '1': '3', '3': '1', '6': '60'}, None),
+    ({'current': '0', '1': '3', '3': '1'}, 3),
+    ({'5': '2'}, 2),
+])
+def test_index_matches_line_scan(case_study_inputs, hazard, renaming_dict, sector_pathway):
+    files = case_study_inputs(hazard)
+    measures_in_pathways = get_sequences_only(files['sequences'], files['sequences_only'], renaming_dict,
+                                              sector_pathway, False)
+    expected_measures, expected_lines = scan_lines(files['sequences'], renaming_dict, sector_pathway)
+
+    assert {pathway: set(measures) for pathway, measures in measures_in_pathways.items()} == expected_measures
+    assert all(len(measures) == len(set(measures)) for measures in measures_in_pathways.values())
+    with open(files['sequences_only']) as file:
+        assert file.read().splitlines() == expected_lines
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_index_lines_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 8, 200)
+    entry_lines = np.sort(rng.integers(0, 50, 200))
+    expected = {key: sorted({line for entry_key, line in zip(keys.tolist(), entry_lines.tolist()) if entry_key == key})
+                for key in set(keys.tolist())}
+    assert {key: lines.tolist() for key, lines in index_lines(keys, entry_lines).items()} == expected
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+from adaptation_pathways.graph import read_sequences, read_tipping_points
+
+from Code_for_GenerationEvaluation.PathwaysInputGenerator import PathwaysInputGenerator
+from Code_for_GenerationEvaluation.Scenario import ScenarioEnsemble
+from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+from Code_for_GenerationEvaluation.generate_input_files import generate_input_files
+
+ACTION_CHARACTERIZATION = {
+    'Sea Wall': {'effectiveness': '++', 'Costs': 90, 'Co-Benefits': '-'},
+    'Pump': {'effectiveness': '+', 'Costs': 45, 'Co-Benefits': '--'},
+    'Dike': {'effectiveness': '++', 'Costs': 60, 'Co-Benefits': '0'},
+    'Salt Marshes': {'effectiveness': '+', 'Costs': 80, 'Co-Benefits': '++'},
+}
+EVALUATION_KEYS = ['effectiveness', 'Costs', 'Co-Benefits']
+
+
+def by_name(tipping_points):
+    return {(action.name, action.edition): tipping_point for action, tipping_point in tipping_points.items()}
+
+
+def test_in_memory_inputs_match_files(tmp_path):
+    sequence_file, xposition_file = tmp_path / 'sequences.txt', tmp_path / 'xpositions.txt'
+    sequences, tipping_points = generate_input_files(ACTION_CHARACTERIZATION, EVALUATION_KEYS, {}, str(sequence_file),
+                                                     str(xposition_file), 2020, N=20, m=3, seed=1, write_files=True)
+
+    file_sequences = read_sequences(str(sequence_file))
+    file_tipping_points = read_tipping_points(str(xposition_file), [action for pair in file_sequences for action in pair])
+    assert ([(first.name, first.edition, second.name, second.edition) for first, second in sequences]
+            == [(first.name, first.edition, second.name, second.edition) for first, second in file_sequences])
+    assert by_name(tipping_points) == by_name(file_tipping_points)
+
+
+def test_files_are_only_written_on_request(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scenario = {2020: 0, 2050: 2, 2100: 10}
+    _, tipping_points = generate_input_files(ACTION_CHARACTERIZATION, EVALUATION_KEYS, {}, N=20, m=3, seed=1,
+                                             scenario=scenario)
+    assert list(tmp_path.iterdir()) == []
+    assert all(isinstance(tipping_point, int) for tipping_point in tipping_points.values())
+
+
+def reference_input_lines(sequences, characterization, end_current_system):
+    # Instances keyed by the preceding actions, as before the prefix trie
+    instances = {}
+    for sequence in sequences:
+        for idx, action in enumerate(sequence):
+            instances.setdefault(action, {})[sequence[:idx]] = PathwaysInputGenerator.aggregate_effectiveness(
+                sequence, characterization, idx)
+
+    xposition_lines = [f"current {end_current_system}"]
+    for action, preconditions in instances.items():
+        for idx, value in enumerate(preconditions.values()):
+            value = PathwaysInputGenerator.translate_effectiveness_to_int(value) + end_current_system
+            xposition_lines.append(f"{action.replace(' ', '')}[{idx}] {value}")
+
+    def key(sequence, i):
+        return f"{sequence[i].replace(' ', '')}[{list(instances[sequence[i]]).index(sequence[:i])}]"
+
+    sequence_lines = []
+    for sequence in sequences:
+        for i in range(len(sequence) - 1):
+            if i == 0:
+                sequence_lines.append(f"current {key(sequence, 0)}")
+            sequence_lines.append(f"{key(sequence, i)} {key(sequence, i + 1)}")
+    return sequence_lines, xposition_lines
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('numeric', [False, True])
+def test_trie_files_match_reference(random_characterization, tmp_path, seed, numeric):
+    characterization = random_characterization(seed, number_actions=5, rules=seed % 4)
+    if numeric:
+        for details in characterization.values():
+            details['effectiveness'] = PathwaysInputGenerator.translate_effectiveness_to_int(
+                details['effectiveness']) * 0.5
+    sequences = list(SequenceGenerator(characterization, 0, 4).iter_valid_sequences())
+    random.Random(seed).shuffle(sequences)
+
+    sequence_file, xposition_file = tmp_path / 'sequences.txt', tmp_path / 'xpositions.txt'
+    PathwaysInputGenerator(sequences, characterization).generate_input_files(str(sequence_file), str(xposition_file),
+                                                                            2020, write_files=True)
+    assert (sequence_file.read_text().splitlines(), xposition_file.read_text().splitlines()) == \
+        reference_input_lines(sequences, characterization, 2020)
+
+
+def test_ensemble_inputs_match_single_scenarios():
+    scenarios = {'dry': {2020: 0, 2060: 3, 2100: 6}, 'wet': {2020: 0, 2060: 5, 2100: 8}}
+    sequences = list(SequenceGenerator(ACTION_CHARACTERIZATION, 0, 3).iter_valid_sequences())
+    _, ensemble_tipping_points = PathwaysInputGenerator(
+        sequences, ACTION_CHARACTERIZATION, ScenarioEnsemble.from_scenarios(scenarios)).generate_input_files()
+
+    assert set(ensemble_tipping_points) == {'dry', 'wet', 'p5', 'p50', 'p95'}
+    for member, scenario in scenarios.items():
+        _, tipping_points = PathwaysInputGenerator(sequences, ACTION_CHARACTERIZATION, scenario).generate_input_files()
+        assert by_name(ensemble_tipping_points[member]) == by_name(tipping_points)
+
+
+@pytest.mark.parametrize('interactions', [False, True])
+def test_actions_without_effectiveness_are_ignored(interactions):
+    characterization = {'A': {'effectiveness': '+'}, 'B': {'Costs': 3}}
+    generator = PathwaysInputGenerator([('A',)], characterization, interactions=interactions)
+    generator.build_trie()
+    assert generator.instances == {'A': ['+']}
@@ -0,0 +1,39 @@
+from PathwaysMaps._get_network_dicts import build_network_dicts
+from PathwaysMaps._renamer import Renamer
+
+
+def sequential_replace(string, replacements):
+    # The renaming before the compiled Renamer
+    for old, new in replacements.items():
+        string = string.replace(old, new)
+    return string
+
+
+def test_renamer_matches_sequential_replacement():
+    replacements = {'current': '0', 'f_dike': 'dike', 'pump': 'p'}
+    for string in ['current', 'f_dike[2]', 'pump_current', 'other']:
+        assert Renamer(replacements).rename(string) == sequential_replace(string, replacements)
+
+
+def test_renamer_prefers_longest_name():
+    assert Renamer({'1': 'a', '10': 'b'}).rename('10 1') == 'b a'
+    assert Renamer({'10': 'b', '1': 'a'}).rename('10 1') == 'b a'
+
+
+def test_rename_action_keeps_instance():
+    renamer = Renamer({'2': '12', 'current': '0'})
+    assert renamer.rename_action('2[2]') == '12[2]'
+    assert renamer.rename_action('current') == '0'
+
+
+def test_measures_in_pathways_match_layout(make_generator, case_study_inputs):
+    # A renaming that also matches instances must only rename the measures, as for the nodes of the layout
+    files = case_study_inputs('flood_agr')
+    generator = make_generator(renaming_dict={'current': '0', '2': '12'})
+    actions, _, _, _, measures_in_pathways, _ = build_network_dicts(
+        generator, files['sequences'], files['sequences_only'], files['tipping_points'], .7, [2020, 2120], False, False)
+    layout_actions = {(key.measure, key.instance) for key in actions}
+    for measures in measures_in_pathways.values():
+        for measure in measures:
+            name, _, instance = measure.replace(']', '').partition('[')
+            assert (name, instance or '0') in layout_actions
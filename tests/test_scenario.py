@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from Code_for_GenerationEvaluation.Scenario import Scenario, ScenarioEnsemble
+
+
+def reference_time(effectiveness_value, scenario):
+    # Interpolation of a single value, as PathwaysInputGenerator.interpolate_time did before the compiled scenarios
+    effectiveness_values = np.array(list(scenario.values()))
+    times = np.array(list(scenario.keys()))
+    if effectiveness_value in effectiveness_values:
+        return times[list(effectiveness_values).index(effectiveness_value)]
+    idx = np.searchsorted(effectiveness_values, effectiveness_value)
+    lower_eff, upper_eff = effectiveness_values[idx - 1], effectiveness_values[idx]
+    lower_time, upper_time = times[idx - 1], times[idx]
+    return lower_time + (upper_time - lower_time) * ((effectiveness_value - lower_eff) / (upper_eff - lower_eff))
+
+
+def random_scenario(rng, increasing=True):
+    times = sorted(rng.sample(range(2000, 2200), 8))
+    values = np.cumsum([rng.uniform(0.1, 3) for _ in times]).tolist()
+    return dict(zip(times, values if increasing else values[::-1]))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_interpolation_matches_scalar_reference(seed):
+    rng = random.Random(seed)
+    scenario = random_scenario(rng)
+    values = list(scenario.values())
+    queries = values + [rng.uniform(values[0], values[-1]) for _ in range(50)]
+    expected = [reference_time(value, scenario) for value in queries]
+    assert Scenario(scenario).interpolate(queries) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_decreasing_scenario_matches_np_interp(seed):
+    rng = random.Random(seed)
+    scenario = random_scenario(rng, increasing=False)
+    values = list(scenario.values())
+    queries = [rng.uniform(values[-1], values[0]) for _ in range(50)] + values
+    expected = np.interp(queries, values[::-1], list(scenario)[::-1])
+    assert Scenario(scenario).interpolate(queries) == pytest.approx(expected)
+
+
+def test_strings_are_counted_as_net_score():
+    scenario = Scenario({2020: -1, 2050: 2, 2100: 4})
+    assert scenario.interpolate(['+', '++++', '-', '0']).tolist() == pytest.approx([2040, 2100, 2020, 2030])
+
+
+def test_out_of_range_and_non_monotone_scenarios_raise():
+    with pytest.raises(ValueError):
+        Scenario({2020: 0, 2050: 2}).interpolate([3])
+    with pytest.raises(ValueError):
+        Scenario({2020: 0, 2050: 2, 2100: 1})
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_ensemble_members_match_single_scenarios(seed):
+    rng = random.Random(seed)
+    times = sorted(rng.sample(range(2000, 2200), 6))
+    scenarios = {}
+    for member in range(5):
+        values = np.cumsum([rng.uniform(0.1, 3) for _ in times]).tolist()
+        scenarios[f'member {member}'] = dict(zip(times, values if rng.random() < 0.7 else values[::-1]))
+    low = max(min(scenario.values()) for scenario in scenarios.values())
+    high = min(max(scenario.values()) for scenario in scenarios.values())
+    queries = [rng.uniform(low, high) for _ in range(40)] + [low, high]
+
+    ensemble = ScenarioEnsemble.from_scenarios(scenarios)
+    member_times = ensemble.interpolate(queries)
+    assert ensemble.members == list(scenarios)
+    for times_of_member, scenario in zip(member_times, scenarios.values()):
+        assert times_of_member == pytest.approx(Scenario(scenario).interpolate(queries))
+    assert ensemble.percentiles(member_times, (5, 50, 95)) == pytest.approx(
+        np.percentile([Scenario(scenario).interpolate(queries) for scenario in scenarios.values()], (5, 50, 95),
+                      axis=0))
+
+
+def test_ensemble_reports_members_out_of_range():
+    ensemble = ScenarioEnsemble([2020, 2050], [[0, 2], [0, 4]], members=['low', 'high'])
+    with pytest.raises(ValueError, match='low'):
+        ensemble.interpolate([3])
@@ -0,0 +1,71 @@
+import itertools
+
+import pytest
+
+from Code_for_GenerationEvaluation.SequenceEvaluator import SequenceEvaluator
+
+EVALUATION_KEYS = ['effectiveness', 'Costs', 'Co-Benefits']
+
+
+def all_sequences(characterization, m=3):
+    return [sequence for length in range(1, m + 1) for sequence in itertools.permutations(characterization, length)]
+
+
+def assert_same_performance(performance, expected):
+    assert list(performance) == list(expected)
+    for sequence, evaluation in expected.items():
+        for key, value in evaluation.items():
+            assert type(performance[sequence][key]) is type(value)
+            assert performance[sequence][key] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_numpy_backend_matches_python_backend(random_characterization, seed):
+    characterization = random_characterization(seed)
+    evaluator = SequenceEvaluator(all_sequences(characterization), characterization, EVALUATION_KEYS)
+    assert_same_performance(evaluator.evaluate_all_sequences(backend='numpy'),
+                            evaluator.evaluate_all_sequences(backend='python'))
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_inconsistent_types_raise(backend):
+    characterization = {'a': {'Costs': '+'}, 'b': {'Costs': 10}}
+    with pytest.raises(ValueError):
+        SequenceEvaluator([('a', 'b')], characterization, ['Costs']).evaluate_all_sequences(backend=backend)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_memoized_backend_matches_python_backend(random_characterization, seed):
+    characterization = random_characterization(seed)
+    sequences = all_sequences(characterization)
+    evaluator = SequenceEvaluator(sequences, characterization, EVALUATION_KEYS)
+    assert_same_performance(evaluator.evaluate_all_sequences(backend='memoized'),
+                            evaluator.evaluate_all_sequences(backend='python'))
+    # Every set of actions is evaluated once
+    assert evaluator.cache.misses == len({frozenset(sequence) for sequence in sequences})
+    assert evaluator.cache.hits == len(sequences) - evaluator.cache.misses
+
+
+def test_memoized_backend_keeps_order_with_interactions(random_characterization):
+    characterization = random_characterization(2, interactions=6)
+    sequences = all_sequences(characterization)
+    evaluator = SequenceEvaluator(sequences, characterization, EVALUATION_KEYS, interactions=True)
+    assert_same_performance(evaluator.evaluate_all_sequences(backend='memoized'),
+                            evaluator.evaluate_all_sequences(backend='python'))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_numpy_backend_matches_python_backend_with_interactions(random_characterization, seed):
+    characterization = random_characterization(seed, interactions=6)
+    evaluator = SequenceEvaluator(all_sequences(characterization), characterization, EVALUATION_KEYS,
+                                  interactions=True)
+    assert_same_performance(evaluator.evaluate_all_sequences(backend='numpy'),
+                            evaluator.evaluate_all_sequences(backend='python'))
+
+
+def test_interactions_without_rules_keep_the_evaluation(random_characterization):
+    characterization = random_characterization(3)
+    sequences = all_sequences(characterization)
+    assert_same_performance(
+        SequenceEvaluator(sequences, characterization, EVALUATION_KEYS, interactions=True).evaluate_all_sequences(),
+        SequenceEvaluator(sequences, characterization, EVALUATION_KEYS).evaluate_all_sequences())
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import Code_for_GenerationEvaluation.SequenceFilter as sequence_filter
+from Code_for_GenerationEvaluation.SequenceFilter import SequenceFilter, non_dominated_sort
+
+
+def brute_force_ranks(points):
+    # A point is ranked after all the points that dominate it
+    ranks = np.zeros(len(points), dtype=int)
+    for index in np.lexsort(points.T[::-1]):
+        dominators = (points <= points[index]).all(axis=1) & (points < points[index]).any(axis=1)
+        ranks[index] = ranks[dominators].max(initial=-1) + 1
+    return ranks
+
+
+@pytest.mark.parametrize('objectives', [2, 3, 4])
+@pytest.mark.parametrize('thresholds', [(1, 1), (32, 4096)])
+def test_non_dominated_sort_matches_brute_force(monkeypatch, objectives, thresholds):
+    # Small thresholds force the divide-and-conquer recursion and the sweeps also on small inputs
+    monkeypatch.setattr(sequence_filter, 'SMALL_SUBSET', thresholds[0])
+    monkeypatch.setattr(sequence_filter, 'SMALL_PAIRS', thresholds[1])
+    rng = np.random.default_rng(objectives)
+    for trial in range(30):
+        size = int(rng.integers(1, 300))
+        if trial % 2:
+            points = rng.integers(0, rng.integers(2, 12), (size, objectives)).astype(float)  # Many ties
+        else:
+            points = rng.random((size, objectives))
+        expected = brute_force_ranks(points)
+        np.testing.assert_array_equal(non_dominated_sort(points), expected)
+        np.testing.assert_array_equal(non_dominated_sort(points, first_front_only=True),
+                                      np.where(expected == 0, 0, -1))
+
+
+def test_pareto_front_directions():
+    performance = {
+        'a': {'cost': 1, 'benefit': '+'},
+        'b': {'cost': 2, 'benefit': '++'},
+        'c': {'cost': 2, 'benefit': '+'},
+        'd': {'cost': 3, 'benefit': '-'},
+    }
+    sequence_filter_instance = SequenceFilter(performance, {})
+    assert list(sequence_filter_instance.pareto_front({'cost': 'minimize', 'benefit': 'maximize'})) == ['a', 'b']
+    fronts = sequence_filter_instance.pareto_front({'cost': 'minimize', 'benefit': 'maximize'}, ranked=True)
+    assert [list(front) for front in fronts] == [['a', 'b'], ['c'], ['d']]
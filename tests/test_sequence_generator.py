@@ -0,0 +1,57 @@
+import itertools
+
+import pytest
+
+from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+
+
+def exhaustive_valid_sequences(generator):
+    # All permutations filtered by the rules, as before the backtracking engine
+    return [sequence for length in range(1, generator.m + 1)
+            for sequence in itertools.permutations(generator.actions, length) if generator.is_valid_sequence(sequence)]
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_backtracking_matches_exhaustive_filtering(random_characterization, seed):
+    generator = SequenceGenerator(random_characterization(seed, number_actions=5, rules=seed % 7), 10, 4)
+    assert list(generator.iter_valid_sequences()) == exhaustive_valid_sequences(generator)
+
+
+def test_streaming_samples_valid_sequences(random_characterization):
+    characterization = random_characterization(1, number_actions=5, rules=3)
+    valid = set(SequenceGenerator(characterization, 0, 3).iter_valid_sequences())
+
+    sample = SequenceGenerator(characterization, 10, 3, seed=5).generate_filtered_sequences(streaming=True)
+    assert len(sample) == 10 and len(set(sample)) == 10 and set(sample) <= valid
+    assert sample == SequenceGenerator(characterization, 10, 3, seed=5).generate_filtered_sequences(streaming=True)
+
+    everything = SequenceGenerator(characterization, len(valid) + 5, 3).generate_filtered_sequences(streaming=True)
+    assert sorted(everything) == sorted(valid)
+
+
+def test_reservoir_sample_is_uniform():
+    # Every element of the stream is selected with probability N / length
+    counts = [0] * 20
+    for seed in range(4000):
+        for element in SequenceGenerator({}, 5, 1, seed=seed).reservoir_sample(range(20)):
+            counts[element] += 1
+    assert all(abs(count - 1000) < 150 for count in counts)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sharded_enumeration_matches_single_process(random_characterization, seed):
+    generator = SequenceGenerator(random_characterization(seed, number_actions=5, rules=3), 10, 4)
+    assert list(generator.iter_parallel_sequences(2)) == list(generator.iter_valid_sequences())
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_pruning_with_filtering_conditions_matches_exhaustive_filtering(random_characterization, seed):
+    characterization = random_characterization(seed, number_actions=5, rules=seed % 4)
+    conditions = [
+        {'Costs': ('below', 120)},
+        {'Costs': ('between', [30, 150]), 'effectiveness': ('above', '+')},
+        {'Co-Benefits': ('between', ['-', '++'])},
+        {'effectiveness': ('below', '+++'), 'Costs': ('above', 20)},
+    ][seed % 4]
+    generator = SequenceGenerator(characterization, 10, 4, filtering_conditions=conditions)
+    assert list(generator.iter_valid_sequences()) == list(generator.iter_filtered_combinations())
@@ -0,0 +1,86 @@
+import itertools
+
+import pytest
+
+from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+from Code_for_GenerationEvaluation.SequenceSearch import SequenceSearch
+from Code_for_GenerationEvaluation.generate_input_files import generate_input_files
+
+EVALUATION_KEYS = ['effectiveness', 'Costs', 'Co-Benefits']
+WEIGHTS = {'effectiveness': 10, 'Costs': -0.1, 'Co-Benefits': 2}
+
+
+def weighted_score(sequence, characterization):
+    score = 0
+    for key in EVALUATION_KEYS:
+        for action in sequence:
+            value = characterization[action][key]
+            if isinstance(value, str):
+                value = value.count('+') - value.count('-')
+            score += WEIGHTS[key] * value
+    return score
+
+
+def brute_force_scores(characterization, m, filtering_conditions=None):
+    # Scores of all valid sequences that meet the filtering conditions
+    generator = SequenceGenerator(characterization, 0, m, filtering_conditions=filtering_conditions)
+    sequences = [sequence for length in range(1, m + 1)
+                 for sequence in itertools.permutations(characterization, length)
+                 if generator.is_valid_sequence(sequence)
+                 and (not filtering_conditions or generator.meets_filtering_conditions(sequence))]
+    return {sequence: weighted_score(sequence, characterization) for sequence in sequences}
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('filtering_conditions', [None, {'Costs': ('below', 120)}])
+def test_search_matches_brute_force(random_characterization, seed, filtering_conditions):
+    characterization = random_characterization(seed, number_actions=5, rules=seed % 6)
+    scores = brute_force_scores(characterization, 3, filtering_conditions)
+    k = 7
+
+    found = SequenceSearch(characterization, EVALUATION_KEYS, 3, weights=WEIGHTS,
+                           filtering_conditions=filtering_conditions).search(k)
+
+    # Ties can be returned in any order, the scores have to be the k best ones
+    assert len(found) == min(k, len(scores))
+    assert len({sequence for sequence, _ in found}) == len(found)
+    for sequence, score in found:
+        assert sequence in scores
+        assert score == pytest.approx(scores[sequence])
+    assert [score for _, score in found] == pytest.approx(sorted(scores.values(), reverse=True)[:k])
+
+
+EXPENSIVE_CHARACTERIZATION = {
+    'Sea Wall': {'effectiveness': '+++', 'Costs': 100, 'Co-Benefits': '0'},
+    'Dike': {'effectiveness': '++', 'Costs': 90, 'Co-Benefits': '0'},
+    'Pump': {'effectiveness': '+', 'Costs': 10, 'Co-Benefits': '0'},
+    'Salt Marshes': {'effectiveness': '+', 'Costs': 5, 'Co-Benefits': '+'},
+}
+
+
+def test_top_k_are_the_best_sequences_that_pass_the_filter():
+    conditions = {'Costs': ('below', 50)}
+    weights = {'effectiveness': 10, 'Costs': -0.01, 'Co-Benefits': 1}
+    # Without the filter, the best sequences all contain an expensive action
+    unfiltered = SequenceSearch(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, 2, weights).search(3)
+    assert all({'Sea Wall', 'Dike'} & set(sequence) for sequence, _ in unfiltered)
+
+    sequences, _ = generate_input_files(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, conditions, m=2, top_k=3,
+                                        weights=weights)
+    assert {action.name for pair in sequences for action in pair} == {'current', 'Pump', 'SaltMarshes'}
+    found = SequenceSearch(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, 2, weights, conditions).search(3)
+    assert [sequence for sequence, _ in found] == [('Salt Marshes', 'Pump'), ('Pump', 'Salt Marshes'),
+                                                   ('Salt Marshes',)]
+
+
+def test_search_needs_a_weight_for_every_key():
+    with pytest.raises(ValueError, match='Costs'):
+        SequenceSearch(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, 2, {'effectiveness': 1, 'Co-Benefits': 1})
+    with pytest.raises(ValueError):
+        generate_input_files(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, {}, m=2, top_k=3)
+
+
+def test_negative_weights_minimize_costs():
+    weights = {'effectiveness': 0, 'Costs': -1, 'Co-Benefits': 0}
+    found = SequenceSearch(EXPENSIVE_CHARACTERIZATION, EVALUATION_KEYS, 2, weights).search(1)
+    assert found == [(('Salt Marshes',), -5)]
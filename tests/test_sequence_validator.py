@@ -0,0 +1,28 @@
+import itertools
+
+import pytest
+
+from Code_for_GenerationEvaluation.SequenceGenerator import SequenceGenerator
+from Code_for_GenerationEvaluation.SequenceValidator import SequenceValidator
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_compiled_rules_match_generator_rules(random_characterization, seed):
+    characterization = random_characterization(seed, number_actions=5, rules=seed % 8)
+    validator = SequenceValidator(characterization)
+    reference = SequenceGenerator(characterization, 0, 4)
+    for length in range(1, 5):
+        for sequence in itertools.permutations(characterization, length):
+            assert validator.is_valid_sequence(sequence) == reference.is_valid_sequence(sequence), sequence
+
+
+def test_validate_file_reports_invalid_lines(tmp_path, random_characterization):
+    characterization = random_characterization(3, number_actions=5, rules=5)
+    reference = SequenceGenerator(characterization, 0, 3)
+    sequences = [sequence for length in range(1, 4) for sequence in itertools.permutations(characterization, length)]
+    sequences_file = tmp_path / 'sequences.txt'
+    sequences_file.write_text(''.join(','.join(sequence) + '\n' for sequence in sequences))
+
+    report = SequenceValidator(characterization).validate_file(str(sequences_file), 'sequences')
+    assert [line_numbers for line_numbers, _, _ in report] == [
+        [line_number] for line_number, sequence in enumerate(sequences, 1) if not reference.is_valid_sequence(sequence)]